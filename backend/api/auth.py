@@ -16,6 +16,7 @@ from backend.security.auth0 import (
     requires_auth,
     requires_scopes,
 )
+from backend.utils.http_client import get_async_http_client
 
 # Create the router
 auth_router = APIRouter(prefix="/api/auth", tags=["authentication"])
@@ -88,8 +89,6 @@ async def auth_callback(code: str, state: Optional[str] = None):
         )
     
     try:
-        import requests
-        
         # Exchange the authorization code for tokens
         token_url = f"https://{AUTH0_DOMAIN}/oauth/token"
         token_payload = {
@@ -101,7 +100,7 @@ async def auth_callback(code: str, state: Optional[str] = None):
         }
         
         # Make the token request
-        token_response = requests.post(token_url, json=token_payload)
+        token_response = await get_async_http_client().post(token_url, json=token_payload)
         token_data = token_response.json()
         
         if "error" in token_data:
@@ -14,6 +14,7 @@ sys.path.append(root_dir)
 
 from fastapi import FastAPI, HTTPException, Query, Depends, BackgroundTasks
 from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 
 from models.code_to_design import (
@@ -77,7 +78,8 @@ async def generate_design(request: DesignGenerationRequest):
         
         # Extraire les composants d'un site web si nécessaire
         if request.extract_components_from_url:
-            extraction_result = extract_components_from_website(request.extract_components_from_url)
+            # Appels HTTP bloquants: exécutés hors de la boucle d'événements
+            extraction_result = await run_in_threadpool(extract_components_from_website, request.extract_components_from_url)
             if "error" in extraction_result:
                 raise HTTPException(status_code=400, detail=f"Failed to extract components: {extraction_result['error']}")
         
@@ -92,7 +94,7 @@ async def generate_design(request: DesignGenerationRequest):
                 raise HTTPException(status_code=400, detail=f"Failed to load recommendations file: {e}")
             
             # Générer le layout à partir des recommandations
-            result = layout_generator.generate_layout_from_recommendations(recommendations)
+            result = await run_in_threadpool(layout_generator.generate_layout_from_recommendations, recommendations)
         
         elif request.analysis_file:
             # Charger l'analyse depuis un fichier
@@ -110,7 +112,7 @@ async def generate_design(request: DesignGenerationRequest):
                 raise HTTPException(status_code=400, detail="Analysis file does not contain summary data")
             
             # Générer le layout à partir de l'analyse
-            result = layout_generator.generate_layout_from_analysis(summary, request.page_id)
+            result = await run_in_threadpool(layout_generator.generate_layout_from_analysis, summary, request.page_id)
         
         else:
             # Si aucun fichier n'est fourni, lever une exception
@@ -250,7 +252,7 @@ async def generate_component(request: ComponentGenerationRequest):
         client = CodeToDesignClient()
         
         # Générer le composant
-        result = client.generate_component(request.component_spec)
+        result = await run_in_threadpool(client.generate_component, request.component_spec)
         
         # Vérifier s'il y a une erreur
         if "error" in result:
@@ -270,7 +272,7 @@ async def extract_website_components(request: WebsiteExtractionRequest):
     """
     try:
         # Extraire les composants
-        result = extract_components_from_website(request.url)
+        result = await run_in_threadpool(extract_components_from_website, request.url)
         
         # Vérifier s'il y a une erreur
         if "error" in result:
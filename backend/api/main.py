@@ -24,6 +24,8 @@ from backend.api.design import design_router
 from backend.api.analysis import analysis_router
 from backend.api.auth import auth_router
 
+from backend.utils.http_client import close_http_clients, get_latency_metrics
+
 # Import security modules
 from backend.security import (
     # Configure security middlewares
@@ -90,6 +92,18 @@ async def health_check():
     """
     return {"status": "ok"}
 
+@app.get("/health/http", tags=["health"])
+async def http_metrics():
+    """
+    Per-host latency statistics of outbound HTTP calls.
+    """
+    return get_latency_metrics()
+
+@app.on_event("shutdown")
+async def shutdown_http_clients():
+    """Close the shared HTTP connection pools."""
+    await close_http_clients()
+
 # Include API routers
 app.include_router(auth_router)
 app.include_router(feedback_router)
@@ -8,15 +8,24 @@ import os
 import sys
 import json
 import abc
-import requests
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Iterator, Tuple
 
 # Add root directory to Python path
 root_dir = str(Path(__file__).parent.parent.parent)
 sys.path.append(root_dir)
 
+from backend.services.posthog_pagination import iter_posthog_pages
+from backend.utils.http_client import get_http_client, HTTPError
+from backend.services.session_cache import SessionRecordingCache, is_session_complete
+from backend.services.behavior.columnar import parse_event_time
+from backend.services.session_index import (
+    PageSessionIndex, SessionBatch, page_pattern, session_page_keys, session_has_url_metadata
+)
+
 class AnalyticsProvider(abc.ABC):
     """
     Classe abstraite définissant l'interface pour tous les fournisseurs d'analytics.
@@ -89,6 +98,54 @@ class AnalyticsProvider(abc.ABC):
         """
         pass
     
+    def fetch_sessions(self, page_id: str, date_from: Optional[str] = None,
+                       date_to: Optional[str] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Récupère toutes les sessions d'une page et indique si la liste est exhaustive.
+        
+        Contrairement à get_sessions, les erreurs sont propagées. Par défaut, un
+        provider ne peut pas garantir l'exhaustivité: la liste est déclarée partielle.
+        
+        Args:
+            page_id: Identifiant de la page
+            date_from: Date de début (format ISO)
+            date_to: Date de fin (format ISO)
+            
+        Returns:
+            Sessions de la page, et True si toutes ont été récupérées sans
+            erreur ni troncature
+        """
+        return self.get_sessions(page_id, date_from, date_to), False
+    
+    # Variantes asynchrones: par défaut, la méthode bloquante est exécutée dans un
+    # thread pour ne pas bloquer la boucle d'événements. Un provider peut les
+    # surcharger avec une implémentation nativement asynchrone.
+    
+    async def aget_sessions(self, page_id: str, date_from: Optional[str] = None,
+                            date_to: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Version asynchrone de get_sessions."""
+        if limit is None:
+            return await asyncio.to_thread(self.get_sessions, page_id, date_from, date_to)
+        return await asyncio.to_thread(self.get_sessions, page_id, date_from, date_to, limit)
+    
+    async def aget_events(self, event_name: str, page_id: Optional[str] = None,
+                          date_from: Optional[str] = None, date_to: Optional[str] = None,
+                          limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Version asynchrone de get_events."""
+        if limit is None:
+            return await asyncio.to_thread(self.get_events, event_name, page_id, date_from, date_to)
+        return await asyncio.to_thread(self.get_events, event_name, page_id, date_from, date_to, limit)
+    
+    async def aget_user_feedback(self, page_id: Optional[str] = None,
+                                 date_from: Optional[str] = None,
+                                 date_to: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Version asynchrone de get_user_feedback."""
+        return await asyncio.to_thread(self.get_user_feedback, page_id, date_from, date_to)
+    
+    async def aget_session_recordings(self, session_id: str) -> Dict[str, Any]:
+        """Version asynchrone de get_session_recordings."""
+        return await asyncio.to_thread(self.get_session_recordings, session_id)
+    
     @staticmethod
     def get_date_range(days: int) -> tuple:
         """
@@ -119,12 +176,38 @@ class PostHogProvider(AnalyticsProvider):
         self.api_url = os.getenv("POSTHOG_API_URL", "https://app.posthog.com/api")
         self.feedback_event = os.getenv("POSTHOG_FEEDBACK_EVENT", "feedback_submitted")
         
+        # Pagination: taille des pages, plafond global et préchargement de la page suivante
+        self.page_size = int(os.getenv("POSTHOG_PAGE_SIZE", "100"))
+        # POSTHOG_MAX_RESULTS=0 (ou négatif) désactive le plafond
+        self.max_results = max(0, int(os.getenv("POSTHOG_MAX_RESULTS", "10000"))) or None
+        self.prefetch_pages = os.getenv("POSTHOG_PREFETCH_PAGES", "true").lower() == "true"
+        
+        # Récupération concurrente des détails de session: nombre de workers et délai par requête
+        self.detail_workers = int(os.getenv("POSTHOG_DETAIL_WORKERS", "8"))
+        self.request_timeout = float(os.getenv("POSTHOG_REQUEST_TIMEOUT", "30"))
+        
+        # Client HTTP partagé (keep-alive, retries), dont le pool de connexions
+        # sert aussi les workers de récupération des détails
+        self.session = get_http_client()
+        
         if not self.api_key:
             raise ValueError("PostHog API key missing. Check POSTHOG_API_KEY environment variable.")
         
         if not self.project_id:
             raise ValueError("PostHog Project ID missing. Check POSTHOG_PROJECT_ID environment variable.")
         
+        # Cache disque des enregistrements de sessions terminées
+        self.recording_cache = None
+        if os.getenv("POSTHOG_RECORDING_CACHE", "true").lower() == "true":
+            max_mb = int(os.getenv("POSTHOG_RECORDING_CACHE_MAX_MB", "512"))
+            self.recording_cache = SessionRecordingCache(self.project_id, max_bytes=max_mb * 1024 * 1024)
+        
+        # Index page -> sessions conservé d'un appel à l'autre: les sessions terminées
+        # déjà indexées depuis leur enregistrement détaillé ne sont pas re-téléchargées
+        self.session_index = PageSessionIndex(
+            max_sessions=int(os.getenv("POSTHOG_SESSION_INDEX_MAX", "50000"))
+        )
+        
         # Déterminer le type de clé API (project ou personal)
         self.is_project_key = self.api_key.startswith("phc_")
         self.is_personal_key = self.api_key.startswith("phx_")
@@ -162,12 +245,12 @@ class PostHogProvider(AnalyticsProvider):
         print(f"Testing connection to: {test_url}")
         
         try:
-            response = requests.get(test_url, headers=self.headers)
+            response = self.session.get(test_url, headers=self.headers)
             response.raise_for_status()
             print(f"✅ PostHog connection successful: {response.status_code}")
             if self.is_personal_key and 'id' in response.json():
                 print(f"  Connected as user: {response.json().get('email', 'Unknown')}")
-        except requests.exceptions.RequestException as e:
+        except HTTPError as e:
             print(f"❌ PostHog connection failed: {e}")
             
             # Try alternative URL if this might be EU/US cloud
@@ -181,13 +264,13 @@ class PostHogProvider(AnalyticsProvider):
                         test_alt_url = f"{alt_url}/projects/{self.project_id}"
                     
                     print(f"Testing alternate URL: {test_alt_url}")
-                    response = requests.get(test_alt_url, headers=self.headers)
+                    response = self.session.get(test_alt_url, headers=self.headers)
                     response.raise_for_status()
                     print(f"✅ PostHog connection successful with EU cloud URL: {response.status_code}")
                     # Update the API URL to use the working URL
                     self.api_url = alt_url
                     return
-                except requests.exceptions.RequestException as e:
+                except HTTPError as e:
                     print(f"❌ EU cloud URL also failed: {e}")
             
             # If still failing, try alternate authentication method
@@ -207,13 +290,13 @@ class PostHogProvider(AnalyticsProvider):
                     else:
                         param_url = f"{test_url}?token={self.api_key}"
                     
-                    response = requests.get(param_url, headers={"Content-Type": "application/json"})
+                    response = self.session.get(param_url, headers={"Content-Type": "application/json"})
                     response.raise_for_status()
                     print(f"✅ PostHog connection successful with API key as parameter: {response.status_code}")
                     # Update strategy to use query params
                     self.use_query_param = True
                     return
-                except requests.exceptions.RequestException as e:
+                except HTTPError as e:
                     print(f"❌ API key as parameter also failed: {e}")
                     self.use_query_param = False
                     
@@ -226,10 +309,10 @@ class PostHogProvider(AnalyticsProvider):
             
             # Test again with alternate method
             try:
-                response = requests.get(test_url, headers=self.headers)
+                response = self.session.get(test_url, headers=self.headers)
                 response.raise_for_status()
                 print(f"✅ PostHog connection successful with alternate authentication: {response.status_code}")
-            except requests.exceptions.RequestException as e:
+            except HTTPError as e:
                 print(f"❌ PostHog connection still failed with alternate authentication: {e}")
                 print(f"   Status: {e.response.status_code if hasattr(e, 'response') and e.response else 'Unknown'}")
                 print(f"   Response: {e.response.text[:200] if hasattr(e, 'response') and e.response else 'No response'}")
@@ -248,11 +331,158 @@ class PostHogProvider(AnalyticsProvider):
         
         return url, params
 
+    def _auth_params(self) -> Optional[Dict[str, str]]:
+        """Paramètres d'authentification à ajouter aux URLs de pagination."""
+        _, params = self._add_auth_to_request(None)
+        return params
+    
+    def _paginate(self, url: str, params: Dict[str, Any],
+                  limit: Optional[int]) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Parcourt toutes les pages d'un endpoint de liste PostHog.
+        
+        Args:
+            url: URL de l'endpoint
+            params: Paramètres de la première page
+            limit: Nombre maximum de résultats (None pour le plafond configuré,
+                lui-même None sans plafond)
+            
+        Returns:
+            Itérateur sur les pages de résultats
+        """
+        max_items = limit if limit is not None else self.max_results
+        params = dict(params)
+        params["limit"] = min(self.page_size, max_items) if max_items is not None else self.page_size
+        
+        # Add authentication if using query params
+        url, params = self._add_auth_to_request(url, params)
+        
+        return iter_posthog_pages(
+            self.session,
+            url,
+            params=params,
+            headers=self.headers,
+            max_items=max_items,
+            prefetch=self.prefetch_pages,
+            follow_params=self._auth_params()
+        )
+    
+    def iter_session_recordings(self, date_from: Optional[str] = None, date_to: Optional[str] = None,
+                                limit: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Parcourt les enregistrements de session page par page.
+        
+        Args:
+            date_from: Date de début (format ISO)
+            date_to: Date de fin (format ISO)
+            limit: Nombre maximum d'enregistrements (None pour le plafond configuré)
+            
+        Returns:
+            Itérateur sur les pages d'enregistrements, au fur et à mesure de leur arrivée
+        """
+        url = f"{self.api_url}/projects/{self.project_id}/session_recordings"
+        params = {"date_from": date_from}
+        if date_to:
+            params["date_to"] = date_to
+        return self._paginate(url, params, limit)
+    
+    def iter_events(self, event_name: str, page_id: Optional[str] = None,
+                    date_from: Optional[str] = None, date_to: Optional[str] = None,
+                    limit: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Parcourt les événements d'un type spécifique page par page en suivant les curseurs `next`.
+        
+        Args:
+            event_name: Nom de l'événement à récupérer
+            page_id: Filtrer par page spécifique (optionnel)
+            date_from: Date de début (format ISO)
+            date_to: Date de fin (format ISO)
+            limit: Nombre maximum d'événements (None pour le plafond configuré)
+            
+        Returns:
+            Itérateur sur les pages d'événements, au fur et à mesure de leur arrivée
+        """
+        url = f"{self.api_url}/projects/{self.project_id}/events"
+        params = {
+            "event": event_name,
+            "date_from": date_from
+        }
+        if date_to:
+            params["date_to"] = date_to
+        if page_id:
+            params["properties"] = json.dumps({"$current_url": f"*{page_id}*"})
+        return self._paginate(url, params, limit)
+
     def get_sessions(self, page_id: str, date_from: Optional[str] = None, 
                     date_to: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
         """
         Récupère les sessions utilisateur pour une page spécifique depuis PostHog.
         """
+        return self.get_sessions_for_pages([page_id], date_from, date_to, limit=limit)[page_id]
+    
+    def get_sessions_for_pages(self, page_ids: List[str], date_from: Optional[str] = None,
+                               date_to: Optional[str] = None,
+                               limit: Optional[int] = 100) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Récupère en une seule passe les sessions de plusieurs pages.
+        
+        Args:
+            page_ids: Pages à analyser
+            date_from: Date de début (format ISO)
+            date_to: Date de fin (format ISO)
+            limit: Nombre maximum d'enregistrements à parcourir
+                (None pour le plafond configuré)
+            
+        Returns:
+            Sessions de chaque page, dans l'ordre renvoyé par l'API
+        """
+        try:
+            batch = self.fetch_session_index(date_from, date_to, limit=limit, page_ids=page_ids)
+        except Exception as e:
+            print(f"Error fetching sessions from PostHog: {e}")
+            if hasattr(e, 'response') and e.response:
+                print(f"Response: {e.response.status_code} - {e.response.text[:200]}")
+            return {page_id: [] for page_id in page_ids}
+        
+        sessions_by_page = {}
+        for page_id in page_ids:
+            sessions_by_page[page_id] = self.session_index.sessions_for_page(page_id, session_ids=batch)
+            print(f"Filtered to {len(sessions_by_page[page_id])} sessions containing page {page_id}")
+        return sessions_by_page
+    
+    def fetch_sessions(self, page_id: str, date_from: Optional[str] = None,
+                       date_to: Optional[str] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Récupère toutes les sessions de la page, jusqu'au plafond configuré.
+        
+        La liste est exhaustive si aucun détail de session n'a échoué et si le
+        plafond POSTHOG_MAX_RESULTS n'a pas été atteint.
+        """
+        batch = self.fetch_session_index(date_from, date_to, page_ids=[page_id])
+        return self.session_index.sessions_for_page(page_id, session_ids=batch), batch.complete
+    
+    def fetch_session_index(self, date_from: Optional[str] = None, date_to: Optional[str] = None,
+                            limit: Optional[int] = None,
+                            page_ids: Optional[List[str]] = None) -> SessionBatch:
+        """
+        Récupère un lot d'enregistrements et l'ajoute à l'index page -> sessions.
+        
+        Chaque enregistrement est indexé une seule fois dans self.session_index;
+        les pages d'un même lot s'interrogent ensuite par simple recherche dans
+        l'index, restreinte aux sessions du lot.
+        
+        Args:
+            date_from: Date de début (format ISO)
+            date_to: Date de fin (format ISO)
+            limit: Nombre maximum d'enregistrements à parcourir
+            page_ids: Pages recherchées. Les détails d'une session ne sont récupérés
+                que si ses métadonnées ne mentionnent pas toutes ces pages (ou, sans
+                page_ids, si elle n'a pas de métadonnées d'URL)
+            
+        Returns:
+            Identifiants des sessions du lot, dans l'ordre renvoyé par l'API, et
+            si le lot est complet (ni plafond atteint, ni détail en échec)
+        """
         # Si dates non spécifiées, utiliser les 30 derniers jours
         if not date_from:
             date_from, date_to = self.get_date_range(30)
@@ -272,70 +502,67 @@ class PostHogProvider(AnalyticsProvider):
                 print(f"⚠️ Invalid date_to format: {date_to}, using default")
                 _, date_to = self.get_date_range(30)
         
-        print(f"Fetching sessions for page {page_id} from {date_from} to {date_to}")
+        page_ids = page_ids or []
+        print(f"Fetching sessions for pages {', '.join(page_ids) or 'all'} from {date_from} to {date_to}")
         
-        # Récupérer les enregistrements de session
-        url = f"{self.api_url}/projects/{self.project_id}/session_recordings"
-        params = {
-            "limit": limit,
-            "date_from": date_from
-        }
-        if date_to:
-            params["date_to"] = date_to
+        index = self.session_index
+        batch = SessionBatch()
+        pending = {}
+        failed = 0
         
-        # Add authentication if using query params
-        url, params = self._add_auth_to_request(url, params)
-            
-        try:
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            recordings = response.json().get("results", [])
-            print(f"Retrieved {len(recordings)} total session recordings")
-            
-            # Filtrer les enregistrements qui contiennent la page demandée
-            filtered_sessions = []
-            for recording in recordings:
-                session_id = recording.get("id")
-                if not session_id:
-                    continue
+        with ThreadPoolExecutor(max_workers=self.detail_workers) as executor:
+            # Indexer les enregistrements page par page, au fur et à mesure de leur arrivée
+            for recordings in self.iter_session_recordings(date_from, date_to, limit=limit):
+                for recording in recordings:
+                    session_id = recording.get("id")
+                    if not session_id:
+                        continue
+                    batch.append(session_id)
                     
-                # Debugging
-                # print(f"Processing session {session_id}")
-                # print(f"Keys in session: {recording.keys()}")
-                
-                # Pour éviter trop de requêtes, vérifier d'abord si la page existe dans les données déjà récupérées
-                if "start_url" in recording and page_id in recording.get("start_url", ""):
-                    filtered_sessions.append(recording)
-                    continue
-                
-                if "urls" in recording:
-                    urls = recording.get("urls", [])
-                    if urls and isinstance(urls, list) and any(page_id in url for url in urls):
-                        filtered_sessions.append(recording)
+                    # Session terminée déjà indexée depuis ses détails: rien à récupérer
+                    if index.is_final(session_id):
                         continue
-                
-                # Si pas trouvé dans les métadonnées, récupérer les détails complets
-                try:
-                    session_details = self.get_session_recordings(session_id)
                     
-                    # Vérifier si la session contient la page demandée
-                    if self._session_contains_page(session_details, page_id):
-                        filtered_sessions.append(session_details)
+                    # Pour éviter trop de requêtes, indexer d'abord les métadonnées déjà récupérées.
+                    # Une session qui ne mentionne qu'une partie des pages recherchées peut avoir
+                    # visité les autres: ses détails sont alors nécessaires.
+                    index.add_session(recording)
+                    if session_has_url_metadata(recording) and all(
+                        index.contains(session_id, page_id) for page_id in page_ids
+                    ):
+                        continue
+                    
+                    # Sinon, récupérer les détails complets en parallèle
+                    future = executor.submit(self.get_session_recordings, session_id)
+                    pending[future] = recording
+            
+            # Réindexer les sessions détaillées dès que leur réponse arrive
+            for future in as_completed(pending):
+                recording = pending[future]
+                session_id = recording["id"]
+                try:
+                    session_details = future.result()
                 except Exception as e:
                     print(f"Error retrieving details for session {session_id}: {e}")
-            
-            print(f"Filtered to {len(filtered_sessions)} sessions containing page {page_id}")
-            return filtered_sessions
-            
-        except Exception as e:
-            print(f"Error fetching sessions from PostHog: {e}")
-            if hasattr(e, 'response') and e.response:
-                print(f"Response: {e.response.status_code} - {e.response.text[:200]}")
-            return []
+                    session_details = None
+                if session_details:
+                    # Les détails complètent les métadonnées (start_url, urls) sans les perdre
+                    index.add_session(
+                        {**recording, **session_details},
+                        session_id=session_id,
+                        final=is_session_complete(session_details)
+                    )
+                else:
+                    failed += 1
+        
+        max_items = limit if limit is not None else self.max_results
+        batch.complete = not failed and not (max_items is not None and len(batch) >= max_items)
+        print(f"Retrieved {len(batch)} total session recordings ({len(pending)} detail fetches, {failed} failed)")
+        return batch
     
     def get_events(self, event_name: str, page_id: Optional[str] = None, 
                   date_from: Optional[str] = None, date_to: Optional[str] = None,
-                  limit: int = 100) -> List[Dict[str, Any]]:
+                  limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Récupère les événements d'un type spécifique depuis PostHog.
         """
@@ -345,31 +572,17 @@ class PostHogProvider(AnalyticsProvider):
         
         print(f"Fetching '{event_name}' events for page {page_id} from {date_from} to {date_to}")
             
-        url = f"{self.api_url}/projects/{self.project_id}/events"
-        params = {
-            "event": event_name,
-            "limit": limit,
-            "date_from": date_from
-        }
-        if date_to:
-            params["date_to"] = date_to
-        if page_id:
-            params["properties"] = json.dumps({"$current_url": f"*{page_id}*"})
-        
-        # Add authentication if using query params
-        url, params = self._add_auth_to_request(url, params)
-            
+        events = []
         try:
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            events = response.json().get("results", [])
+            for page in self.iter_events(event_name, page_id, date_from, date_to, limit=limit):
+                events.extend(page)
             print(f"Retrieved {len(events)} events of type '{event_name}'")
             return events
         except Exception as e:
             print(f"Error fetching events from PostHog: {e}")
             if hasattr(e, 'response') and e.response:
                 print(f"Response: {e.response.status_code} - {e.response.text[:200]}")
-            return []
+            return events
     
     def get_user_feedback(self, page_id: Optional[str] = None,
                         date_from: Optional[str] = None, 
@@ -405,16 +618,28 @@ class PostHogProvider(AnalyticsProvider):
     def get_session_recordings(self, session_id: str) -> Dict[str, Any]:
         """
         Récupère les enregistrements d'une session spécifique depuis PostHog.
+        Les sessions terminées sont servies depuis le cache disque.
         """
+        if self.recording_cache is not None:
+            cached = self.recording_cache.get(session_id)
+            if cached is not None:
+                return cached
+        
         url = f"{self.api_url}/projects/{self.project_id}/session_recordings/{session_id}"
         
         # Add authentication if using query params
         url, params = self._add_auth_to_request(url)
         
         try:
-            response = requests.get(url, headers=self.headers, params=params if params else None)
+            response = self.session.get(url, headers=self.headers, params=params if params else None,
+                                        timeout=self.request_timeout)
             response.raise_for_status()
-            return response.json()
+            recording = response.json()
+            
+            # Seules les sessions terminées sont mises en cache, les autres peuvent encore changer
+            if self.recording_cache is not None:
+                self.recording_cache.put(session_id, recording)
+            return recording
         except Exception as e:
             print(f"Error fetching session recording from PostHog: {e}")
             if hasattr(e, 'response') and e.response:
@@ -432,43 +657,8 @@ class PostHogProvider(AnalyticsProvider):
         Returns:
             True si la session contient la page, False sinon
         """
-        # Debugging
-        # print(f"Checking if session contains page {page_id}")
-        # print(f"Session keys: {session.keys()}")
-        
-        # Check different places where page URL might be stored
-        
-        # 1. Check start_url
-        start_url = session.get("start_url", "")
-        if start_url and page_id in start_url:
-            return True
-            
-        # 2. Check URLs list
-        urls = session.get("urls", [])
-        if urls and isinstance(urls, list):
-            for url in urls:
-                if page_id in url:
-                    return True
-        
-        # 3. Check snapshots/pages
-        snapshots = session.get("snapshots", {})
-        if snapshots and isinstance(snapshots, dict):
-            pages = snapshots.get("pages", [])
-            if pages and isinstance(pages, list):
-                for page in pages:
-                    if isinstance(page, dict) and "url" in page and page_id in page.get("url", ""):
-                        return True
-        
-        # 4. Check events for page views
-        events = session.get("events", [])
-        if events and isinstance(events, list):
-            for event in events:
-                if isinstance(event, dict):
-                    props = event.get("properties", {})
-                    if isinstance(props, dict) and "$current_url" in props and page_id in props["$current_url"]:
-                        return True
-                
-        return False
+        pattern = page_pattern(page_id)
+        return bool(pattern) and any(pattern in key for key in session_page_keys(session))
 
 
 class MixpanelProvider(AnalyticsProvider):
@@ -589,6 +779,166 @@ class AmplitudeProvider(AnalyticsProvider):
         return {}
 
 
+class CompositeAnalyticsProvider(AnalyticsProvider):
+    """
+    Interroge plusieurs providers en parallèle et fusionne leurs résultats.
+    
+    Chaque élément est annoté avec sa source ("source") et le flux fusionné est
+    trié par horodatage: les données d'une page arrivent en un temps égal à
+    celui de la source la plus lente, et non à la somme des sources. Une source
+    en erreur est ignorée, les autres résultats sont conservés.
+    """
+    
+    def __init__(self, providers: Dict[str, AnalyticsProvider]):
+        """
+        Initialise le provider composite.
+        
+        Args:
+            providers: Providers à interroger, indexés par nom de source
+        """
+        if not providers:
+            raise ValueError("CompositeAnalyticsProvider needs at least one provider")
+        self.providers = providers
+    
+    # Champs d'horodatage des différentes sources (PostHog, sessions, Amplitude)
+    TIME_FIELDS = ("timestamp", "start_time", "event_time", "time")
+    
+    @classmethod
+    def _sort_key(cls, item: Dict[str, Any]) -> tuple:
+        # Horodatages ISO, secondes ou millisecondes ramenés en millisecondes epoch
+        for field in cls.TIME_FIELDS:
+            seconds = parse_event_time(item.get(field))
+            if seconds is not None:
+                return (False, int(seconds * 1000))
+        return (True, 0)
+    
+    def _merge(self, results: Dict[str, Any], what: str,
+               limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Fusionne les listes renvoyées par chaque source en un flux normalisé.
+        
+        Args:
+            results: Résultat (ou exception) de chaque source
+            what: Nature des données, pour les messages
+            limit: Nombre maximum d'éléments du flux fusionné
+            
+        Returns:
+            Éléments annotés avec leur source, triés par horodatage
+        """
+        merged = []
+        for source, items in results.items():
+            if isinstance(items, BaseException):
+                print(f"⚠️ {source} failed to return {what}: {items}")
+                continue
+            merged.extend({**item, "source": source} for item in items or [])
+        merged.sort(key=self._sort_key)
+        return merged if limit is None else merged[:limit]
+    
+    @staticmethod
+    def _limit(limit: Optional[int]) -> Dict[str, int]:
+        # Sans limite explicite, chaque provider applique sa valeur par défaut
+        return {} if limit is None else {"limit": limit}
+    
+    def _fan_out(self, method: str, *args, **kwargs) -> Dict[str, Any]:
+        """Appelle une méthode bloquante sur chaque provider, en parallèle."""
+        results = {}
+        with ThreadPoolExecutor(max_workers=len(self.providers)) as executor:
+            futures = {
+                executor.submit(getattr(provider, method), *args, **kwargs): source
+                for source, provider in self.providers.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    results[futures[future]] = e
+        # Conserver l'ordre de déclaration des sources
+        return {source: results[source] for source in self.providers}
+    
+    async def _afan_out(self, method: str, *args, **kwargs) -> Dict[str, Any]:
+        """Appelle une méthode asynchrone sur chaque provider, en parallèle."""
+        results = await asyncio.gather(
+            *(getattr(provider, method)(*args, **kwargs) for provider in self.providers.values()),
+            return_exceptions=True
+        )
+        return dict(zip(self.providers, results))
+    
+    def get_sessions(self, page_id: str, date_from: Optional[str] = None,
+                    date_to: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Récupère les sessions de la page auprès de toutes les sources.
+        """
+        return self._merge(
+            self._fan_out("get_sessions", page_id, date_from, date_to, **self._limit(limit)), "sessions", limit
+        )
+    
+    def get_events(self, event_name: str, page_id: Optional[str] = None,
+                  date_from: Optional[str] = None, date_to: Optional[str] = None,
+                  limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Récupère les événements auprès de toutes les sources.
+        """
+        return self._merge(
+            self._fan_out("get_events", event_name, page_id, date_from, date_to, **self._limit(limit)), "events", limit
+        )
+    
+    def get_user_feedback(self, page_id: Optional[str] = None,
+                         date_from: Optional[str] = None,
+                         date_to: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Récupère les feedbacks auprès de toutes les sources.
+        """
+        return self._merge(self._fan_out("get_user_feedback", page_id, date_from, date_to), "feedback")
+    
+    def get_session_recordings(self, session_id: str) -> Dict[str, Any]:
+        """
+        Récupère l'enregistrement d'une session auprès de la première source qui le connaît.
+        """
+        return self._first_recording(self._fan_out("get_session_recordings", session_id))
+    
+    def fetch_sessions(self, page_id: str, date_from: Optional[str] = None,
+                       date_to: Optional[str] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Récupère les sessions de la page auprès de toutes les sources.
+        
+        La liste n'est exhaustive que si chaque source l'est.
+        """
+        results = self._fan_out("fetch_sessions", page_id, date_from, date_to)
+        complete = all(not isinstance(result, BaseException) and result[1] for result in results.values())
+        sessions = self._merge({
+            source: result if isinstance(result, BaseException) else result[0]
+            for source, result in results.items()
+        }, "sessions")
+        return sessions, complete
+    
+    def _first_recording(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        for source, recording in results.items():
+            if recording and not isinstance(recording, BaseException):
+                return {**recording, "source": source}
+        return {}
+    
+    async def aget_sessions(self, page_id: str, date_from: Optional[str] = None,
+                            date_to: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self._merge(
+            await self._afan_out("aget_sessions", page_id, date_from, date_to, limit=limit), "sessions", limit
+        )
+    
+    async def aget_events(self, event_name: str, page_id: Optional[str] = None,
+                          date_from: Optional[str] = None, date_to: Optional[str] = None,
+                          limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self._merge(
+            await self._afan_out("aget_events", event_name, page_id, date_from, date_to, limit=limit), "events", limit
+        )
+    
+    async def aget_user_feedback(self, page_id: Optional[str] = None,
+                                 date_from: Optional[str] = None,
+                                 date_to: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self._merge(await self._afan_out("aget_user_feedback", page_id, date_from, date_to), "feedback")
+    
+    async def aget_session_recordings(self, session_id: str) -> Dict[str, Any]:
+        return self._first_recording(await self._afan_out("aget_session_recordings", session_id))
+
+
 class AnalyticsFactory:
     """
     Factory pour créer des instances de providers d'analytics en fonction du type.
@@ -600,7 +950,8 @@ class AnalyticsFactory:
         Crée une instance du provider d'analytics demandé.
         
         Args:
-            provider_type: Type de provider ('posthog', 'mixpanel', 'amplitude')
+            provider_type: Type de provider ('posthog', 'mixpanel', 'amplitude', 'composite'
+                ou une liste séparée par des virgules)
             
         Returns:
             Instance du provider d'analytics
@@ -608,14 +959,54 @@ class AnalyticsFactory:
         Raises:
             ValueError: Si le type de provider n'est pas supporté
         """
-        if provider_type.lower() == 'posthog':
+        provider_type = provider_type.strip().lower()
+        
+        # "composite" ou une liste séparée par des virgules: interroger plusieurs sources
+        if provider_type == 'composite' or ',' in provider_type:
+            sources = provider_type if ',' in provider_type else os.getenv(
+                "ANALYTICS_PROVIDERS", "posthog,amplitude,mixpanel"
+            )
+            return AnalyticsFactory.create_composite_provider(
+                [source.strip() for source in sources.split(',') if source.strip()]
+            )
+        
+        if provider_type == 'posthog':
             return PostHogProvider()
-        elif provider_type.lower() == 'mixpanel':
+        elif provider_type == 'mixpanel':
             return MixpanelProvider()
-        elif provider_type.lower() == 'amplitude':
+        elif provider_type == 'amplitude':
             return AmplitudeProvider()
         else:
             raise ValueError(f"Provider type '{provider_type}' not supported")
+    
+    @staticmethod
+    def create_composite_provider(provider_types: List[str]) -> "CompositeAnalyticsProvider":
+        """
+        Crée un provider composite à partir des sources configurées.
+        
+        Les sources dont la configuration est absente sont ignorées.
+        
+        Args:
+            provider_types: Types de provider à combiner
+            
+        Returns:
+            Provider composite
+            
+        Raises:
+            ValueError: Si aucune source n'a pu être initialisée
+        """
+        providers = {}
+        for provider_type in provider_types:
+            if provider_type == 'composite':
+                continue
+            try:
+                providers[provider_type] = AnalyticsFactory.create_provider(provider_type)
+            except ValueError as e:
+                print(f"⚠️ Skipping analytics provider '{provider_type}': {e}")
+        
+        if not providers:
+            raise ValueError(f"None of the analytics providers {provider_types} could be initialized")
+        return CompositeAnalyticsProvider(providers)
 
 # Fonction utilitaire pour obtenir le provider configuré dans l'environnement
 def get_configured_provider() -> AnalyticsProvider:
@@ -6,7 +6,9 @@ les recommandations de design en composants Figma manipulables.
 import os
 import sys
 import json
-import requests
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
@@ -17,6 +19,42 @@ sys.path.append(root_dir)
 
 # Importation du module de recommandations pour accéder au format des recommandations
 from models.design_recommendations import DesignRecommendationChain
+from backend.utils.http_client import get_http_client, HTTPError
+from backend.models.component_index import ComponentIndex
+from backend.services.component_cache import ComponentCache
+
+logger = logging.getLogger(__name__)
+
+# Nombre maximal de composants générés en parallèle
+DEFAULT_COMPONENT_CONCURRENCY = int(os.getenv("CODETODESIGN_CONCURRENCY", "4"))
+
+# Mapping entre nos types de composants et ceux de Code.to.Design
+CODE_TO_DESIGN_TYPES = {
+    "Button": "button",
+    "Form": "form",
+    "Input": "input",
+    "Dropdown": "dropdown",
+    "Menu": "menu",
+    "Card": "card",
+    "Modal": "modal",
+    "Navbar": "navigation",
+    "Sidebar": "sidebar",
+    "Header": "header",
+    "Footer": "footer",
+    "Table": "table",
+    "List": "list",
+    "Checkbox": "checkbox",
+    "Radio": "radio",
+    "Toggle": "toggle",
+}
+
+# Index partagé: les noms de la bibliothèque supportée pointent vers leur équivalent
+CODE_TO_DESIGN_INDEX = ComponentIndex(CODE_TO_DESIGN_TYPES, aliases={
+    "TextField": "Input",
+    "SearchBar": "Input",
+    "RadioButton": "Radio",
+    "Navigation": "Navbar",
+})
 
 class CodeToDesignClient:
     """
@@ -24,13 +62,26 @@ class CodeToDesignClient:
     Permet de transformer les recommandations de design en composants Figma.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_concurrency: int = DEFAULT_COMPONENT_CONCURRENCY,
+        call_timeout: Optional[float] = None,
+        cache: Optional[ComponentCache] = None
+    ):
         """
         Initialise le client Code.to.Design avec une clé API.
         
         Args:
             api_key (str, optional): Clé API pour Code.to.Design.
                                      Si non fournie, utilise la variable d'environnement.
+            max_concurrency (int): Nombre maximal de composants générés en parallèle,
+                                   tous appels à generate_components confondus
+            call_timeout (float, optional): Durée maximale d'une génération de composant,
+                                            par défaut CODETODESIGN_TIMEOUT
+            cache (ComponentCache, optional): Cache des composants générés (False pour
+                                              le désactiver), actif par défaut sauf si
+                                              COMPONENT_CACHE=false
         """
         self.api_key = api_key or os.getenv("CODETODESIGN_API_KEY")
         self.api_url = os.getenv("CODETODESIGN_API_URL", "https://api.code.to.design")
@@ -42,6 +93,20 @@ class CodeToDesignClient:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        
+        # La génération d'un composant peut prendre bien plus que le délai par défaut
+        self.timeout = float(os.getenv("CODETODESIGN_TIMEOUT", "120"))
+        # Les délais HTTP portent sur chaque phase: cette limite borne l'appel entier
+        self.call_timeout = call_timeout or self.timeout
+        self.max_concurrency = max(1, max_concurrency)
+        # Pool partagé par tous les appels: un appel expiré qui se termine en
+        # arrière-plan occupe un de ses threads au lieu d'en ajouter un
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                            thread_name_prefix="codetodesign")
+        if cache is None and os.getenv("COMPONENT_CACHE", "true").lower() == "true":
+            cache = ComponentCache()
+        self.cache = cache or None
+        self.http = get_http_client()
     
     def generate_component(self, component_spec: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -53,17 +118,32 @@ class CodeToDesignClient:
         Returns:
             Dict: Informations sur le composant généré, y compris l'URL Figma
         """
+        # Une spécification déjà générée est servie depuis le cache
+        fingerprint = self.cache.fingerprint(component_spec, self.api_url) if self.cache else None
+        if fingerprint is not None:
+            cached = self.cache.get(fingerprint)
+            if cached is not None:
+                return cached
+        
+        component = self._post_component(component_spec)
+        if fingerprint is not None:
+            self.cache.put(fingerprint, component)
+        return component
+    
+    def _post_component(self, component_spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Appelle l'API Code.to.Design pour générer un composant."""
         endpoint = f"{self.api_url}/components/generate"
         
         try:
-            response = requests.post(
+            response = self.http.post(
                 endpoint,
                 headers=self.headers,
-                json=component_spec
+                json=component_spec,
+                timeout=self.timeout
             )
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.RequestException as e:
+        except (HTTPError, ValueError) as e:
             print(f"Error generating component: {e}")
             if hasattr(e, 'response') and e.response:
                 print(f"Response status: {e.response.status_code}")
@@ -83,32 +163,135 @@ class CodeToDesignClient:
         Returns:
             Dict: Informations sur les composants générés, organisés par recommandation
         """
+        # Transformer chaque recommandation en spécification de composant
+        recs = recommendations.get("recommendations", [])
+        specs = [self._recommendation_to_component_spec(rec) for rec in recs]
+        
+        # Générer les composants en parallèle; un échec ou un dépassement de délai
+        # est marqué sur son composant sans bloquer les autres
+        results = self.generate_components(specs)
+        
+        return self.build_components_result(recommendations, results)
+    
+    @staticmethod
+    def build_components_result(
+        recommendations: Dict[str, Any],
+        results: List[Dict[str, Any]],
+        page_id: str = "unknown"
+    ) -> Dict[str, Any]:
+        """
+        Associe les composants générés à leurs recommandations.
+        
+        Args:
+            recommendations (Dict): Recommandations à l'origine des composants
+            results (List[Dict]): Résultat de chaque composant, dans l'ordre des recommandations
+            page_id (str): Page utilisée si les recommandations n'en indiquent pas
+            
+        Returns:
+            Dict: Composants avec leur statut ("generated" ou "failed") et le nombre d'échecs
+        """
         components_result = {
-            "page_id": recommendations.get("page_id", "unknown"),
+            "page_id": recommendations.get("page_id", page_id),
             "timestamp": datetime.now().isoformat(),
             "components": []
         }
         
-        # Parcourir chaque recommandation
-        for rec in recommendations.get("recommendations", []):
-            # Transformer la recommandation en spécification de composant
-            component_spec = self._recommendation_to_component_spec(rec)
-            
-            # Générer le composant
-            component_result = self.generate_component(component_spec)
-            
-            # Ajouter le résultat
+        # Ajouter les résultats, dans l'ordre des recommandations
+        for rec, component_result in zip(recommendations.get("recommendations", []), results):
             components_result["components"].append({
                 "recommendation_title": rec.get("title"),
                 "component_result": component_result,
-                "priority": rec.get("priority", "medium")
+                "priority": rec.get("priority", "medium"),
+                "status": "failed" if "error" in component_result else "generated"
             })
+        components_result["failed_count"] = sum(
+            component["status"] == "failed" for component in components_result["components"]
+        )
         
         # Ajouter des notes d'implémentation générales
         components_result["implementation_notes"] = recommendations.get("implementation_notes", "")
         
         return components_result
     
+    def generate_components(self, component_specs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Génère plusieurs composants sur le pool du client, au plus
+        max_concurrency à la fois.
+        
+        Les spécifications identiques sont générées une seule fois. Chaque appel
+        est limité à call_timeout secondes à partir de son démarrage; au-delà, ou
+        en cas d'erreur, le composant reçoit un résultat {"error": ...} et les
+        autres continuent. Un appel qui n'a pas démarré dans le pire délai du lot
+        (call_timeout par vague de max_concurrency appels), le pool étant occupé
+        par des appels expirés ou d'autres lots, est annulé et marqué en erreur.
+        
+        Args:
+            component_specs (List[Dict]): Spécifications des composants
+            
+        Returns:
+            List[Dict]: Résultat de chaque composant, dans l'ordre des spécifications
+        """
+        if not component_specs:
+            return []
+        
+        # Les spécifications identiques ne donnent lieu qu'à un seul appel
+        unique: Dict[str, int] = {}
+        slots = [
+            unique.setdefault(ComponentCache.fingerprint(spec, self.api_url), len(unique))
+            for spec in component_specs
+        ]
+        if len(unique) < len(component_specs):
+            first = {}
+            for index, slot in enumerate(slots):
+                first.setdefault(slot, index)
+            results = self.generate_components([component_specs[first[slot]] for slot in range(len(unique))])
+            return [dict(results[slot]) for slot in slots]
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(component_specs)
+        started: Dict[int, float] = {}
+        
+        def generate(index, spec):
+            started[index] = time.monotonic()
+            return self.generate_component(spec)
+        
+        submitted = time.monotonic()
+        queue_timeout = self.call_timeout * -(-len(component_specs) // self.max_concurrency)
+        futures = {self._executor.submit(generate, index, spec): index for index, spec in enumerate(component_specs)}
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            deadlines = [
+                started[futures[f]] + self.call_timeout if futures[f] in started else submitted + queue_timeout
+                for f in pending
+            ]
+            # Un appel qui démarre fixe une échéance plus proche: vérifier régulièrement
+            timeout = max(0.0, min(deadlines) - now)
+            done, pending = wait(pending, timeout=min(timeout, 1.0), return_when=FIRST_COMPLETED)
+            for future in done:
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    logger.warning(f"Error generating component: {e}")
+                    results[index] = {"error": str(e)}
+            now = time.monotonic()
+            for future in list(pending):
+                index = futures[future]
+                if index in started and now - started[index] >= self.call_timeout:
+                    # L'appel expiré se termine en arrière-plan (délai HTTP)
+                    logger.warning(f"Component generation timed out after {self.call_timeout:.0f}s")
+                    results[index] = {"error": f"Timed out after {self.call_timeout:.0f}s"}
+                    pending.discard(future)
+                elif index not in started and now - submitted >= queue_timeout and future.cancel():
+                    logger.warning(f"Component generation not started after {queue_timeout:.0f}s")
+                    results[index] = {"error": f"Not started after {queue_timeout:.0f}s, generation pool busy"}
+                    pending.discard(future)
+        return results
+    
+    def close(self) -> None:
+        """Libère le pool de génération, sans attendre les appels en cours."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
     def _recommendation_to_component_spec(self, recommendation: Dict[str, Any]) -> Dict[str, Any]:
         """
         Transforme une recommandation en spécification de composant pour l'API Code.to.Design.
@@ -159,28 +342,12 @@ class CodeToDesignClient:
         Returns:
             str: Type de composant equivalent dans Code.to.Design
         """
-        # Mapping entre nos types de composants et ceux de Code.to.Design
-        mapping = {
-            "Button": "button",
-            "Form": "form",
-            "Input": "input",
-            "Dropdown": "dropdown",
-            "Menu": "menu",
-            "Card": "card",
-            "Modal": "modal",
-            "Navbar": "navigation",
-            "Sidebar": "sidebar",
-            "Header": "header",
-            "Footer": "footer",
-            "Table": "table",
-            "List": "list",
-            "Checkbox": "checkbox",
-            "Radio": "radio",
-            "Toggle": "toggle",
-        }
+        # Correspondance exacte (casse et séparateurs ignorés) ou alias uniquement:
+        # un nom seulement proche ("Tab" -> "Table", "Formula" -> "Form") serait mal typé
+        name = CODE_TO_DESIGN_INDEX.lookup(component_type or "")
         
         # Retourner le type mappé ou "generic" par défaut
-        return mapping.get(component_type, "generic")
+        return CODE_TO_DESIGN_TYPES[name] if name else "generic"
 
 class FigmaLayoutGenerator:
     """
@@ -242,7 +409,8 @@ class FigmaLayoutGenerator:
         # Agréger les composants en layout
         return self._aggregate_components_to_layout(components_result)
     
-    def _aggregate_components_to_layout(self, components_result: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _aggregate_components_to_layout(components_result: Dict[str, Any]) -> Dict[str, Any]:
         """
         Agrège les composants générés en un layout complet.
         
@@ -262,7 +430,8 @@ class FigmaLayoutGenerator:
                 "sections": [],
                 "components": []
             },
-            "implementation_notes": components_result.get("implementation_notes", "")
+            "implementation_notes": components_result.get("implementation_notes", ""),
+            "failed_count": components_result.get("failed_count", 0)
         }
         
         # Organiser les composants par priorité
@@ -304,7 +473,8 @@ class FigmaLayoutGenerator:
                 "name": comp.get("recommendation_title"),
                 "figma_url": comp.get("component_result", {}).get("figma_url", ""),
                 "component_id": comp.get("component_result", {}).get("component_id", ""),
-                "priority": comp.get("priority")
+                "priority": comp.get("priority"),
+                "status": comp.get("status", "generated")
             })
         
         return layout
@@ -324,14 +494,15 @@ def extract_components_from_website(url: str) -> Dict[str, Any]:
     endpoint = f"{client.api_url}/extract/components"
     
     try:
-        response = requests.post(
+        response = client.http.post(
             endpoint,
             headers=client.headers,
-            json={"url": url}
+            json={"url": url},
+            timeout=client.timeout
         )
         response.raise_for_status()
         return response.json()
-    except requests.exceptions.RequestException as e:
+    except (HTTPError, ValueError) as e:
         print(f"Error extracting components: {e}")
         if hasattr(e, 'response') and e.response:
             print(f"Response status: {e.response.status_code}")
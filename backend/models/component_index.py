@@ -0,0 +1,178 @@
+"""
+Normalized index of UI component names.
+Names are normalized once ("Text Field", "text-field" and "TextField" share
+the key "textfield") into an exact-match dict, a token index and a trigram
+index. Support checks are dict lookups, and alternatives are ranked by
+trigram and token similarity among the candidates sharing a token or a
+trigram with the query, instead of scanning every component.
+"""
+
+import re
+from typing import Dict, List, Iterable, Optional, Sequence, Set, Tuple
+
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+# Score minimal d'une alternative proposée
+MIN_ALTERNATIVE_SCORE = 0.3
+
+
+def component_tokens(name: str) -> List[str]:
+    """
+    Split a component name into lowercase words ("RadioButton" -> ["radio", "button"]).
+    """
+    return [token for token in _NON_ALNUM.split(_CAMEL_BOUNDARY.sub(" ", name.strip()).lower()) if token]
+
+
+def normalize_component_name(name: str) -> str:
+    """Comparable key of a component name ("Text Field" -> "textfield")."""
+    return "".join(component_tokens(name))
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ComponentIndex:
+    """
+    Constant-time component lookup with ranked fuzzy alternatives.
+    """
+
+    def __init__(
+        self,
+        names: Iterable[str],
+        aliases: Optional[Dict[str, str]] = None,
+        fallbacks: Sequence[Tuple[Sequence[str], Sequence[str]]] = ()
+    ):
+        """
+        Build the index.
+
+        Args:
+            names: Canonical component names
+            aliases: Other names resolving exactly to a canonical name
+            fallbacks: (keywords, alternatives) used when no component is similar
+                enough; the first entry with a keyword in the query wins, and an
+                entry without keywords matches any query
+        """
+        self.names: List[str] = list(names)
+        self._exact: Dict[str, str] = {}
+        self._aliases: Dict[str, str] = {}
+        self._tokens: Dict[str, Set[str]] = {}
+        self._trigrams: Dict[str, Set[str]] = {}
+        self._name_trigrams: Dict[str, Set[str]] = {}
+        self._name_tokens: Dict[str, Set[str]] = {}
+        self._order = {name: position for position, name in enumerate(self.names)}
+        self.fallbacks = [(tuple(keywords), list(alternatives)) for keywords, alternatives in fallbacks]
+        self._cache: Dict[Tuple[str, int], List[str]] = {}
+
+        for name in self.names:
+            key = normalize_component_name(name)
+            self._exact.setdefault(key, name)
+            tokens = set(component_tokens(name))
+            trigrams = _trigrams(key)
+            self._name_tokens[name] = tokens
+            self._name_trigrams[name] = trigrams
+            for token in tokens:
+                self._tokens.setdefault(token, set()).add(name)
+            for trigram in trigrams:
+                self._trigrams.setdefault(trigram, set()).add(name)
+        for alias, name in (aliases or {}).items():
+            if name not in self._order:
+                raise ValueError(f"Alias {alias!r} targets unknown component {name!r}")
+            self._aliases[normalize_component_name(alias)] = name
+
+    def __contains__(self, name: str) -> bool:
+        return self.lookup(name) is not None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def lookup(self, name: str) -> Optional[str]:
+        """
+        Canonical name of a component, matched exactly after normalization.
+
+        Returns:
+            Canonical name, or None if the component is not in the index
+        """
+        key = normalize_component_name(name)
+        return self._exact.get(key) or self._aliases.get(key)
+
+    def similarity(self, query: str, name: str) -> float:
+        """
+        Similarity between a query and an indexed name, from 0 upwards.
+
+        Combines the Dice coefficient of their trigrams, the share of the
+        name's words found in the query and a bonus when one contains the other.
+        """
+        key = normalize_component_name(query)
+        name_key = normalize_component_name(name)
+        trigrams = _trigrams(key)
+        name_trigrams = self._name_trigrams.get(name) or _trigrams(name_key)
+        name_tokens = self._name_tokens.get(name) or set(component_tokens(name))
+
+        dice = 2 * len(trigrams & name_trigrams) / (len(trigrams) + len(name_trigrams))
+        tokens = len(set(component_tokens(query)) & name_tokens) / max(1, len(name_tokens))
+        contained = 1.0 if key and (key in name_key or name_key in key) else 0.0
+        return dice + 0.5 * tokens + 0.3 * contained
+
+    def alternatives(self, name: str, limit: int = 3) -> List[str]:
+        """
+        Closest indexed components to a name, most similar first.
+
+        Args:
+            name: Component name (usually one not in the index)
+            limit: Maximum number of alternatives
+
+        Returns:
+            Ranked alternatives, or the matching fallback list when nothing is similar enough
+        """
+        cache_key = (normalize_component_name(name), limit)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
+        key = cache_key[0]
+        candidates: Set[str] = set()
+        for token in component_tokens(name):
+            candidates.update(self._tokens.get(token, ()))
+        for trigram in _trigrams(key):
+            candidates.update(self._trigrams.get(trigram, ()))
+        exact = self._exact.get(key)
+        candidates.discard(exact)
+
+        scored = []
+        for candidate in candidates:
+            score = self.similarity(name, candidate)
+            if score >= MIN_ALTERNATIVE_SCORE:
+                scored.append((-score, self._order[candidate], candidate))
+        scored.sort()
+        result = [candidate for _, _, candidate in scored[:limit]]
+
+        if not result:
+            for keywords, alternatives in self.fallbacks:
+                if not keywords or any(keyword in key for keyword in keywords):
+                    result = alternatives[:limit]
+                    break
+
+        self._cache[cache_key] = result
+        return list(result)
+
+    def resolve(self, name: str, min_score: float = 0.75) -> Optional[str]:
+        """
+        Canonical name of a component, or its closest match if similar enough.
+
+        Args:
+            name: Component name
+            min_score: Minimum similarity of a fuzzy match
+
+        Returns:
+            Canonical name, or None if nothing matches closely
+        """
+        exact = self.lookup(name)
+        if exact is not None:
+            return exact
+        for candidate in self.alternatives(name, limit=1):
+            if self.similarity(name, candidate) >= min_score:
+                return candidate
+        return None
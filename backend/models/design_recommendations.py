@@ -7,10 +7,9 @@ import os
 import sys
 import json
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Iterator, Optional, Union
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-import requests
 
 # Load environment variables from .env file
 load_dotenv()
@@ -24,6 +23,9 @@ from langchain_openai import ChatOpenAI
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.runnables import RunnableSequence
 from .recommendation_validator import RecommendationValidator
+from backend.utils.http_client import get_http_client
+from backend.utils.json_stream import IncrementalArrayParser, parse_json_response
+from backend.services.behavior import analyze_sessions_parallel, BehaviorRollupStore, covered_days
 
 # Define the enhanced prompt template for design recommendations
 design_recommendations_template = PromptTemplate(
@@ -97,14 +99,19 @@ class PostHogClient:
     events, and other user behavior data.
     """
     
-    def __init__(self):
+    def __init__(self, rollup_store=None):
         """
         Initialize the PostHog client with API credentials from environment variables.
+        
+        Args:
+            rollup_store: Daily behavior rollups (BehaviorRollupStore) updated
+                with every session fetch (optional)
         """
         from models.analytics_providers import get_configured_provider
         
         # Utiliser le provider configuré
         self.provider = get_configured_provider()
+        self.rollups = rollup_store
     
     def get_sessions_for_page(self, page_id, date_from=None, date_to=None, days=30):
         """
@@ -148,11 +155,47 @@ class PostHogClient:
         print(f"Fetching sessions for page {page_id} from {date_from} to {date_to}")
         
         # Récupérer les sessions via le provider
-        return self.provider.get_sessions(
+        sessions = self.provider.get_sessions(
             page_id=page_id,
             date_from=date_from,
             date_to=date_to
         )
+        # Liste possiblement tronquée: les agrégats sont enrichis sans être marqués complets
+        self._ingest_rollups(page_id, sessions)
+        return sessions
+    
+    def fetch_sessions_for_page(self, page_id, date_from, date_to):
+        """
+        Retrieve every session recording of a page over a period.
+        
+        The sessions are folded into the rollups. The days the period fully
+        covers are marked complete only if the fetch was exhaustive: no error,
+        no failed session and no truncation.
+        
+        Args:
+            page_id (str): The page identifier (e.g., '/home', '/checkout')
+            date_from (str): Start date in ISO format (inclusive)
+            date_to (str): End date in ISO format (exclusive)
+            
+        Returns:
+            Tuple of the session recordings and whether they are exhaustive
+        """
+        try:
+            sessions, complete = self.provider.fetch_sessions(page_id, date_from=date_from, date_to=date_to)
+        except Exception as e:
+            print(f"Error fetching sessions for page {page_id}: {e}")
+            return [], False
+        
+        self._ingest_rollups(page_id, sessions, covered_days(date_from, date_to) if complete else None)
+        return sessions, complete
+    
+    def _ingest_rollups(self, page_id, sessions, days=None):
+        if self.rollups is None:
+            return
+        try:
+            self.rollups.ingest(sessions, pages=[page_id], days=days)
+        except OSError as e:
+            print(f"Warning: could not update behavior rollups for {page_id}: {e}")
     
     def get_feedback_for_page(self, page_id, date_from=None, date_to=None, days=30):
         """
@@ -218,122 +261,79 @@ class PostHogClient:
         """
         Generate a heatmap of click events from session recordings.
         
+        Clicks are binned into a viewport grid, so the result stays a few
+        kilobytes whatever the number of clicks.
+        
         Args:
             sessions (list): List of session recordings
             
         Returns:
-            dict: Heatmap data structure with click information
-        """
-        heatmap = {}
-        
-        for session in sessions:
-            # Extract click events from the session
-            events = session.get("events", [])
-            for event in events:
-                if event.get("type") == "$click" and "properties" in event:
-                    props = event["properties"]
-                    if "element" in props and "positionX" in props and "positionY" in props:
-                        element = props["element"]
-                        x = props["positionX"]
-                        y = props["positionY"]
-                        
-                        if element not in heatmap:
-                            heatmap[element] = []
-                        
-                        heatmap[element].append({"x": x, "y": y})
-        
-        return heatmap
+            dict: Heatmap data structure (grid, per-element click totals, hotspots)
+        """
+        return self.analyze_behavior(sessions).heatmap.to_dict()
     
     def identify_confusion_areas(self, sessions):
         """
         Identify areas of the UI where users show signs of confusion.
         
+        Repeated clicks on an element and navigation loops (A -> B -> A) are
+        scored, then averaged per area.
+        
         Args:
             sessions (list): List of session recordings
             
         Returns:
             list: Areas of confusion with scores
         """
-        confusion_areas = []
+        return self.analyze_behavior(sessions).confusion_areas()
+    
+    def analyze_behavior(self, sessions):
+        """
+        Compute every behavior metric of the sessions in a single pass.
         
-        for session in sessions:
-            events = session.get("events", [])
-            
-            # Look for patterns indicating confusion
-            # 1. Repeated clicks in the same area
-            click_counts = {}
-            
-            for i, event in enumerate(events):
-                if event.get("type") == "$click" and "properties" in event:
-                    props = event["properties"]
-                    if "element" in props:
-                        element = props["element"]
-                        
-                        if element not in click_counts:
-                            click_counts[element] = 0
-                        
-                        click_counts[element] += 1
-            
-            # Elements with many clicks may indicate confusion
-            for element, count in click_counts.items():
-                if count >= 3:  # Threshold for confusion
-                    confusion_areas.append({
-                        "area": element,
-                        "score": min(count / 3, 10),  # Scale score 1-10
-                        "type": "repeated_clicks"
-                    })
-            
-            # 2. Rapid back and forth between pages
-            page_changes = []
-            
-            for event in events:
-                if event.get("type") == "$pageview" and "properties" in event:
-                    props = event["properties"]
-                    if "pathname" in props:
-                        page_changes.append(props["pathname"])
-            
-            # Check for repeated page changes
-            if len(page_changes) >= 3:
-                for i in range(len(page_changes) - 2):
-                    if page_changes[i] == page_changes[i+2] and page_changes[i] != page_changes[i+1]:
-                        confusion_areas.append({
-                            "area": page_changes[i],
-                            "score": 8,  # High score for navigation confusion
-                            "type": "navigation_loop"
-                        })
-        
-        # Group by area
-        grouped = {}
-        for area_data in confusion_areas:
-            area = area_data["area"]
-            if area not in grouped:
-                grouped[area] = []
-            grouped[area].append(area_data)
-        
-        # Merge and calculate average scores
-        result = []
-        for area, data_list in grouped.items():
-            avg_score = sum(item["score"] for item in data_list) / len(data_list)
-            result.append({
-                "area": area,
-                "score": avg_score,
-                "type": data_list[0]["type"] if len(data_list) == 1 else "multiple"
-            })
+        Large session sets are sharded across a process pool (BEHAVIOR_WORKERS
+        processes); the merged result is identical to the serial analysis.
         
-        # Sort by score (descending)
-        result.sort(key=lambda x: x["score"], reverse=True)
+        Args:
+            sessions (iterable): Session recordings, possibly yielded lazily
+            
+        Returns:
+            BehaviorReport: Rage clicks, navigation loops, scroll depth,
+            dwell time, confusion areas and click heatmap
+        """
+        return analyze_sessions_parallel(sessions)
+    
+    def analyze_funnel(self, sessions, steps):
+        """
+        Compute the conversion of sessions through ordered funnel steps.
         
-        return result
+        Args:
+            sessions (iterable): Session recordings, possibly yielded lazily
+            steps (list): Pages of the funnel, in order
+            
+        Returns:
+            list: Sessions reaching each step, with conversion and drop-off
+        """
+        return self.analyze_behavior(sessions).paths.funnel(steps)
 
 # Import the component list from the validator
-from .recommendation_validator import SUPPORTED_COMPONENTS
+from .recommendation_validator import (
+    SUPPORTED_COMPONENTS, validation_prompt_template, batch_validation_prompt_template, has_failed_validation
+)
+from backend.services.recommendation_cache import (
+    RecommendationCache, SemanticRecommendationCache, DEFAULT_SIMILARITY_THRESHOLD, prompt_fingerprint
+)
+
+# Version des prompts: toute modification d'un template invalide le cache des recommandations
+RECOMMENDATION_PROMPT_VERSION = prompt_fingerprint(design_recommendations_template)
+VALIDATION_PROMPT_VERSION = prompt_fingerprint(validation_prompt_template, batch_validation_prompt_template)
 
 class DesignRecommendationChain:
     """
     A class that manages the generation of design recommendations based on feedback analysis.
     """
     
-    def __init__(self, model="gpt-4o", temperature=0, validator=None):
+    def __init__(self, model="gpt-4o", temperature=0, validator=None, cache=None, semantic_cache=None):
         """
         Initialize the design recommendation chain with the specified LLM.
         
@@ -341,9 +341,24 @@ class DesignRecommendationChain:
             model (str): The OpenAI model to use for the chain
             temperature (float): The temperature setting for the LLM (0-1)
             validator (RecommendationValidator, optional): Custom validator to use
+            cache (RecommendationCache, optional): Cache of generated recommendations
+                (False to disable it). By default, enabled unless RECOMMENDATION_CACHE=false.
+            semantic_cache (SemanticRecommendationCache, optional): Reuse of validated
+                recommendations of similar analyses. By default, enabled when
+                SEMANTIC_CACHE=true, with the SEMANTIC_CACHE_THRESHOLD similarity.
         """
+        self.model = model
+        self.temperature = temperature
         self.llm = ChatOpenAI(model=model, temperature=temperature)
         self.validator = validator or RecommendationValidator(model=model)
+        if cache is None and os.getenv("RECOMMENDATION_CACHE", "true").lower() == "true":
+            cache = RecommendationCache()
+        self.cache = cache
+        if semantic_cache is None and os.getenv("SEMANTIC_CACHE", "false").lower() == "true":
+            semantic_cache = SemanticRecommendationCache(
+                threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", DEFAULT_SIMILARITY_THRESHOLD))
+            )
+        self.semantic_cache = semantic_cache
         self._initialize_chain()
         
     def _initialize_chain(self):
@@ -358,7 +373,8 @@ class DesignRecommendationChain:
         self, 
         analysis_summary: Dict[str, Any],
         page_id: str,
-        validate: bool = True
+        validate: bool = True,
+        use_semantic_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Generate design recommendations based on feedback analysis.
@@ -367,6 +383,8 @@ class DesignRecommendationChain:
             analysis_summary (Dict): The summary of feedback analysis
             page_id (str): The ID of the page being analyzed
             validate (bool): Whether to validate recommendations after generation
+            use_semantic_cache (bool): Whether validated recommendations of a similar
+                analysis may be reused (False forces a fresh generation)
             
         Returns:
             Dict: Design recommendations in structured format
@@ -376,18 +394,63 @@ class DesignRecommendationChain:
             mock_recommendations = self._generate_mock_recommendations(page_id)
             return mock_recommendations if not validate else self.validate_recommendations(mock_recommendations)
             
-        # Convert the analysis summary to a string format suitable for the prompt
-        summary_str = json.dumps(analysis_summary, indent=2)
+        # Identical requests (same summary, page, components, model and prompts) are served from the cache
+        fingerprint = self._cache_fingerprint(analysis_summary, page_id, validate)
+        if fingerprint is not None:
+            cached = self.cache.get(fingerprint)
+            if cached is not None:
+                return cached
         
-        # Format component list as string
-        component_list = "\n".join([f"- {component}" for component in SUPPORTED_COMPONENTS])
+        # Validated recommendations of a near-identical analysis are reused for this page
+        embedding = None
+        scope = self._semantic_scope(validate)
+        if self.semantic_cache is not None and validate and use_semantic_cache:
+            embedding = self.semantic_cache.embed(analysis_summary)
+            match = self.semantic_cache.lookup(embedding, scope) if embedding is not None else None
+            if match is not None:
+                recommendations = self.semantic_cache.adapt(match[0], page_id, match[1])
+                if fingerprint is not None:
+                    self.cache.put(fingerprint, recommendations)
+                return recommendations
         
+        recommendations = self._generate_recommendations(analysis_summary, page_id, validate)
+        # A set whose validation failed is not kept: the next request retries it
+        if has_failed_validation(recommendations):
+            return recommendations
+        if fingerprint is not None:
+            self.cache.put(fingerprint, recommendations)
+        if embedding is not None:
+            self.semantic_cache.add(embedding, scope, page_id, recommendations)
+        return recommendations
+    
+    def _semantic_scope(self, validate: bool) -> str:
+        """Recommendations are only reused between requests sharing this scope."""
+        prompt_version = RECOMMENDATION_PROMPT_VERSION
+        if validate:
+            prompt_version += ":" + VALIDATION_PROMPT_VERSION
+        return f"{self.model}@{self.temperature}:{prompt_version}"
+    
+    def _cache_fingerprint(self, analysis_summary: Dict[str, Any], page_id: str, validate: bool) -> Optional[str]:
+        """Cache key of a request, or None if caching is disabled."""
+        if not self.cache:
+            return None
+        prompt_version = RECOMMENDATION_PROMPT_VERSION
+        if validate:
+            prompt_version += ":" + VALIDATION_PROMPT_VERSION
+        return self.cache.fingerprint(
+            analysis_summary, page_id, SUPPORTED_COMPONENTS,
+            f"{self.model}@{self.temperature}", prompt_version, validated=validate
+        )
+    
+    def _generate_recommendations(
+        self,
+        analysis_summary: Dict[str, Any],
+        page_id: str,
+        validate: bool
+    ) -> Dict[str, Any]:
+        """Generate recommendations with the LLM (and validate them if requested)."""
         # Generate recommendations
-        result = self.recommendation_chain.invoke({
-            "analysis_summary": summary_str,
-            "page_id": page_id,
-            "component_list": component_list
-        })
+        result = self.recommendation_chain.invoke(self._prompt_inputs(analysis_summary, page_id))
         
         try:
             # Extract content from AIMessage if needed
@@ -396,40 +459,123 @@ class DesignRecommendationChain:
             else:
                 result_content = str(result)
                 
-            # Clean up the result to ensure valid JSON
-            # Remove markdown code blocks if present
-            result_content = result_content.replace("```json", "").replace("```", "").strip()
+            # Parse the JSON, ignoring markdown code blocks around it
+            parsed_json = parse_json_response(result_content)
             
-            # Attempt to parse the JSON
-            try:
-                parsed_json = json.loads(result_content)
-                
-                # Validate recommendations if requested
-                if validate:
-                    return self.validate_recommendations(parsed_json)
-                return parsed_json
-                
-            except json.JSONDecodeError:
-                # Try to extract JSON using regex as a fallback
-                import re
-                json_match = re.search(r'(\{[\s\S]*\})', result_content, re.DOTALL)
-                if json_match:
-                    try:
-                        parsed_json = json.loads(json_match.group(1))
-                        # Validate recommendations if requested
-                        if validate:
-                            return self.validate_recommendations(parsed_json)
-                        return parsed_json
-                    except:
-                        pass
-                
-                # If we still couldn't parse it, raise an exception
-                raise ValueError("Failed to parse LLM output as valid JSON")
+            # Validate recommendations if requested
+            if validate:
+                return self.validate_recommendations(parsed_json)
+            return parsed_json
         except Exception as e:
             # Rather than returning a simplified result, raise an exception
             # to force the use of real recommendations only
             raise ValueError(f"Failed to generate valid recommendations: {str(e)}")
     
+    @staticmethod
+    def _prompt_inputs(analysis_summary: Dict[str, Any], page_id: str) -> Dict[str, str]:
+        # Convert the analysis summary to a string format suitable for the prompt
+        summary_str = json.dumps(analysis_summary, indent=2)
+        
+        # Format component list as string
+        component_list = "\n".join([f"- {component}" for component in SUPPORTED_COMPONENTS])
+        
+        return {
+            "analysis_summary": summary_str,
+            "page_id": page_id,
+            "component_list": component_list
+        }
+    
+    def stream_recommendations(
+        self,
+        analysis_summary: Dict[str, Any],
+        page_id: str,
+        validate: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Generate design recommendations, yielding each one as soon as the LLM has written it.
+        
+        The LLM output is parsed while it streams in: every recommendation is
+        yielded, and its validation started, as soon as its JSON object closes,
+        so validation overlaps with the rest of the generation.
+        
+        Args:
+            analysis_summary (Dict): The summary of feedback analysis
+            page_id (str): The ID of the page being analyzed
+            validate (bool): Whether to validate recommendations during generation
+            
+        Yields:
+            Dict: Events, in this order for each recommendation:
+                {"event": "recommendation", "index": i, "recommendation": {...}} once generated,
+                {"event": "validation", "index": i, "validation": {...}} once validated,
+            and finally {"event": "complete", "recommendations": {...}} with the same
+            result as generate_recommendations. A set served from the cache yields
+            each validation event right after its recommendation, carrying the
+            recommendation's stored "validation" summary. A truncated LLM output
+            keeps its complete recommendations but is not cached.
+        """
+        fingerprint = None
+        if os.getenv("TESTING", "false").lower() == "true":
+            chunks = iter([json.dumps(self._generate_mock_recommendations(page_id))])
+        else:
+            fingerprint = self._cache_fingerprint(analysis_summary, page_id, validate)
+            cached = self.cache.get(fingerprint) if fingerprint is not None else None
+            if cached is not None:
+                for index, recommendation in enumerate(cached.get("recommendations", [])):
+                    yield {"event": "recommendation", "index": index, "recommendation": recommendation}
+                    if validate and "validation" in recommendation:
+                        yield {"event": "validation", "index": index, "validation": recommendation["validation"]}
+                yield {"event": "complete", "recommendations": cached}
+                return
+            chunks = (
+                chunk.content if hasattr(chunk, 'content') else str(chunk)
+                for chunk in self.recommendation_chain.stream(self._prompt_inputs(analysis_summary, page_id))
+            )
+        
+        parser = IncrementalArrayParser("recommendations")
+        validation = self.validator.start_streaming_validation() if validate else None
+        streamed: List[Dict[str, Any]] = []
+        
+        def emit(recommendation):
+            index = len(streamed)
+            streamed.append(recommendation)
+            if validation is not None:
+                validation.submit(recommendation)
+            return {"event": "recommendation", "index": index, "recommendation": recommendation}
+        
+        def validated():
+            for index, result in validation.completed() if validation is not None else ():
+                yield {"event": "validation", "index": index, "validation": result}
+        
+        for chunk in chunks:
+            for recommendation in parser.feed(chunk):
+                yield emit(recommendation)
+            yield from validated()
+        
+        truncated = False
+        try:
+            document = parser.document()
+        except ValueError as e:
+            if not streamed:
+                raise ValueError(f"Failed to generate valid recommendations: {str(e)}")
+            # Sortie tronquée: on garde les recommandations complètes déjà reçues, sans les mettre en cache
+            document = {"page_id": page_id, "recommendations": streamed}
+            truncated = True
+        if isinstance(document, list):
+            document = {"page_id": page_id, "recommendations": document}
+        # Recommendations the incremental parser missed (unexpected nesting) are emitted last
+        for recommendation in document.get("recommendations", [])[len(streamed):]:
+            yield emit(recommendation)
+        document["recommendations"] = streamed
+        
+        if validation is not None:
+            recommendations = validation.finish(document)
+            yield from validated()
+        else:
+            recommendations = document
+        if fingerprint is not None and not truncated and not has_failed_validation(recommendations):
+            self.cache.put(fingerprint, recommendations)
+        yield {"event": "complete", "recommendations": recommendations}
+    
     def validate_recommendations(self, recommendations: Dict[str, Any]) -> Dict[str, Any]:
         """
         Validate generated recommendations for feasibility.
@@ -441,6 +587,18 @@ class DesignRecommendationChain:
             Dict: Validated recommendations with feasibility information
         """
         return self.validator.validate_all_recommendations(recommendations)
+    
+    async def avalidate_recommendations(self, recommendations: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate generated recommendations for feasibility, for async callers.
+        
+        Args:
+            recommendations (Dict): The recommendations to validate
+            
+        Returns:
+            Dict: Validated recommendations with feasibility information
+        """
+        return await self.validator.avalidate_all_recommendations(recommendations)
             
     def _generate_mock_recommendations(self, page_id: str) -> Dict[str, Any]:
         """Generate mock recommendations for testing purposes."""
@@ -628,7 +786,7 @@ def fetch_session_recordings(user_id=None, date_from=None, date_to=None):
         params["date_to"] = date_to
     
     try:
-        response = requests.get(api_url, headers=headers, params=params)
+        response = get_http_client().get(api_url, headers=headers, params=params)
         response.raise_for_status()
         return response.json()
     except Exception as e:
@@ -652,7 +810,7 @@ def download_session_data(session_id):
     }
     
     try:
-        response = requests.get(api_url, headers=headers)
+        response = get_http_client().get(api_url, headers=headers)
         response.raise_for_status()
         return response.json()
     except Exception as e:
@@ -664,9 +822,19 @@ class DesignSuggestionGenerator:
     Générateur de suggestions de design basé sur l'analyse des comportements utilisateurs.
     """
     
-    def __init__(self):
-        """Initialiser le générateur de suggestions."""
-        self.posthog_client = PostHogClient()
+    def __init__(self, rollup_store=None):
+        """
+        Initialiser le générateur de suggestions.
+        
+        Args:
+            rollup_store: Agrégats quotidiens de comportement par page (BehaviorRollupStore).
+                Par défaut, activés par BEHAVIOR_ROLLUPS=true.
+        """
+        if rollup_store is None and os.getenv("BEHAVIOR_ROLLUPS", "false").lower() == "true":
+            rollup_store = BehaviorRollupStore()
+        self.rollups = rollup_store
+        # Chaque récupération de sessions alimente les agrégats
+        self.posthog_client = PostHogClient(rollup_store=rollup_store)
     
     def generate_layout_suggestions(self, page_id, date_range=30):
         """
@@ -680,20 +848,54 @@ class DesignSuggestionGenerator:
             Dict avec des suggestions de design structurées
         """
         # Récupérer les données
-        sessions = self.posthog_client.get_sessions_for_page(page_id, days=date_range)
         feedback = self.posthog_client.get_feedback_for_page(page_id, days=date_range)
-        
-        # Analyser les comportements
-        click_heatmap = self.posthog_client.generate_click_heatmap(sessions)
-        confusion_areas = self.posthog_client.identify_confusion_areas(sessions)
+        if self.rollups is not None:
+            sessions = []
+            behavior = self._behavior_from_rollups(page_id, date_range)
+        else:
+            sessions = self.posthog_client.get_sessions_for_page(page_id, days=date_range)
+            # Analyser les comportements en une seule passe sur les événements
+            behavior = self.posthog_client.analyze_behavior(sessions)
+        click_heatmap = behavior.heatmap.to_dict()
+        confusion_areas = behavior.confusion_areas()
         
         # Générer des suggestions
         return {
             "layout_improvements": self._suggest_layout_improvements(click_heatmap, confusion_areas),
             "ui_element_changes": self._suggest_ui_element_changes(feedback, sessions),
-            "flow_improvements": self._suggest_flow_improvements(sessions)
+            "flow_improvements": self._suggest_flow_improvements(sessions, behavior)
         }
     
+    def _behavior_from_rollups(self, page_id, date_range):
+        """
+        Comportement d'une page sur la période, à partir des agrégats quotidiens.
+        
+        Seuls les jours sans agrégat complet sont récupérés depuis PostHog; le
+        client les ajoute aux agrégats, et ne les marque complets que si la
+        récupération a été exhaustive.
+        
+        Args:
+            page_id: ID de la page/écran à analyser
+            date_range: Nombre de jours à analyser
+            
+        Returns:
+            BehaviorReport de la période
+        """
+        date_to = (datetime.now() - timedelta(days=1)).date()
+        date_from = date_to - timedelta(days=date_range)
+        behavior, missing = self.rollups.query(page_id, date_from, date_to)
+        if not missing:
+            return behavior
+        
+        self.posthog_client.fetch_sessions_for_page(
+            page_id,
+            date_from=datetime.combine(missing[0], datetime.min.time()).isoformat(),
+            date_to=datetime.combine(missing[-1] + timedelta(days=1), datetime.min.time()).isoformat()
+        )
+        # Les jours récupérés partiellement sont inclus, et restent à compléter
+        behavior, _ = self.rollups.query(page_id, date_from, date_to, include_partial=True)
+        return behavior
+    
     def _suggest_layout_improvements(self, heatmap, confusion_areas):
         """
         Suggère des améliorations de mise en page basées sur la carte de chaleur et les zones de confusion.
@@ -784,32 +986,70 @@ class DesignSuggestionGenerator:
         
         return suggestions
     
-    def _suggest_flow_improvements(self, sessions):
+    def _suggest_flow_improvements(self, sessions, behavior=None):
         """
         Suggère des améliorations de flux de navigation basées sur les données de session.
         
         Args:
             sessions: Données de session utilisateur
+            behavior: Rapport de comportement déjà calculé sur ces sessions (optionnel)
             
         Returns:
             Liste de suggestions d'amélioration de flux
         """
-        # Cette méthode analyserait les parcours utilisateurs pour identifier
-        # des opportunités d'amélioration du flux de navigation
+        if behavior is None:
+            behavior = analyze_sessions_parallel(sessions)
+        if not behavior.sessions:
+            return []
         
-        # Implémentation simplifiée pour le test
         suggestions = []
         
-        # Identifier les abandons fréquents
-        # (implémentation simulée)
-        if len(sessions) > 0:
+        # Boucles de navigation: l'utilisateur revient sur une page qu'il vient de quitter
+        for page, (loops, loop_sessions) in sorted(
+            behavior.navigation_loops.items(), key=lambda item: item[1][0], reverse=True
+        )[:3]:
+            share = loop_sessions / behavior.sessions
             suggestions.append({
-                "element": "navigation",
-                "suggestion": "Simplifier le processus de navigation",
-                "priority": "medium",
-                "reason": "Taux d'abandon élevé observé dans les sessions"
+                "element": page,
+                "suggestion": "Clarifier la navigation depuis cette page",
+                "priority": "high" if share >= 0.2 else "medium",
+                "reason": f"Allers-retours vers {page} dans {round(share * 100)}% des sessions ({loops} boucles)"
+            })
+        
+        # Rage clicks: éléments qui ne réagissent pas comme attendu
+        for element, (bursts, rage_sessions) in sorted(
+            behavior.rage_clicks.items(), key=lambda item: item[1][0], reverse=True
+        )[:3]:
+            suggestions.append({
+                "element": element,
+                "suggestion": "Vérifier le retour visuel et le comportement de cet élément",
+                "priority": "high" if rage_sessions / behavior.sessions >= 0.1 else "medium",
+                "reason": f"{bursts} séries de clics rapides répétés dans {rage_sessions} sessions"
             })
         
+        # Points de sortie: préfixes de parcours où une large part des sessions s'arrête
+        min_sessions = max(5, behavior.paths.sessions // 20)
+        for point in behavior.paths.drop_off_points(top=3, min_sessions=min_sessions):
+            if len(point["path"]) < 2 or point["exit_rate"] < 0.5:
+                continue
+            suggestions.append({
+                "element": point["page"],
+                "suggestion": "Ajouter une étape suivante claire sur cette page",
+                "priority": "high" if point["exit_rate"] >= 0.75 else "medium",
+                "reason": f"{round(point['exit_rate'] * 100)}% des sessions arrivées par "
+                          f"{' > '.join(point['path'])} s'arrêtent ici"
+            })
+        
+        # Pages sur lesquelles les utilisateurs restent très longtemps: contenu difficile à parcourir
+        for page, (total, visits) in behavior.dwell_time.items():
+            if visits and total / visits > 120_000:
+                suggestions.append({
+                    "element": page,
+                    "suggestion": "Raccourcir ou découper le contenu de cette page",
+                    "priority": "medium",
+                    "reason": f"Temps moyen passé de {round(total / visits / 1000)} secondes"
+                })
+        
         return suggestions
 
 # Test function
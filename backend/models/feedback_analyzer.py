@@ -16,6 +16,7 @@ root_dir = str(Path(__file__).parent.parent.parent)
 sys.path.append(root_dir)
 
 from backend.models.analysis_chains import FeedbackAnalysisChains
+from backend.utils.ndjson import load_records
 
 # Configure logging
 logging.basicConfig(
@@ -26,17 +27,16 @@ logger = logging.getLogger(__name__)
 
 def load_feedback_data(file_path: str) -> List[Dict[str, Any]]:
     """
-    Load feedback data from a JSON file.
+    Load feedback data from a JSON or NDJSON file (optionally gzip-compressed).
     
     Args:
-        file_path (str): Path to the JSON file containing feedback data
+        file_path (str): Path to the file containing feedback data
         
     Returns:
         List[Dict]: A list of feedback items with their metadata
     """
     try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        data = load_records(file_path)
         logger.info(f"Successfully loaded {len(data)} feedback items from {file_path}")
         return data
     except Exception as e:
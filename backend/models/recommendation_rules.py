@@ -0,0 +1,181 @@
+"""
+Deterministic pre-validation of design recommendations.
+Outcomes that can be decided locally (unsupported component, missing field,
+impossible figure, duplicate title) are resolved by rules before any LLM
+call; only the remaining, ambiguous recommendations need the LLM validator.
+"""
+
+import re
+from typing import Dict, List, Any, Optional, Tuple
+
+from backend.models.component_index import ComponentIndex
+
+# Design patterns and component library information
+SUPPORTED_COMPONENTS = [
+    "Button", "TextField", "Dropdown", "Checkbox", "RadioButton", "Slider",
+    "Toggle", "Form", "Card", "Modal", "Navigation", "Menu", "Tab", "Accordion",
+    "Table", "List", "Image", "Icon", "Typography", "Container", "Layout",
+    "SectionDivider", "BreadCrumb", "Pagination", "SearchBar", "DatePicker",
+    "Notification", "Progress", "Tooltip", "Badge", "Carousel"
+]
+
+# Alternatives proposées quand aucun composant n'est assez proche
+COMPONENT_FALLBACKS = [
+    (("input", "field"), ["TextField", "Dropdown", "Checkbox", "RadioButton"]),
+    (("button",), ["Button", "Toggle"]),
+    (("container", "section"), ["Container", "Card", "Layout"]),
+    (("nav", "menu"), ["Navigation", "Menu", "Tab", "BreadCrumb"]),
+    ((), ["Container", "Card", "Layout"]),
+]
+
+SUPPORTED_COMPONENT_INDEX = ComponentIndex(SUPPORTED_COMPONENTS, fallbacks=COMPONENT_FALLBACKS)
+
+# Champs sans lesquels une recommandation ne peut pas être évaluée
+REQUIRED_FIELDS = ("title", "description", "component", "location", "priority")
+
+VALID_PRIORITIES = ("high", "medium", "low")
+
+# Une baisse de plus de 100% est impossible ("reduce abandonment by 150%")
+_REDUCTION_CLAIM = re.compile(
+    r"\b(?:reduc|decreas|cut|lower|drop)\w*\b[^.%]{0,60}?(\d+(?:\.\d+)?)\s*%",
+    re.IGNORECASE
+)
+
+
+def check_component_support(component_type: str) -> Tuple[bool, List[str]]:
+    """
+    Check if a component type is supported and suggest alternatives if not.
+
+    Args:
+        component_type (str): The component type to check
+
+    Returns:
+        Tuple[bool, List[str]]: (is_supported, alternative_suggestions)
+    """
+    if component_type in SUPPORTED_COMPONENT_INDEX:
+        return True, []
+    return False, SUPPORTED_COMPONENT_INDEX.alternatives(component_type, limit=3)
+
+
+def _issue(issue_type: str, description: str, severity: str, suggested_fix: str) -> Dict[str, str]:
+    return {
+        "issue_type": issue_type,
+        "description": description,
+        "severity": severity,
+        "suggested_fix": suggested_fix
+    }
+
+
+def _resolution(
+    recommendation: Dict[str, Any],
+    is_feasible: bool,
+    score: int,
+    issues: List[Dict[str, str]],
+    notes: str
+) -> Dict[str, Any]:
+    """Validation result in the format returned by the LLM validator."""
+    return {
+        "recommendation_title": recommendation.get("title") or "Unknown recommendation",
+        "is_feasible": is_feasible,
+        "feasibility_score": score,
+        "issues": issues,
+        "modified_recommendation": dict(recommendation),
+        "implementation_notes": notes,
+        "validated_by": "rules"
+    }
+
+
+class RecommendationRuleEngine:
+    """
+    Rule-based validator deciding the recommendations that need no LLM review.
+    """
+
+    def check(self, recommendation: Dict[str, Any], seen_titles: Dict[str, int], index: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        Apply the rules to one recommendation.
+
+        Args:
+            recommendation (Dict): The recommendation to check
+            seen_titles (Dict[str, int]): Normalized titles already checked, with their index
+                (updated with this recommendation's title)
+            index (int): Position of the recommendation in its set
+
+        Returns:
+            Optional[Dict]: Validation result if the rules decide the outcome, None if the LLM is needed
+        """
+        if not isinstance(recommendation, dict):
+            return _resolution({}, False, 0, [_issue(
+                "technical", "Recommendation is not a JSON object", "high",
+                "Regenerate the recommendation in the expected format"
+            )], "Rejected by format rules")
+
+        # Champs obligatoires
+        missing = [field for field in REQUIRED_FIELDS
+                   if not isinstance(recommendation.get(field), str) or not recommendation[field].strip()]
+        if missing:
+            return _resolution(recommendation, False, 0, [_issue(
+                "technical", f"Missing required fields: {', '.join(missing)}", "high",
+                "Provide every required field of the recommendation format"
+            )], "Rejected by format rules")
+
+        # Titres en double: seule la première occurrence est évaluée
+        title = " ".join(recommendation["title"].lower().split())
+        if title in seen_titles:
+            return _resolution(recommendation, False, 0, [_issue(
+                "consistency", f"Duplicate of recommendation #{seen_titles[title] + 1}", "medium",
+                "Merge this recommendation with the first one sharing its title"
+            )], "Duplicate recommendation")
+        seen_titles[title] = index
+
+        # Composant hors de la bibliothèque supportée
+        is_supported, alternatives = check_component_support(recommendation["component"])
+        if not is_supported:
+            return _resolution(recommendation, False, 0, [_issue(
+                "technical", f"Component '{recommendation['component']}' is not supported", "high",
+                f"Use one of: {', '.join(alternatives)}"
+            )], "Rejected by component rules")
+
+        issues = []
+        if recommendation["priority"].strip().lower() not in VALID_PRIORITIES:
+            issues.append(_issue(
+                "consistency", f"Unknown priority '{recommendation['priority']}'", "low",
+                "Use high, medium or low"
+            ))
+
+        # Affirmations chiffrées impossibles
+        for field in ("expected_impact", "description", "justification"):
+            text = recommendation.get(field)
+            if not isinstance(text, str):
+                continue
+            for match in _REDUCTION_CLAIM.finditer(text):
+                if float(match.group(1)) > 100:
+                    issues.append(_issue(
+                        "consistency", f"Impossible figure in {field}: '{match.group(0).strip()}'", "medium",
+                        "State a reduction of at most 100%, backed by the analysis data"
+                    ))
+        if issues:
+            return _resolution(recommendation, True, 60, issues, "Needs the listed corrections before implementation")
+
+        return None
+
+    def prevalidate(self, recommendations: List[Dict[str, Any]]) -> Tuple[List[Optional[Dict[str, Any]]], Dict[str, Any]]:
+        """
+        Apply the rules to a set of recommendations.
+
+        Args:
+            recommendations (List[Dict]): The recommendations to check, in order
+
+        Returns:
+            Tuple: Validation result of each recommendation (None when the LLM is
+            needed), and statistics with the fraction of LLM calls skipped
+        """
+        seen_titles: Dict[str, int] = {}
+        results = [self.check(rec, seen_titles, index) for index, rec in enumerate(recommendations)]
+        resolved = sum(result is not None for result in results)
+        total = len(recommendations)
+        return results, {
+            "total": total,
+            "resolved_by_rules": resolved,
+            "sent_to_llm": total - resolved,
+            "skipped_fraction": resolved / total if total else 0.0
+        }
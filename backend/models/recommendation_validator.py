@@ -6,6 +6,8 @@ and align with best UI/UX practices.
 import json
 import os
 import sys
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, Future
 from pathlib import Path
 from typing import Dict, List, Any, Tuple, Optional
 
@@ -17,15 +19,18 @@ from langchain.prompts import PromptTemplate
 from langchain_openai import ChatOpenAI
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.runnables import RunnableSequence
+from backend.models.recommendation_rules import (
+    SUPPORTED_COMPONENTS, RecommendationRuleEngine, check_component_support
+)
 
-# Design patterns and component library information
-SUPPORTED_COMPONENTS = [
-    "Button", "TextField", "Dropdown", "Checkbox", "RadioButton", "Slider", 
-    "Toggle", "Form", "Card", "Modal", "Navigation", "Menu", "Tab", "Accordion",
-    "Table", "List", "Image", "Icon", "Typography", "Container", "Layout",
-    "SectionDivider", "BreadCrumb", "Pagination", "SearchBar", "DatePicker",
-    "Notification", "Progress", "Tooltip", "Badge", "Carousel"
-]
+# Nombre maximal de validations LLM menées en parallèle
+DEFAULT_VALIDATION_CONCURRENCY = int(os.getenv("VALIDATION_CONCURRENCY", "4"))
+# Validation groupée: un seul prompt pour plusieurs recommandations
+DEFAULT_BATCH_VALIDATION = os.getenv("VALIDATION_BATCHED", "false").lower() == "true"
+# Budget (en tokens estimés) des recommandations envoyées dans un même prompt
+DEFAULT_BATCH_TOKEN_BUDGET = int(os.getenv("VALIDATION_BATCH_TOKENS", "6000"))
+# Nombre maximal de recommandations par prompt, pour borner la taille de la réponse
+MAX_BATCH_SIZE = 10
 
 # Template for validation prompt
 validation_prompt_template = PromptTemplate(
@@ -81,20 +86,188 @@ IMPORTANT:
 """
 )
 
+# Template for batched validation prompt
+batch_validation_prompt_template = PromptTemplate(
+    input_variables=["recommendations"],
+    template="""
+You are an expert UI/UX engineer responsible for validating design recommendations to ensure they are feasible and align with best practices.
+
+Review each of the following design recommendations. Each one has an "index" and the recommendation itself:
+{recommendations}
+
+Evaluate every recommendation independently based on the following criteria:
+1. Technical feasibility - Can this be implemented with standard web components?
+2. UI/UX best practices - Does it follow established design patterns?
+3. Accessibility - Does it maintain or improve accessibility?
+4. Consistency - Is it consistent with modern design systems?
+5. Implementation complexity - How difficult would it be to implement?
+
+Return a JSON array with one object per recommendation, in the same order, each with this exact structure:
+[
+    {{
+        "index": "The index of the recommendation",
+        "recommendation_title": "Title from the original recommendation",
+        "is_feasible": true/false,
+        "feasibility_score": 0-100,
+        "issues": [
+            {{
+                "issue_type": "technical|ux|accessibility|consistency|complexity",
+                "description": "Detailed description of the issue",
+                "severity": "high|medium|low",
+                "suggested_fix": "Suggestion to address this issue"
+            }}
+        ],
+        "modified_recommendation": {{
+            "title": "Same or modified title",
+            "description": "Same or modified description",
+            "component": "Same or modified component type",
+            "location": "Same location",
+            "expected_impact": "Same or modified impact",
+            "priority": "Same or adjusted priority",
+            "justification": "Same justification",
+            "before_after": {{
+                "before": "Same before state",
+                "after": "Modified after state if needed"
+            }}
+        }},
+        "implementation_notes": "Notes on how to implement this recommendation"
+    }}
+]
+
+IMPORTANT: 
+- If a recommendation is mostly feasible with minor adjustments, set is_feasible to true but include the necessary modifications.
+- If a recommendation has fundamental flaws that make it impractical, set is_feasible to false and explain why.
+- Your response must be a valid JSON array - nothing else.
+"""
+)
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text (about 4 characters per token)."""
+    return len(text) // 4 + 1
+
+def has_failed_validation(recommendations: Dict[str, Any]) -> bool:
+    """True if the validation of any recommendation failed (error, not infeasibility)."""
+    return any(
+        isinstance(rec, dict) and rec.get("validation", {}).get("failed", False)
+        for rec in recommendations.get("recommendations", [])
+    )
+
+class StreamingValidation:
+    """
+    Validation of recommendations submitted one by one while they are generated.
+    
+    Each submitted recommendation goes through the rules at once and, if the
+    rules cannot decide, starts its LLM validation in a thread pool, so
+    validation overlaps with the generation of the next recommendations.
+    """
+    
+    def __init__(self, validator: "RecommendationValidator"):
+        self.validator = validator
+        self.recs: List[Dict[str, Any]] = []
+        self._results: List[Optional[Dict[str, Any]]] = []
+        self._futures: Dict[int, Future] = {}
+        self._reported: set = set()
+        self._seen_titles: Dict[str, int] = {}
+        self._resolved_by_rules = 0
+        self._executor = ThreadPoolExecutor(max_workers=validator.max_concurrency)
+    
+    def submit(self, recommendation: Dict[str, Any]) -> int:
+        """
+        Start the validation of a recommendation.
+        
+        Returns:
+            int: Index of the recommendation in the set
+        """
+        index = len(self.recs)
+        self.recs.append(recommendation)
+        result = None
+        if self.validator.rules is not None:
+            result = self.validator.rules.check(recommendation, self._seen_titles, index)
+        self._results.append(result)
+        if result is not None:
+            self._resolved_by_rules += 1
+        else:
+            self._futures[index] = self._executor.submit(self.validator.validate_recommendation, recommendation)
+        return index
+    
+    def _result(self, index: int) -> Dict[str, Any]:
+        if self._results[index] is None:
+            try:
+                self._results[index] = self._futures[index].result()
+            except Exception as e:
+                self._results[index] = self.validator._failed_validation(self.recs[index], e)
+        return self._results[index]
+    
+    def completed(self) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Validations finished since the last call, without waiting for the others.
+        
+        Returns:
+            List[Tuple[int, Dict]]: (index, validation result) pairs
+        """
+        done = [
+            index for index in range(len(self.recs))
+            if index not in self._reported
+            and (index not in self._futures or self._futures[index].done())
+        ]
+        self._reported.update(done)
+        return [(index, self._result(index)) for index in done]
+    
+    def finish(self, recommendations: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Wait for the pending validations and merge every result.
+        
+        Args:
+            recommendations (Dict): The full recommendations object (page id, notes)
+            
+        Returns:
+            Dict: Validated recommendations, as returned by validate_all_recommendations
+        """
+        try:
+            results = [self._result(index) for index in range(len(self.recs))]
+        finally:
+            self._executor.shutdown(wait=False)
+        rule_stats = None
+        if self.validator.rules is not None:
+            total = len(self.recs)
+            rule_stats = {
+                "total": total,
+                "resolved_by_rules": self._resolved_by_rules,
+                "sent_to_llm": total - self._resolved_by_rules,
+                "skipped_fraction": self._resolved_by_rules / total if total else 0.0
+            }
+        return self.validator._summarize_validations(recommendations, self.recs, results, rule_stats)
+
 class RecommendationValidator:
     """
     A class that validates design recommendations for feasibility and alignment with best practices.
     """
     
-    def __init__(self, model="gpt-4o", temperature=0):
+    def __init__(
+        self,
+        model="gpt-4o",
+        temperature=0,
+        max_concurrency=DEFAULT_VALIDATION_CONCURRENCY,
+        batched=DEFAULT_BATCH_VALIDATION,
+        batch_token_budget=DEFAULT_BATCH_TOKEN_BUDGET,
+        prevalidate=True
+    ):
         """
         Initialize the recommendation validator with the specified LLM.
         
         Args:
             model (str): The OpenAI model to use 
             temperature (float): The temperature setting for the LLM (0-1)
+            max_concurrency (int): Maximum number of validations running at once
+            batched (bool): Validate several recommendations per prompt
+            batch_token_budget (int): Estimated tokens of recommendations per batched prompt
+            prevalidate (bool): Resolve locally decidable recommendations with rules, without the LLM
         """
         self.llm = ChatOpenAI(model=model, temperature=temperature)
+        self.max_concurrency = max(1, max_concurrency)
+        self.batched = batched
+        self.batch_token_budget = batch_token_budget
+        self.rules = RecommendationRuleEngine() if prevalidate else None
         self._initialize_validator()
         
     def _initialize_validator(self):
@@ -104,6 +277,10 @@ class RecommendationValidator:
             first=validation_prompt_template,
             last=self.llm
         )
+        self.batch_validation_chain = RunnableSequence(
+            first=batch_validation_prompt_template,
+            last=self.llm
+        )
     
     def validate_recommendation(self, recommendation: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -115,15 +292,40 @@ class RecommendationValidator:
         Returns:
             Dict: Validation results with feasibility assessment and potential modifications
         """
-        # Convert the recommendation to a string format for the prompt
-        recommendation_str = json.dumps(recommendation, indent=2)
-        
         # Generate validation
-        result = self.validation_chain.invoke({
-            "recommendation": recommendation_str
-        })
+        result = self.validation_chain.invoke(self._prompt_inputs(recommendation))
+        return self._parse_validation_result(result, recommendation)
+    
+    async def avalidate_recommendation(self, recommendation: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate a single design recommendation without blocking the event loop.
+        
+        Args:
+            recommendation (Dict): The recommendation to validate
+            
+        Returns:
+            Dict: Validation results with feasibility assessment and potential modifications
+        """
+        result = await self.validation_chain.ainvoke(self._prompt_inputs(recommendation))
+        return self._parse_validation_result(result, recommendation)
+    
+    @staticmethod
+    def _prompt_inputs(recommendation: Dict[str, Any]) -> Dict[str, str]:
+        # Convert the recommendation to a string format for the prompt
+        return {"recommendation": json.dumps(recommendation, indent=2)}
+    
+    @staticmethod
+    def _parse_validation_result(result: Any, recommendation: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Parse the LLM output of a validation.
         
-        # Process the validation result
+        Args:
+            result: Output of the validation chain
+            recommendation (Dict): The validated recommendation
+            
+        Returns:
+            Dict: Validation result, or an error result if the output is not valid JSON
+        """
         try:
             # Extract content from AIMessage if needed
             if hasattr(result, 'content'):
@@ -139,27 +341,277 @@ class RecommendationValidator:
             return validation_result
         except Exception as e:
             # Return an error result if parsing fails
-            return {
-                "recommendation_title": recommendation.get("title", "Unknown recommendation"),
-                "is_feasible": False,
-                "feasibility_score": 0,
-                "issues": [{
-                    "issue_type": "technical",
-                    "description": f"Failed to validate recommendation: {str(e)}",
-                    "severity": "high",
-                    "suggested_fix": "Please review the recommendation format"
-                }],
-                "modified_recommendation": recommendation,
-                "implementation_notes": "Validation failed, please review the recommendation manually"
-            }
+            return RecommendationValidator._failed_validation(recommendation, e)
+    
+    @staticmethod
+    def _failed_validation(recommendation: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        """Validation result of a recommendation whose validation failed."""
+        return {
+            "recommendation_title": recommendation.get("title", "Unknown recommendation"),
+            "is_feasible": False,
+            "feasibility_score": 0,
+            "issues": [{
+                "issue_type": "technical",
+                "description": f"Failed to validate recommendation: {str(error)}",
+                "severity": "high",
+                "suggested_fix": "Please review the recommendation format"
+            }],
+            "modified_recommendation": recommendation,
+            "implementation_notes": "Validation failed, please review the recommendation manually",
+            "validation_failed": True
+        }
     
     def validate_all_recommendations(self, recommendations: Dict[str, Any]) -> Dict[str, Any]:
         """
         Validate all recommendations in a recommendations object.
         
+        Recommendations decided by the rule engine skip the LLM; the others are
+        validated concurrently, at most max_concurrency at a time. Each result
+        keeps the slot of its recommendation.
+        
+        Args:
+            recommendations (Dict): The full recommendations object with multiple recommendations
+            
+        Returns:
+            Dict: Updated recommendations with validation results and modifications
+        """
+        recs = list(recommendations.get("recommendations", []))
+        validation_results, pending, rule_stats = self._prevalidate(recs)
+        pending_recs = [recs[i] for i in pending]
+        if self.batched and len(pending_recs) > 1:
+            llm_results = self.validate_recommendations_batch(pending_recs)
+        else:
+            llm_results = self._validate_each(pending_recs)
+        for index, validation in zip(pending, llm_results):
+            validation_results[index] = validation
+        return self._summarize_validations(recommendations, recs, validation_results, rule_stats)
+    
+    def start_streaming_validation(self) -> StreamingValidation:
+        """
+        Validate recommendations as they are submitted, one by one.
+        
+        Returns:
+            StreamingValidation: Session receiving the recommendations
+        """
+        return StreamingValidation(self)
+    
+    def _prevalidate(self, recs: List[Dict[str, Any]]) -> Tuple[List[Optional[Dict[str, Any]]], List[int], Optional[Dict[str, Any]]]:
+        """
+        Resolve what the rules can decide.
+        
+        Returns:
+            Tuple: Results so far (None where the LLM is needed), indices needing
+            the LLM, and rule statistics (None if pre-validation is disabled)
+        """
+        if self.rules is None:
+            return [None] * len(recs), list(range(len(recs))), None
+        results, stats = self.rules.prevalidate(recs)
+        return results, [i for i, result in enumerate(results) if result is None], stats
+    
+    def _validate_each(self, recs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Validate recommendations one prompt each, concurrently, in order.
+        
+        A validation that raises only fails its own recommendation.
+        """
+        if len(recs) > 1 and self.max_concurrency > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(recs))) as executor:
+                return list(executor.map(self._validate_safely, recs))
+        return [self._validate_safely(rec) for rec in recs]
+    
+    def _validate_safely(self, recommendation: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return self.validate_recommendation(recommendation)
+        except Exception as e:
+            return self._failed_validation(recommendation, e)
+    
+    def _batch_chunks(self, recs: List[Dict[str, Any]]) -> List[List[int]]:
+        """
+        Split recommendations into groups fitting the token budget of one prompt.
+        
+        Returns:
+            List[List[int]]: Indices of the recommendations of each group
+        """
+        chunks, current, current_tokens = [], [], 0
+        for index, rec in enumerate(recs):
+            tokens = estimate_tokens(json.dumps(rec))
+            if current and (current_tokens + tokens > self.batch_token_budget or len(current) >= MAX_BATCH_SIZE):
+                chunks.append(current)
+                current, current_tokens = [], 0
+            current.append(index)
+            current_tokens += tokens
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    @staticmethod
+    def _batch_inputs(recs: List[Dict[str, Any]], chunk: List[int]) -> Dict[str, str]:
+        return {"recommendations": json.dumps(
+            [{"index": index, "recommendation": recs[index]} for index in chunk], indent=2
+        )}
+    
+    @staticmethod
+    def _parse_batch_result(result: Any, recs: List[Dict[str, Any]], chunk: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Match the validations of a batched response back to their recommendations.
+        
+        Results are matched by index, or by title when the index is missing or
+        wrong. Unparseable responses match nothing.
+        
+        Returns:
+            Dict[int, Dict]: Validation result per recommendation index
+        """
+        content = result.content if hasattr(result, 'content') else str(result)
+        content = content.replace("```json", "").replace("```", "").strip()
+        try:
+            items = json.loads(content)
+        except json.JSONDecodeError:
+            return {}
+        if isinstance(items, dict):
+            items = items.get("validations") or items.get("results") or []
+        if not isinstance(items, list):
+            return {}
+        
+        matched: Dict[int, Dict[str, Any]] = {}
+        wanted = set(chunk)
+        for item in items:
+            if not isinstance(item, dict) or "is_feasible" not in item:
+                continue
+            index = item.get("index")
+            if isinstance(index, str) and index.isdigit():
+                index = int(index)
+            if index not in wanted or index in matched:
+                title = item.get("recommendation_title")
+                index = next(
+                    (i for i in chunk if i not in matched and recs[i].get("title") == title),
+                    None
+                )
+            if index is not None:
+                matched[index] = item
+        return matched
+    
+    def validate_recommendations_batch(self, recs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Validate recommendations with batched prompts.
+        
+        Recommendations are grouped into prompts fitting the token budget;
+        any recommendation missing from a response (or from a failed prompt)
+        is validated on its own.
+        
+        Args:
+            recs (List[Dict]): The recommendations to validate
+            
+        Returns:
+            List[Dict]: Validation result of each recommendation, in order
+        """
+        chunks = self._batch_chunks(recs)
+        
+        def validate_chunk(chunk):
+            try:
+                result = self.batch_validation_chain.invoke(self._batch_inputs(recs, chunk))
+            except Exception as e:
+                print(f"⚠️ Batched validation failed, validating one by one: {e}")
+                return {}
+            return self._parse_batch_result(result, recs, chunk)
+        
+        if len(chunks) > 1 and self.max_concurrency > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(chunks))) as executor:
+                matches = list(executor.map(validate_chunk, chunks))
+        else:
+            matches = [validate_chunk(chunk) for chunk in chunks]
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(recs)
+        for matched in matches:
+            for index, validation in matched.items():
+                results[index] = validation
+        
+        missing = [index for index, validation in enumerate(results) if validation is None]
+        for index, validation in zip(missing, self._validate_each([recs[i] for i in missing])):
+            results[index] = validation
+        return results
+    
+    async def avalidate_recommendations_batch(self, recs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Validate recommendations with batched prompts, for async callers.
+        
+        Args:
+            recs (List[Dict]): The recommendations to validate
+            
+        Returns:
+            List[Dict]: Validation result of each recommendation, in order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def validate_chunk(chunk):
+            async with semaphore:
+                try:
+                    result = await self.batch_validation_chain.ainvoke(self._batch_inputs(recs, chunk))
+                except Exception as e:
+                    print(f"⚠️ Batched validation failed, validating one by one: {e}")
+                    return {}
+            return self._parse_batch_result(result, recs, chunk)
+        
+        matches = await asyncio.gather(*(validate_chunk(chunk) for chunk in self._batch_chunks(recs)))
+        results: List[Optional[Dict[str, Any]]] = [None] * len(recs)
+        for matched in matches:
+            for index, validation in matched.items():
+                results[index] = validation
+        
+        missing = [index for index, validation in enumerate(results) if validation is None]
+        for index, validation in zip(missing, await self._avalidate_each([recs[i] for i in missing])):
+            results[index] = validation
+        return results
+    
+    async def avalidate_all_recommendations(self, recommendations: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate all recommendations in a recommendations object, for async callers.
+        
         Args:
             recommendations (Dict): The full recommendations object with multiple recommendations
             
+        Returns:
+            Dict: Updated recommendations with validation results and modifications
+        """
+        recs = list(recommendations.get("recommendations", []))
+        validation_results, pending, rule_stats = self._prevalidate(recs)
+        pending_recs = [recs[i] for i in pending]
+        if self.batched and len(pending_recs) > 1:
+            llm_results = await self.avalidate_recommendations_batch(pending_recs)
+        else:
+            llm_results = await self._avalidate_each(pending_recs)
+        for index, validation in zip(pending, llm_results):
+            validation_results[index] = validation
+        return self._summarize_validations(recommendations, recs, validation_results, rule_stats)
+    
+    async def _avalidate_each(self, recs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Validate recommendations one prompt each, concurrently, in order (see _validate_each)."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def validate(rec):
+            async with semaphore:
+                try:
+                    return await self.avalidate_recommendation(rec)
+                except Exception as e:
+                    return self._failed_validation(rec, e)
+        
+        return list(await asyncio.gather(*(validate(rec) for rec in recs)))
+    
+    def _summarize_validations(
+        self,
+        recommendations: Dict[str, Any],
+        recs: List[Dict[str, Any]],
+        validation_results: List[Dict[str, Any]],
+        rule_stats: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Merge validation results into the recommendations, with statistics and sorting.
+        
+        Args:
+            recommendations (Dict): The full recommendations object
+            recs (List[Dict]): The validated recommendations, in their original order
+            validation_results (List[Dict]): Validation result of each recommendation, same order
+            rule_stats (Dict, optional): Statistics of the rule-based pre-validation
+            
         Returns:
             Dict: Updated recommendations with validation results and modifications
         """
@@ -184,10 +636,7 @@ class RecommendationValidator:
         infeasible_count = 0
         
         # Process each recommendation
-        for rec in recommendations.get("recommendations", []):
-            # Validate the recommendation
-            validation_result = self.validate_recommendation(rec)
-            
+        for rec, validation_result in zip(recs, validation_results):
             # Use the modified recommendation if available
             modified_rec = validation_result.get("modified_recommendation", rec)
             
@@ -197,6 +646,8 @@ class RecommendationValidator:
                 "feasibility_score": validation_result.get("feasibility_score", 0),
                 "issues": validation_result.get("issues", [])
             }
+            if validation_result.get("validation_failed"):
+                modified_rec["validation"]["failed"] = True
             
             # Update statistics
             if validation_result.get("is_feasible", False):
@@ -221,6 +672,8 @@ class RecommendationValidator:
             "infeasible_count": infeasible_count,
             "average_feasibility_score": total_score / total_recommendations if total_recommendations > 0 else 0
         }
+        if rule_stats is not None:
+            validated_recommendations["validation_summary"]["rule_prevalidation"] = rule_stats
         
         # Sort recommendations by feasibility and priority
         validated_recommendations["recommendations"] = sorted(
@@ -244,34 +697,7 @@ class RecommendationValidator:
         Returns:
             Tuple[bool, List[str]]: (is_supported, alternative_suggestions)
         """
-        # Normalize component type
-        normalized_type = component_type.lower().strip()
-        
-        # Check if component is directly supported
-        for supported in SUPPORTED_COMPONENTS:
-            if normalized_type == supported.lower():
-                return True, []
-        
-        # Component not directly supported, find alternatives
-        alternatives = []
-        for supported in SUPPORTED_COMPONENTS:
-            if normalized_type in supported.lower() or supported.lower() in normalized_type:
-                alternatives.append(supported)
-        
-        # If no close matches, suggest common components
-        if not alternatives:
-            if "input" in normalized_type or "field" in normalized_type:
-                alternatives = ["TextField", "Dropdown", "Checkbox", "RadioButton"]
-            elif "button" in normalized_type:
-                alternatives = ["Button", "Toggle"]
-            elif "container" in normalized_type or "section" in normalized_type:
-                alternatives = ["Container", "Card", "Layout"]
-            elif "nav" in normalized_type or "menu" in normalized_type:
-                alternatives = ["Navigation", "Menu", "Tab", "BreadCrumb"]
-            else:
-                alternatives = ["Container", "Card", "Layout"]
-        
-        return False, alternatives[:3]  # Return top 3 alternatives
+        return check_component_support(component_type)
 
 # Test function
 if __name__ == "__main__":
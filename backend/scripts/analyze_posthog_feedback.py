@@ -46,8 +46,8 @@ def main():
     parser.add_argument(
         "--posthog-output",
         type=str,
-        default="data/posthog_data/processed/latest.json",
-        help="Chemin du fichier de sortie pour les données PostHog (par défaut: data/posthog_data/processed/latest.json)"
+        default="data/posthog_data/processed/latest.ndjson",
+        help="Chemin du fichier de sortie pour les données PostHog (par défaut: data/posthog_data/processed/latest.ndjson)"
     )
     
     parser.add_argument(
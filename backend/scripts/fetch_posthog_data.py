@@ -7,7 +7,6 @@ compatible avec notre analyseur et les sauvegarde dans un fichier JSON.
 
 import os
 import sys
-import json
 import logging
 import argparse
 from datetime import datetime, timedelta
@@ -19,6 +18,8 @@ root_dir = str(Path(__file__).parent.parent.parent)
 sys.path.append(root_dir)
 
 from backend.services.posthog_service import PostHogService
+from backend.services.event_dedup import EventDeduplicator
+from backend.utils.ndjson import load_records
 
 # Configure logging
 logging.basicConfig(
@@ -48,8 +49,8 @@ def main():
     parser.add_argument(
         "--output",
         type=str,
-        default="data/posthog_data/processed/latest.json",
-        help="Chemin du fichier de sortie (par défaut: data/posthog_data/processed/latest.json)"
+        default="data/posthog_data/processed/latest.ndjson",
+        help="Chemin du fichier de sortie, .ndjson/.jsonl ou .json, suffixe .gz pour compresser (par défaut: data/posthog_data/processed/latest.ndjson)"
     )
     
     parser.add_argument(
@@ -58,6 +59,18 @@ def main():
         help="Créer un lien symbolique vers latest.json (utilisé par l'analyseur)"
     )
     
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Ignorer les événements déjà ingérés lors des exécutions précédentes"
+    )
+    
+    parser.add_argument(
+        "--dedup-state",
+        type=str,
+        help="Fichier d'état du filtre de déduplication (par défaut: data/dedup/events.bloom)"
+    )
+    
     parser.add_argument(
         "--env-file",
         type=str,
@@ -97,12 +110,16 @@ def main():
     base_url = args.api_url or os.getenv("POSTHOG_API_URL", "https://app.posthog.com/api")
     posthog_service = PostHogService(api_key=api_key, project_id=project_id, base_url=base_url)
     
+    # Filtre de déduplication persisté entre les exécutions
+    deduplicator = EventDeduplicator(state_path=args.dedup_state) if args.dedup else None
+    
     # Récupérer et sauvegarder les événements
     output_file = posthog_service.fetch_and_save_feedback(
         event_name=args.event,
         start_date=start_date,
         end_date=end_date,
-        output_file=args.output
+        output_file=args.output,
+        deduplicator=deduplicator
     )
     
     if output_file == "No events retrieved":
@@ -137,9 +154,8 @@ def main():
     
     # Afficher un résumé des événements
     try:
-        with open(output_file, 'r', encoding='utf-8') as f:
-            events = json.load(f)
-            
+        events = load_records(output_file)
+        
         # Extraire les pages uniques
         pages = set()
         for event in events:
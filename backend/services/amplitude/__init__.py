@@ -4,14 +4,18 @@ Provides functions to fetch and process user feedback data from Amplitude.
 """
 
 from .client import AmplitudeClient
-from .data_processor import save_data_to_file, process_raw_file, prepare_for_vectorization
+from .data_processor import (
+    save_data_to_file, process_raw_file, ingest_raw_file, prepare_for_vectorization, iter_vectorization_batches
+)
 from .query_builder import build_query, build_export_query, build_event_payload
 
 __all__ = [
     'AmplitudeClient',
     'save_data_to_file',
     'process_raw_file',
+    'ingest_raw_file',
     'prepare_for_vectorization',
+    'iter_vectorization_batches',
     'build_query',
     'build_export_query',
     'build_event_payload'
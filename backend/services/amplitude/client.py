@@ -4,12 +4,13 @@ Handles authentication, requests and response parsing.
 """
 import os
 import base64
-import requests
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, Union, Tuple
 from dotenv import load_dotenv
 import logging
 
+from backend.utils.http_client import get_http_client, HTTPError, HTTPStatusError
+
 # Charger les variables d'environnement
 load_dotenv()
 
@@ -33,6 +34,10 @@ class AmplitudeClient:
         # URLs from environment or defaults
         self.export_url = os.getenv("EXPORT_URL", "https://amplitude.com/api/2/export")
         self.http_api_url = os.getenv("AMPLITUDE_URL", "https://api.amplitude.com/2/httpapi")
+        
+        # Les exports peuvent être volumineux: délai de lecture plus long que le défaut
+        self.export_timeout = (5, float(os.getenv("AMPLITUDE_EXPORT_TIMEOUT", "300")))
+        self.http = get_http_client()
     
     def get_data(self, start_date: Optional[datetime] = None, 
                   end_date: Optional[datetime] = None) -> bytes:
@@ -76,20 +81,20 @@ class AmplitudeClient:
         
         try:
             # Faire la requête
-            response = requests.get(url, headers=headers)
+            response = self.http.get(url, headers=headers, timeout=self.export_timeout)
             response.raise_for_status()
             return response.content
-        except requests.exceptions.HTTPError as e:
+        except HTTPStatusError as e:
             # Si nous obtenons une 404, essayons avec un format différent d'URL
             if e.response.status_code == 404:
                 # Essayez un format d'URL alternatif pour Amplitude EU
                 alt_url = f"https://analytics.eu.amplitude.com/api/2/events/export?start={start_str}&end={end_str}"
                 logger.info(f"Retrying with alternative URL: {alt_url}")
-                alt_response = requests.get(alt_url, headers=headers)
+                alt_response = self.http.get(alt_url, headers=headers, timeout=self.export_timeout)
                 alt_response.raise_for_status()
                 return alt_response.content
             raise Exception(f"Erreur lors de la récupération des données: {str(e)}")
-        except requests.exceptions.RequestException as e:
+        except HTTPError as e:
             raise Exception(f"Erreur lors de la récupération des données: {str(e)}")
     
     def send_event(self, events: Dict[str, Any]) -> Dict[str, Any]:
@@ -112,7 +117,7 @@ class AmplitudeClient:
         }
 
         # Envoi des événements
-        response = requests.post(
+        response = self.http.post(
             self.http_api_url,
             headers=headers,
             json=events
@@ -2,18 +2,30 @@
 Process and format data received from Amplitude.
 """
 import os
-import json
-import gzip
+import sys
+import hashlib
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Union, Optional
+from typing import Dict, List, Any, Union, Optional, Iterable, Iterator
 
 from langchain.schema import Document
 
+from ..event_dedup import EventDeduplicator
+from backend.utils.ndjson import load_records, write_records
+from backend.utils.bloom_filter import ScalableBloomFilter
+
 # Configuration du logging
 logger = logging.getLogger(__name__)
 
+# Taille des lots envoyés à l'API d'embeddings (valeur par défaut de OpenAIEmbeddings)
+EMBEDDING_BATCH_SIZE = 1000
+# Borne sur le texte cumulé d'un lot (~100k tokens) pour rester sous la limite par requête
+EMBEDDING_BATCH_MAX_CHARS = 400_000
+
+# Métadonnées très répétées d'un événement à l'autre
+INTERNED_METADATA_FIELDS = ("platform", "os_name", "device_family", "page")
+
 def ensure_directory_structure(app_id: str = "amplitude_data") -> Dict[str, Path]:
     """
     Crée la structure de répertoires nécessaire et retourne les chemins.
@@ -78,36 +90,27 @@ def save_data_to_file(data: bytes, filename: str, base_path: Optional[Path] = No
         logger.error(f"Erreur lors de la sauvegarde des données: {e}")
         raise
 
-def process_raw_file(file_path: Path) -> List[Dict[str, Any]]:
+def process_raw_file(file_path: Path, deduplicator: Optional[EventDeduplicator] = None) -> List[Dict[str, Any]]:
     """
     Process a raw Amplitude data file.
     
     Args:
         file_path: Path to the raw file
+        deduplicator: Optional filter dropping events already ingested. Its state
+                      is not persisted here: the caller saves it once the returned
+                      events are stored (see ingest_raw_file)
         
     Returns:
         List of processed events
     """
     try:
-        events = []
-        
-        # Vérifier si c'est un fichier gzip
-        if file_path.suffix == ".gz":
-            with gzip.open(file_path, 'rt', encoding='utf-8') as f:
-                for line in f:
-                    try:
-                        event = json.loads(line)
-                        events.append(event)
-                    except json.JSONDecodeError:
-                        logger.warning(f"Ligne ignorée: {line[:50]}...")
-        else:
-            # Fichier JSON normal
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if isinstance(data, list):
-                    events = data
-                else:
-                    events = [data]
+        # NDJSON (export Amplitude, fichiers convertis depuis PostHog) ou tableau JSON, gzip ou non
+        events = load_records(file_path)
+        
+        if deduplicator is not None:
+            total = len(events)
+            events = list(deduplicator.filter_events(events))
+            logger.info(f"Ignoré {total - len(events)} événements en double")
         
         logger.info(f"Traité {len(events)} événements depuis {file_path}")
         return events
@@ -116,51 +119,189 @@ def process_raw_file(file_path: Path) -> List[Dict[str, Any]]:
         logger.error(f"Erreur lors du traitement du fichier {file_path}: {e}")
         raise
 
-def prepare_for_vectorization(events: List[Dict[str, Any]]) -> List[Document]:
+def ingest_raw_file(file_path: Path, output_file: Union[str, Path],
+                    deduplicator: Optional[EventDeduplicator] = None) -> int:
     """
-    Convert Amplitude events to LangChain Documents for vectorization.
+    Process a raw Amplitude data file and write the new events.
+    
+    The dedup state is only persisted once the events are written, so a
+    failed write leaves them to be ingested again by the next run. When
+    every event was already ingested, an existing output file is left as is
+    rather than replaced by an empty one.
     
     Args:
-        events: List of Amplitude events
+        file_path: Path to the raw file
+        output_file: Processed events file (NDJSON, or JSON array for .json)
+        deduplicator: Optional filter dropping events already ingested
         
     Returns:
-        List of Document objects
+        Number of events written
+    """
+    events = process_raw_file(file_path, deduplicator)
+    if not events and Path(output_file).exists():
+        logger.info(f"Aucun nouvel événement: {output_file} conservé")
+        count = 0
+    else:
+        count = write_records(output_file, events)
+    if deduplicator is not None:
+        deduplicator.save()
+        logger.info(f"Deduplication: {deduplicator.stats}")
+    return count
+
+def _extract_feedback_text(event_properties: Dict[str, Any]) -> str:
+    """Return the feedback text of an event, trying the known property names."""
+    # Adapter cette partie selon la structure de vos événements Amplitude
+    return (
+        event_properties.get("feedback", "")
+        or event_properties.get("comment", "")
+        or event_properties.get("text", "")
+    )
+
+def _build_metadata(event: Dict[str, Any], event_properties: Dict[str, Any], compact: bool) -> Dict[str, Any]:
+    """
+    Build the Document metadata of an event.
+    
+    Args:
+        event: Amplitude event
+        event_properties: Properties of the event
+        compact: Intern repeated values and drop empty fields
+        
+    Returns:
+        Metadata dictionary
+    """
+    metadata = {
+        "event_id": event.get("event_id", ""),
+        "user_id": event.get("user_id", ""),
+        "device_id": event.get("device_id", ""),
+        "event_type": event.get("event_type", ""),
+        "time": event.get("time", ""),
+        "page": event_properties.get("page", "unknown"),
+        "platform": event.get("platform", ""),
+        "os_name": event.get("os_name", ""),
+        "device_family": event.get("device_family", "")
+    }
+    if not compact:
+        return metadata
+    
+    # Les valeurs répétées (plateforme, OS, page...) partagent une seule chaîne
+    for field in INTERNED_METADATA_FIELDS:
+        value = metadata[field]
+        if isinstance(value, str):
+            metadata[field] = sys.intern(value)
+    return {key: value for key, value in metadata.items() if value not in ("", None)}
+
+def text_fingerprint(text: str) -> str:
+    """Stable fingerprint of a text, used to track which texts are already embedded."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+class DocumentBatch(list):
+    """
+    Batch of Documents yielded by iter_vectorization_batches.
+    
+    Holds the fingerprints of its texts; call mark_embedded() once the batch
+    has been embedded so later runs skip these texts.
+    """
+    
+    def __init__(self, embedded: Optional[Any] = None):
+        super().__init__()
+        self.fingerprints: List[str] = []
+        self._embedded = embedded
+    
+    def mark_embedded(self) -> None:
+        """Record the texts of the batch as embedded."""
+        if self._embedded is not None:
+            for fingerprint in self.fingerprints:
+                self._embedded.add(fingerprint)
+
+def iter_vectorization_batches(
+    events: Iterable[Dict[str, Any]],
+    batch_size: int = EMBEDDING_BATCH_SIZE,
+    max_batch_chars: int = EMBEDDING_BATCH_MAX_CHARS,
+    embedded: Optional[Any] = None,
+    compact: bool = True,
+    stats: Optional[Dict[str, int]] = None
+) -> Iterator[DocumentBatch]:
+    """
+    Stream Amplitude events as batches of LangChain Documents sized for the embedding API.
+    
+    Events are consumed lazily, so arbitrarily large exports can be vectorized
+    without materializing every Document in memory. With ``embedded``, a text
+    is emitted once per run: identical texts of other events are counted and
+    skipped.
+    
+    Args:
+        events: Amplitude events (any iterable, e.g. a file reader)
+        batch_size: Maximum number of documents per batch
+        max_batch_chars: Maximum total text length per batch
+        embedded: Fingerprints of texts already embedded (set, Bloom filter...).
+                  Matching texts are skipped; the texts of a batch are only added
+                  to it when the caller calls batch.mark_embedded() after a
+                  successful embedding call, so a failed batch is retried next run.
+        compact: Intern repeated metadata values and drop empty fields
+        stats: Optional dict receiving the emitted, already_embedded and duplicates counts
+        
+    Returns:
+        Iterator over batches (lists) of Document objects
     """
-    documents = []
+    counts = stats if stats is not None else {}
+    counts.update(emitted=0, already_embedded=0, duplicates=0)
+    # Textes déjà émis pendant cette exécution (mémoire bornée)
+    emitted_texts = ScalableBloomFilter(initial_capacity=10_000, error_rate=1e-4)
+    batch = DocumentBatch(embedded)
+    batch_chars = 0
     
     for event in events:
-        # Extract relevant text and metadata from the event
-        # Adapter cette partie selon la structure de vos événements Amplitude
         event_properties = event.get("event_properties", {})
-        text = event_properties.get("feedback", "")
-        
-        # Si pas de feedback, essayer d'autres champs possibles
-        if not text:
-            text = event_properties.get("comment", "")
-        if not text:
-            text = event_properties.get("text", "")
+        text = _extract_feedback_text(event_properties)
         if not text:
             continue  # Ignorer les événements sans texte
-            
-        metadata = {
-            "event_id": event.get("event_id", ""),
-            "user_id": event.get("user_id", ""),
-            "device_id": event.get("device_id", ""),
-            "event_type": event.get("event_type", ""),
-            "time": event.get("time", ""),
-            "page": event_properties.get("page", "unknown"),
-            "platform": event.get("platform", ""),
-            "os_name": event.get("os_name", ""),
-            "device_family": event.get("device_family", "")
-        }
-        
-        # Create a Document object
-        document = Document(
+        
+        fingerprint = text_fingerprint(text)
+        if embedded is not None:
+            if fingerprint in embedded:
+                counts["already_embedded"] += 1
+                continue
+            if not emitted_texts.add(fingerprint):
+                counts["duplicates"] += 1
+                continue
+        
+        if batch and (len(batch) >= batch_size or batch_chars + len(text) > max_batch_chars):
+            counts["emitted"] += len(batch)
+            yield batch
+            batch, batch_chars = DocumentBatch(embedded), 0
+        
+        batch.append(Document(
             page_content=text,
-            metadata=metadata
-        )
+            metadata=_build_metadata(event, event_properties, compact)
+        ))
+        batch.fingerprints.append(fingerprint)
+        batch_chars += len(text)
+    
+    if batch:
+        counts["emitted"] += len(batch)
+        yield batch
+    
+    logger.info(
+        f"Émis {counts['emitted']} documents pour la vectorisation "
+        f"({counts['already_embedded']} textes déjà vectorisés, "
+        f"{counts['duplicates']} textes identiques à un document émis ignorés)"
+    )
+
+def prepare_for_vectorization(events: List[Dict[str, Any]]) -> List[Document]:
+    """
+    Convert Amplitude events to LangChain Documents for vectorization.
+    
+    Args:
+        events: List of Amplitude events
         
-        documents.append(document)
+    Returns:
+        List of Document objects
+    """
+    documents = [
+        document
+        for batch in iter_vectorization_batches(events, compact=False)
+        for document in batch
+    ]
     
     logger.info(f"Créé {len(documents)} documents pour la vectorisation")
     return documents
@@ -0,0 +1,29 @@
+"""
+User behavior analytics service.
+Provides single-pass aggregations of session recordings (rage clicks,
+navigation loops, scroll depth, dwell time, click heatmaps, navigation
+paths and funnels) sized by their resolution rather than by raw event counts.
+"""
+
+from .heatmap import ClickHeatmap, iter_session_clicks
+from .paths import NavigationTrie, session_page_sequence
+from .columnar import EventBatch, parse_event_time
+from .engine import SessionBehaviorEngine, BehaviorReport, analyze_sessions
+from .parallel import analyze_sessions_parallel
+from .rollups import BehaviorRollupStore, session_day, covered_days
+
+__all__ = [
+    'ClickHeatmap',
+    'iter_session_clicks',
+    'NavigationTrie',
+    'session_page_sequence',
+    'EventBatch',
+    'parse_event_time',
+    'SessionBehaviorEngine',
+    'BehaviorReport',
+    'analyze_sessions',
+    'analyze_sessions_parallel',
+    'BehaviorRollupStore',
+    'session_day',
+    'covered_days'
+]
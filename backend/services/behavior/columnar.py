@@ -0,0 +1,308 @@
+"""
+Columnar representation of session events.
+An EventBatch holds the events of many sessions as typed NumPy arrays
+(timestamp, event type code, interned element and page ids, click position,
+scroll) instead of nested dicts, which cuts memory and lets the behavior
+engines read plain values rather than dict lookups. Converters build batches
+from PostHog session recordings and Amplitude event exports.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from .paths import _event_page
+
+# Codes des types d'événements
+EVENT_OTHER = 0
+EVENT_PAGEVIEW = 1
+EVENT_CLICK = 2
+EVENT_SCROLL = 3
+
+POSTHOG_EVENT_TYPES = {"$pageview": EVENT_PAGEVIEW, "$click": EVENT_CLICK, "$scroll": EVENT_SCROLL}
+
+AMPLITUDE_EVENT_TYPES = {
+    "[Amplitude] Page Viewed": EVENT_PAGEVIEW,
+    "Page Viewed": EVENT_PAGEVIEW,
+    "page_view": EVENT_PAGEVIEW,
+    "[Amplitude] Element Clicked": EVENT_CLICK,
+    "Element Clicked": EVENT_CLICK,
+    "click": EVENT_CLICK,
+    "scroll": EVENT_SCROLL,
+    **POSTHOG_EVENT_TYPES,
+}
+
+# (type, horodatage, élément, page, x, y, profondeur de scroll, delta de scroll)
+EventRow = Tuple[int, Optional[float], Optional[str], Optional[str],
+                 Optional[float], Optional[float], Optional[float], Optional[float]]
+
+
+def parse_event_time(value: Any) -> Optional[float]:
+    """
+    Convert an event timestamp (ISO 8601, seconds or milliseconds) to epoch seconds.
+
+    Returns:
+        Seconds since the epoch, or None if the timestamp is missing or invalid
+    """
+    if isinstance(value, str):
+        if not value:
+            return None
+        if value[-1] == "Z":
+            value = value[:-1] + "+00:00"
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value / 1000 if value > 1e11 else float(value)
+    return None
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return None
+
+
+def _scroll_fields(props: Dict[str, Any]) -> Tuple[Optional[float], Optional[float]]:
+    depth = _number(props.get("$scroll_depth", props.get("scroll_depth")))
+    if depth is not None:
+        return depth, None
+    return None, _number(props.get("scrollY"))
+
+
+def event_fields(event: Dict[str, Any]) -> EventRow:
+    """
+    Values of a PostHog event read by the behavior engines.
+
+    Args:
+        event: Event of a session recording
+
+    Returns:
+        (type code, epoch seconds, element, page, x, y, scroll depth, scroll delta)
+    """
+    code = POSTHOG_EVENT_TYPES.get(event.get("type"), EVENT_OTHER)
+    timestamp = parse_event_time(event.get("timestamp"))
+    props = event.get("properties")
+    if not isinstance(props, dict):
+        props = {}
+
+    if code == EVENT_CLICK:
+        x, y = _number(props.get("positionX")), _number(props.get("positionY"))
+        if x is None or y is None:
+            x = y = None
+        return code, timestamp, props.get("element"), None, x, y, None, None
+    if code == EVENT_PAGEVIEW:
+        return code, timestamp, None, _event_page(props), None, None, None, None
+    if code == EVENT_SCROLL:
+        depth, delta = _scroll_fields(props)
+        return code, timestamp, None, None, None, None, depth, delta
+    return code, timestamp, None, None, None, None, None, None
+
+
+def _amplitude_time(event: Dict[str, Any]) -> Optional[float]:
+    if event.get("time") is not None:
+        return parse_event_time(event["time"])
+    value = event.get("event_time") or event.get("client_event_time")
+    if isinstance(value, str) and value and not any(sign in value[19:] for sign in "+-Z"):
+        # Les exports Amplitude sont en UTC, sans fuseau explicite
+        value += "+00:00"
+    return parse_event_time(value)
+
+
+def _amplitude_page(props: Dict[str, Any]) -> Optional[str]:
+    page = (props.get("[Amplitude] Page Path") or props.get("page_path")
+            or props.get("page") or _event_page(props))
+    if isinstance(page, str) and "://" in page:
+        page = urlsplit(page).path or "/"
+    return page
+
+
+def amplitude_event_fields(event: Dict[str, Any]) -> EventRow:
+    """
+    Values of an Amplitude event, in the same layout as event_fields.
+    """
+    code = AMPLITUDE_EVENT_TYPES.get(event.get("event_type"), EVENT_OTHER)
+    timestamp = _amplitude_time(event)
+    props = event.get("event_properties")
+    if not isinstance(props, dict):
+        props = {}
+
+    if code == EVENT_CLICK:
+        element = (props.get("[Amplitude] Element Selector") or props.get("element")
+                   or props.get("[Amplitude] Element Text"))
+        x = _number(props.get("positionX", props.get("x")))
+        y = _number(props.get("positionY", props.get("y")))
+        if x is None or y is None:
+            x = y = None
+        return code, timestamp, element, None, x, y, None, None
+    if code == EVENT_PAGEVIEW:
+        return code, timestamp, None, _amplitude_page(props), None, None, None, None
+    if code == EVENT_SCROLL:
+        depth, delta = _scroll_fields(props)
+        return code, timestamp, None, None, None, None, depth, delta
+    return code, timestamp, None, None, None, None, None, None
+
+
+class EventBatch:
+    """
+    Events of a set of sessions, stored column by column.
+
+    The events of session i are at positions offsets[i]:offsets[i + 1].
+    Element and page names are interned: the arrays hold their index in
+    ``elements`` and ``pages`` (-1 when absent). Missing timestamps,
+    positions and scroll values are NaN.
+    """
+
+    def __init__(self):
+        self.session_ids: List[Optional[str]] = []
+        self.elements: List[str] = []
+        self.pages: List[str] = []
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.timestamp = np.empty(0, dtype=np.float64)
+        self.type = np.empty(0, dtype=np.int8)
+        self.element = np.empty(0, dtype=np.int32)
+        self.page = np.empty(0, dtype=np.int32)
+        self.x = np.empty(0, dtype=np.float32)
+        self.y = np.empty(0, dtype=np.float32)
+        self.scroll_depth = np.empty(0, dtype=np.float32)
+        self.scroll_delta = np.empty(0, dtype=np.float32)
+
+    @classmethod
+    def from_rows(cls, sessions: Iterable[Tuple[Optional[str], Iterable[EventRow]]]) -> "EventBatch":
+        """
+        Build a batch from event rows grouped by session.
+
+        Args:
+            sessions: (session id, rows) pairs, rows as returned by event_fields
+
+        Returns:
+            Batch of every event
+        """
+        batch = cls()
+        element_ids: Dict[str, int] = {}
+        page_ids: Dict[str, int] = {}
+        offsets = [0]
+        columns: List[List[Any]] = [[] for _ in range(8)]
+        nan = float("nan")
+
+        for session_id, rows in sessions:
+            batch.session_ids.append(session_id)
+            for code, timestamp, element, page, x, y, depth, delta in rows:
+                columns[0].append(nan if timestamp is None else timestamp)
+                columns[1].append(code)
+                if element is None:
+                    columns[2].append(-1)
+                else:
+                    element_id = element_ids.get(element)
+                    if element_id is None:
+                        element_id = element_ids[element] = len(batch.elements)
+                        batch.elements.append(element)
+                    columns[2].append(element_id)
+                if page is None:
+                    columns[3].append(-1)
+                else:
+                    page_id = page_ids.get(page)
+                    if page_id is None:
+                        page_id = page_ids[page] = len(batch.pages)
+                        batch.pages.append(page)
+                    columns[3].append(page_id)
+                columns[4].append(nan if x is None else x)
+                columns[5].append(nan if y is None else y)
+                columns[6].append(nan if depth is None else depth)
+                columns[7].append(nan if delta is None else delta)
+            offsets.append(len(columns[1]))
+
+        batch.offsets = np.asarray(offsets, dtype=np.int64)
+        batch.timestamp = np.asarray(columns[0], dtype=np.float64)
+        batch.type = np.asarray(columns[1], dtype=np.int8)
+        batch.element = np.asarray(columns[2], dtype=np.int32)
+        batch.page = np.asarray(columns[3], dtype=np.int32)
+        batch.x = np.asarray(columns[4], dtype=np.float32)
+        batch.y = np.asarray(columns[5], dtype=np.float32)
+        batch.scroll_depth = np.asarray(columns[6], dtype=np.float32)
+        batch.scroll_delta = np.asarray(columns[7], dtype=np.float32)
+        return batch
+
+    @classmethod
+    def from_sessions(cls, sessions: Iterable[Dict[str, Any]]) -> "EventBatch":
+        """
+        Build a batch from PostHog session recordings.
+
+        Args:
+            sessions: Session recordings with their events (consumed lazily)
+
+        Returns:
+            Batch of every event
+        """
+        return cls.from_rows(
+            (session.get("id") or session.get("session_id"), map(event_fields, session.get("events", [])))
+            for session in sessions
+        )
+
+    @classmethod
+    def from_amplitude_events(cls, events: Iterable[Dict[str, Any]]) -> "EventBatch":
+        """
+        Build a batch from Amplitude export events.
+
+        Events are grouped by session_id (by user or device when Amplitude
+        reports no session) and ordered by time within each session.
+
+        Args:
+            events: Amplitude events
+
+        Returns:
+            Batch with one session per Amplitude session
+        """
+        sessions: Dict[str, List[EventRow]] = {}
+        for event in events:
+            session_id = event.get("session_id")
+            if session_id in (None, -1):
+                session_id = f"user:{event.get('user_id') or event.get('device_id')}"
+            sessions.setdefault(str(session_id), []).append(amplitude_event_fields(event))
+        for rows in sessions.values():
+            # Tri stable: les événements sans horodatage restent à leur place relative
+            rows.sort(key=lambda row: float("-inf") if row[1] is None else row[1])
+        return cls.from_rows(sessions.items())
+
+    def __len__(self) -> int:
+        return int(self.type.size)
+
+    @property
+    def session_count(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the event arrays."""
+        return int(sum(array.nbytes for array in (
+            self.offsets, self.timestamp, self.type, self.element, self.page,
+            self.x, self.y, self.scroll_depth, self.scroll_delta
+        )))
+
+    def positioned_clicks(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Clicks on an element with a position.
+
+        Returns:
+            x, y and element id arrays
+        """
+        mask = (self.type == EVENT_CLICK) & (self.element >= 0) & ~np.isnan(self.x) & ~np.isnan(self.y)
+        return self.x[mask], self.y[mask], self.element[mask]
+
+    def last_timestamps(self) -> np.ndarray:
+        """
+        Timestamp of the last timed event of each session (NaN if none).
+        """
+        timed = np.flatnonzero(~np.isnan(self.timestamp))
+        # Dernier événement horodaté avant la fin de chaque session
+        last = np.searchsorted(timed, self.offsets[1:]) - 1
+        result = np.full(self.session_count, np.nan)
+        if timed.size:
+            found = last >= 0
+            candidates = timed[np.maximum(last, 0)]
+            found &= candidates >= self.offsets[:-1]
+            result[found] = self.timestamp[candidates[found]]
+        return result
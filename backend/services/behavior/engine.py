@@ -0,0 +1,392 @@
+"""
+Single-pass behavior engine over session event streams.
+Each event of each session is visited once to compute rage clicks, navigation
+loops, scroll depth, dwell time per page, confusion areas, the click heatmap
+and the navigation path trie together. Sessions can come from any iterable,
+including generators yielding them lazily from an analytics provider, or
+from a columnar EventBatch.
+"""
+
+from bisect import bisect_right
+from collections import deque, Counter
+from typing import Dict, List, Any, Optional, Iterable, Tuple, Union
+
+import numpy as np
+
+from .heatmap import ClickHeatmap, DEFAULT_VIEWPORT, DEFAULT_BINS
+from .paths import NavigationTrie, DEFAULT_MAX_DEPTH
+from .columnar import (
+    EventBatch, EventRow, event_fields,
+    EVENT_CLICK, EVENT_PAGEVIEW, EVENT_SCROLL
+)
+
+# Clics répétés sur un même élément au-delà desquels une zone est jugée confuse
+REPEATED_CLICK_THRESHOLD = 3
+# Score d'une boucle de navigation (A -> B -> A), sur 10
+NAVIGATION_LOOP_SCORE = 8
+
+# Bornes (ms) des tranches de l'histogramme des temps passés: 5s, 15s, 30s, 1min, 2min, 5min, 10min
+DWELL_BUCKETS_MS = (5_000, 15_000, 30_000, 60_000, 120_000, 300_000, 600_000)
+
+# Taille des lots de clics transmis à la heatmap
+_HEATMAP_FLUSH_SIZE = 10_000
+
+
+class BehaviorReport:
+    """
+    Aggregated behavior metrics of a set of sessions.
+
+    Every aggregate is a sum or a count, so reports computed on separate
+    batches of sessions merge exactly (see merge).
+    """
+
+    def __init__(
+        self,
+        viewport: Tuple[int, int] = DEFAULT_VIEWPORT,
+        bins: Tuple[int, int] = DEFAULT_BINS,
+        max_path_depth: int = DEFAULT_MAX_DEPTH
+    ):
+        self.sessions = 0
+        self.events = 0
+        self.heatmap = ClickHeatmap(viewport, bins)
+        self.paths = NavigationTrie(max_path_depth)
+        # élément -> [rafales de rage clicks, sessions concernées]
+        self.rage_clicks: Dict[str, List[int]] = {}
+        # page -> [boucles A -> B -> A, sessions concernées]
+        self.navigation_loops: Dict[str, List[int]] = {}
+        # page -> [somme des profondeurs de scroll max (px), visites]
+        self.scroll_depth: Dict[str, List[int]] = {}
+        # page -> [temps passé total (ms), visites mesurées]
+        # Valeurs entières: les sommes ne dépendent pas de l'ordre de fusion
+        self.dwell_time: Dict[str, List[int]] = {}
+        # page -> visites par tranche de DWELL_BUCKETS_MS (dernière tranche: au-delà)
+        self.dwell_histogram: Dict[str, List[int]] = {}
+        # zone -> [somme des scores en tiers, entrées, type de la première entrée]
+        # Les scores sont gardés en tiers entiers pour que les fusions soient exactes
+        self.confusion: Dict[str, List[Any]] = {}
+
+    def merge(self, other: "BehaviorReport") -> "BehaviorReport":
+        """
+        Add the metrics of another report, in place.
+
+        Returns:
+            self
+        """
+        self.sessions += other.sessions
+        self.events += other.events
+        self.heatmap.merge(other.heatmap)
+        self.paths.merge(other.paths)
+        for mine, theirs in ((self.rage_clicks, other.rage_clicks),
+                             (self.navigation_loops, other.navigation_loops),
+                             (self.scroll_depth, other.scroll_depth),
+                             (self.dwell_time, other.dwell_time),
+                             (self.dwell_histogram, other.dwell_histogram)):
+            for key, values in theirs.items():
+                current = mine.setdefault(key, [0] * len(values))
+                for i, value in enumerate(values):
+                    current[i] += value
+        for area, (thirds, entries, area_type) in other.confusion.items():
+            current = self.confusion.setdefault(area, [0, 0, area_type])
+            current[0] += thirds
+            current[1] += entries
+        return self
+
+    def confusion_areas(self) -> List[Dict[str, Any]]:
+        """
+        Confusion areas with their average score, highest first.
+
+        Returns:
+            Same structure as PostHogClient.identify_confusion_areas
+        """
+        result = [
+            {
+                "area": area,
+                "score": thirds / entries / 3,
+                "type": area_type if entries == 1 else "multiple"
+            }
+            for area, (thirds, entries, area_type) in self.confusion.items()
+        ]
+        result.sort(key=lambda x: x["score"], reverse=True)
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSON-serializable summary of the report.
+        """
+        def ranked(items, key):
+            return sorted(items, key=lambda item: item[key], reverse=True)
+
+        return {
+            "sessions": self.sessions,
+            "events": self.events,
+            "rage_clicks": ranked([
+                {"element": element, "bursts": bursts, "sessions": sessions}
+                for element, (bursts, sessions) in self.rage_clicks.items()
+            ], "bursts"),
+            "navigation_loops": ranked([
+                {"page": page, "loops": loops, "sessions": sessions}
+                for page, (loops, sessions) in self.navigation_loops.items()
+            ], "loops"),
+            "scroll_depth": {
+                page: {"average_max_px": total / visits, "visits": visits}
+                for page, (total, visits) in self.scroll_depth.items() if visits
+            },
+            "dwell_time": {
+                page: {
+                    "average_seconds": total / visits / 1000,
+                    "total_seconds": total / 1000,
+                    "visits": visits,
+                    "histogram": self.dwell_histogram.get(page, []),
+                }
+                for page, (total, visits) in self.dwell_time.items() if visits
+            },
+            "confusion_areas": self.confusion_areas(),
+            "heatmap": self.heatmap.to_dict(),
+            "paths": self.paths.to_dict(),
+        }
+
+
+def _optional(values: List[float]) -> List[Optional[float]]:
+    # NaN (valeur absente des colonnes) -> None, comme event_fields
+    return [None if value != value else value for value in values]
+
+
+class SessionBehaviorEngine:
+    """
+    Streaming computation of behavior metrics, one pass over each session's events.
+    """
+
+    def __init__(
+        self,
+        rage_click_count: int = 3,
+        rage_click_window: float = 1.0,
+        viewport: Tuple[int, int] = DEFAULT_VIEWPORT,
+        bins: Tuple[int, int] = DEFAULT_BINS,
+        max_path_depth: int = DEFAULT_MAX_DEPTH
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            rage_click_count: Number of clicks on one element making a rage click
+            rage_click_window: Window in seconds in which those clicks must happen
+            viewport: Viewport covered by the click heatmap
+            bins: Columns and rows of the click heatmap
+            max_path_depth: Pages kept from the start of each session in the path trie
+        """
+        self.rage_click_count = rage_click_count
+        self.rage_click_window = rage_click_window
+        self.report = BehaviorReport(viewport, bins, max_path_depth)
+        self._xs: List[float] = []
+        self._ys: List[float] = []
+        self._elements: List[str] = []
+
+    def consume(self, sessions: Iterable[Dict[str, Any]]) -> BehaviorReport:
+        """
+        Process sessions as they are yielded.
+
+        Args:
+            sessions: Session recordings (list or lazy iterator)
+
+        Returns:
+            Report covering every session consumed so far
+        """
+        for session in sessions:
+            self.consume_session(session)
+        self._flush_clicks()
+        return self.report
+
+    def consume_batch(self, batch: EventBatch) -> BehaviorReport:
+        """
+        Process the sessions of a columnar event batch.
+
+        The heatmap is filled from the batch arrays in one vectorized step.
+
+        Returns:
+            Report covering every session consumed so far
+        """
+        self.report.heatmap.add_batch(batch)
+
+        # Seuls les événements utiles à l'analyse séquentielle sont parcourus:
+        # clics sur un élément, pages vues et défilements
+        types = batch.type
+        relevant = np.flatnonzero(
+            ((types == EVENT_CLICK) & (batch.element >= 0))
+            | ((types == EVENT_PAGEVIEW) & (batch.page >= 0))
+            | ((types == EVENT_SCROLL) & ~(np.isnan(batch.scroll_depth) & np.isnan(batch.scroll_delta)))
+        )
+        bounds = np.searchsorted(relevant, batch.offsets).tolist()
+        end_times = _optional(batch.last_timestamps().tolist())
+
+        elements, pages = batch.elements, batch.pages
+        event_types = types[relevant].tolist()
+        timestamps = _optional(batch.timestamp[relevant].tolist())
+        element_names = [elements[i] if i >= 0 else None for i in batch.element[relevant].tolist()]
+        page_names = [pages[i] if i >= 0 else None for i in batch.page[relevant].tolist()]
+        depths = _optional(batch.scroll_depth[relevant].tolist())
+        deltas = _optional(batch.scroll_delta[relevant].tolist())
+        no_position = [None] * relevant.size
+
+        for i in range(batch.session_count):
+            start, end = bounds[i], bounds[i + 1]
+            rows = zip(
+                event_types[start:end], timestamps[start:end], element_names[start:end],
+                page_names[start:end], no_position[start:end], no_position[start:end],
+                depths[start:end], deltas[start:end]
+            )
+            self._consume_rows(rows, collect_clicks=False, end_time=end_times[i])
+        # Les autres événements ne sont que comptés
+        self.report.events += len(batch) - int(relevant.size)
+        return self.report
+
+    def consume_session(self, session: Dict[str, Any]) -> None:
+        """
+        Process the events of one session in a single pass.
+        """
+        self._consume_rows(map(event_fields, session.get("events", [])), collect_clicks=True)
+
+    def _consume_rows(self, rows: Iterable[EventRow], collect_clicks: bool,
+                      end_time: Optional[float] = None) -> None:
+        """
+        Process the events of one session, given as event_fields rows.
+
+        Args:
+            rows: Events of the session, in order
+            collect_clicks: Buffer positioned clicks for the heatmap
+            end_time: Time of the last event of the session, when rows only
+                hold the events the analysis needs
+        """
+        report = self.report
+        report.sessions += 1
+
+        click_counts: Dict[str, int] = {}
+        recent_clicks: Dict[str, deque] = {}
+        rage_bursts: Counter = Counter()
+        loops: List[str] = []
+        pages: List[str] = []
+        previous_pages: deque = deque(maxlen=2)
+
+        current_page = None
+        page_entered_at = None
+        page_scroll = 0.0
+        page_max_scroll = 0.0
+        last_time = None
+
+        for event_type, timestamp, element, page, x, y, depth, delta in rows:
+            report.events += 1
+            if timestamp is not None:
+                last_time = timestamp
+
+            if event_type == EVENT_CLICK:
+                if element is None:
+                    continue
+                click_counts[element] = click_counts.get(element, 0) + 1
+
+                if collect_clicks and x is not None:
+                    self._xs.append(x)
+                    self._ys.append(y)
+                    self._elements.append(element)
+                    if len(self._xs) >= _HEATMAP_FLUSH_SIZE:
+                        self._flush_clicks()
+
+                if timestamp is not None:
+                    window = recent_clicks.setdefault(element, deque())
+                    window.append(timestamp)
+                    while timestamp - window[0] > self.rage_click_window:
+                        window.popleft()
+                    if len(window) >= self.rage_click_count:
+                        rage_bursts[element] += 1
+                        # Une rafale n'est comptée qu'une fois
+                        window.clear()
+
+            elif event_type == EVENT_PAGEVIEW:
+                if page is None:
+                    continue
+
+                # Boucle de navigation: A -> B -> A
+                if len(previous_pages) == 2 and previous_pages[0] == page and previous_pages[1] != page:
+                    loops.append(page)
+                previous_pages.append(page)
+                if not pages or pages[-1] != page:
+                    pages.append(page)
+
+                self._close_page(current_page, page_entered_at, timestamp, page_max_scroll)
+                current_page, page_entered_at = page, timestamp
+                page_scroll = page_max_scroll = 0.0
+
+            elif event_type == EVENT_SCROLL:
+                if depth is not None:
+                    page_max_scroll = max(page_max_scroll, depth)
+                elif delta is not None:
+                    page_scroll = max(0.0, page_scroll + delta)
+                    page_max_scroll = max(page_max_scroll, page_scroll)
+
+        if end_time is not None:
+            last_time = end_time
+        self._close_page(current_page, page_entered_at, last_time, page_max_scroll)
+        self._record_session(click_counts, rage_bursts, loops)
+        report.paths.add_path(pages)
+
+    def _close_page(self, page: Optional[str], entered_at: Optional[float],
+                    left_at: Optional[float], max_scroll: float) -> None:
+        """Record the dwell time and scroll depth of a finished page visit."""
+        if page is None:
+            return
+        scroll = self.report.scroll_depth.setdefault(page, [0, 0])
+        scroll[0] += int(round(max_scroll))
+        scroll[1] += 1
+        if entered_at is not None and left_at is not None and left_at >= entered_at:
+            duration = int(round((left_at - entered_at) * 1000))
+            dwell = self.report.dwell_time.setdefault(page, [0, 0])
+            dwell[0] += duration
+            dwell[1] += 1
+            histogram = self.report.dwell_histogram.setdefault(page, [0] * (len(DWELL_BUCKETS_MS) + 1))
+            histogram[bisect_right(DWELL_BUCKETS_MS, duration)] += 1
+
+    def _record_session(self, click_counts: Dict[str, int], rage_bursts: Counter, loops: List[str]) -> None:
+        report = self.report
+
+        for element, bursts in rage_bursts.items():
+            stats = report.rage_clicks.setdefault(element, [0, 0])
+            stats[0] += bursts
+            stats[1] += 1
+
+        for page, loop_count in Counter(loops).items():
+            stats = report.navigation_loops.setdefault(page, [0, 0])
+            stats[0] += loop_count
+            stats[1] += 1
+
+        # Zones de confusion, dans l'ordre de l'analyse historique:
+        # clics répétés de la session, puis boucles de navigation
+        for element, count in click_counts.items():
+            if count >= REPEATED_CLICK_THRESHOLD:
+                self._add_confusion(element, min(count, 30), "repeated_clicks")
+        for page in loops:
+            self._add_confusion(page, NAVIGATION_LOOP_SCORE * 3, "navigation_loop")
+
+    def _add_confusion(self, area: str, thirds: int, area_type: str) -> None:
+        entry = self.report.confusion.setdefault(area, [0, 0, area_type])
+        entry[0] += thirds
+        entry[1] += 1
+
+    def _flush_clicks(self) -> None:
+        if self._xs:
+            self.report.heatmap.add_clicks(self._xs, self._ys, self._elements)
+            self._xs, self._ys, self._elements = [], [], []
+
+
+def analyze_sessions(sessions: Union[Iterable[Dict[str, Any]], EventBatch], **options) -> BehaviorReport:
+    """
+    Compute every behavior metric of a set of sessions in one pass.
+
+    Args:
+        sessions: Session recordings (list or lazy iterator) or an EventBatch
+        **options: SessionBehaviorEngine options
+
+    Returns:
+        Behavior report
+    """
+    engine = SessionBehaviorEngine(**options)
+    if isinstance(sessions, EventBatch):
+        return engine.consume_batch(sessions)
+    return engine.consume(sessions)
@@ -0,0 +1,219 @@
+"""
+Binned click heatmaps.
+Clicks are counted in a fixed grid over the viewport with NumPy, so the
+memory used by a heatmap depends on its resolution, not on the number of
+clicks. Heatmaps with the same grid merge by array addition, across
+sessions, days or workers.
+"""
+
+from collections import Counter
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+import numpy as np
+
+# Grille par défaut: cellules de 40px sur une fenêtre 1920x1080 (48x27 cellules, ~5 Ko)
+DEFAULT_VIEWPORT = (1920, 1080)
+DEFAULT_BINS = (48, 27)
+
+
+def iter_session_clicks(sessions: Iterable[Dict[str, Any]]) -> Iterable[Tuple[str, float, float]]:
+    """
+    Yield (element, x, y) for every positioned click of the sessions.
+
+    Args:
+        sessions: Session recordings with their events
+
+    Returns:
+        Iterator over clicks
+    """
+    for session in sessions:
+        for event in session.get("events", []):
+            if event.get("type") == "$click" and "properties" in event:
+                props = event["properties"]
+                if "element" in props and "positionX" in props and "positionY" in props:
+                    yield props["element"], props["positionX"], props["positionY"]
+
+
+class ClickHeatmap:
+    """
+    Click counts binned over a viewport grid, with per-element totals.
+    """
+
+    def __init__(self, viewport: Tuple[int, int] = DEFAULT_VIEWPORT, bins: Tuple[int, int] = DEFAULT_BINS):
+        """
+        Initialize an empty heatmap.
+
+        Args:
+            viewport: Width and height in pixels covered by the grid; clicks
+                outside are counted in the nearest edge cell
+            bins: Number of columns and rows of the grid
+        """
+        self.viewport = (int(viewport[0]), int(viewport[1]))
+        self.bins = (int(bins[0]), int(bins[1]))
+        if min(self.viewport) <= 0 or min(self.bins) <= 0:
+            raise ValueError("viewport and bins must be positive")
+
+        # Lignes = y, colonnes = x
+        self.counts = np.zeros((self.bins[1], self.bins[0]), dtype=np.uint32)
+        self.element_counts: Counter = Counter()
+
+    @classmethod
+    def from_sessions(cls, sessions: Iterable[Dict[str, Any]], **grid) -> "ClickHeatmap":
+        """
+        Build the heatmap of a set of sessions.
+
+        Args:
+            sessions: Session recordings
+            **grid: viewport and bins (see __init__)
+
+        Returns:
+            Heatmap of every positioned click
+        """
+        heatmap = cls(**grid)
+        heatmap.add_sessions(sessions)
+        return heatmap
+
+    def add_sessions(self, sessions: Iterable[Dict[str, Any]]) -> int:
+        """
+        Count the clicks of session recordings.
+
+        Returns:
+            Number of clicks added
+        """
+        elements, xs, ys = [], [], []
+        for element, x, y in iter_session_clicks(sessions):
+            elements.append(element)
+            xs.append(x)
+            ys.append(y)
+        return self.add_clicks(xs, ys, elements)
+
+    def add_clicks(self, xs, ys, elements: Optional[Iterable[str]] = None) -> int:
+        """
+        Count clicks given as coordinate arrays.
+
+        Args:
+            xs: Horizontal positions in pixels
+            ys: Vertical positions in pixels
+            elements: Clicked element of each click (optional)
+
+        Returns:
+            Number of clicks added
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        if xs.shape != ys.shape:
+            raise ValueError("xs and ys must have the same length")
+        if elements is not None:
+            self.element_counts.update(elements)
+        if xs.size == 0:
+            return 0
+
+        columns, rows = self.bins
+        ix = np.clip((xs * (columns / self.viewport[0])).astype(np.int64), 0, columns - 1)
+        iy = np.clip((ys * (rows / self.viewport[1])).astype(np.int64), 0, rows - 1)
+        self.counts += np.bincount(iy * columns + ix, minlength=columns * rows).reshape(rows, columns).astype(np.uint32)
+        return int(xs.size)
+
+    def add_batch(self, batch) -> int:
+        """
+        Count the positioned clicks of a columnar EventBatch.
+
+        Returns:
+            Number of clicks added
+        """
+        xs, ys, element_ids = batch.positioned_clicks()
+        per_element = np.bincount(element_ids, minlength=len(batch.elements))
+        for element_id in np.flatnonzero(per_element).tolist():
+            self.element_counts[batch.elements[element_id]] += int(per_element[element_id])
+        return self.add_clicks(xs, ys)
+
+    def _check_compatible(self, other: "ClickHeatmap") -> None:
+        if self.viewport != other.viewport or self.bins != other.bins:
+            raise ValueError("Heatmaps with different grids cannot be merged")
+
+    def merge(self, other: "ClickHeatmap") -> "ClickHeatmap":
+        """
+        Add the clicks of another heatmap with the same grid, in place.
+
+        Returns:
+            self
+        """
+        self._check_compatible(other)
+        self.counts += other.counts
+        self.element_counts.update(other.element_counts)
+        return self
+
+    def __iadd__(self, other: "ClickHeatmap") -> "ClickHeatmap":
+        return self.merge(other)
+
+    def __add__(self, other: "ClickHeatmap") -> "ClickHeatmap":
+        self._check_compatible(other)
+        result = ClickHeatmap(self.viewport, self.bins)
+        return result.merge(self).merge(other)
+
+    @property
+    def total_clicks(self) -> int:
+        return int(self.counts.sum())
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the grid."""
+        return int(self.counts.nbytes)
+
+    def hotspots(self, top: int = 10) -> List[Dict[str, int]]:
+        """
+        Most clicked cells.
+
+        Args:
+            top: Number of cells to return
+
+        Returns:
+            Cells with their pixel bounds and click count, most clicked first
+        """
+        flat = self.counts.ravel()
+        top = min(top, int(np.count_nonzero(flat)))
+        if top <= 0:
+            return []
+
+        indices = np.argpartition(flat, -top)[-top:]
+        indices = indices[np.argsort(flat[indices])[::-1]]
+        columns, rows = self.bins
+        cell_width = self.viewport[0] / columns
+        cell_height = self.viewport[1] / rows
+        return [
+            {
+                "x": int((index % columns) * cell_width),
+                "y": int((index // columns) * cell_height),
+                "width": int(round(cell_width)),
+                "height": int(round(cell_height)),
+                "clicks": int(flat[index]),
+            }
+            for index in indices
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSON-serializable representation.
+
+        Returns:
+            Grid, per-element totals and the most clicked cells
+        """
+        return {
+            "viewport": {"width": self.viewport[0], "height": self.viewport[1]},
+            "bins": {"columns": self.bins[0], "rows": self.bins[1]},
+            "total_clicks": self.total_clicks,
+            "elements": dict(self.element_counts.most_common()),
+            "hotspots": self.hotspots(),
+            "grid": self.counts.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ClickHeatmap":
+        """Rebuild a heatmap from to_dict output."""
+        heatmap = cls(
+            (data["viewport"]["width"], data["viewport"]["height"]),
+            (data["bins"]["columns"], data["bins"]["rows"])
+        )
+        heatmap.counts = np.asarray(data["grid"], dtype=np.uint32).reshape(heatmap.counts.shape)
+        heatmap.element_counts = Counter(data.get("elements", {}))
+        return heatmap
@@ -0,0 +1,102 @@
+"""
+Parallel behavior analysis of large session sets.
+Sessions are converted shard by shard to columnar EventBatches, which are
+what the engine consumes and what is sent to the worker processes (NumPy
+arrays pickle far smaller than nested dicts). Each worker returns a partial
+BehaviorReport, and the parent merges them in shard order. Every aggregate
+is an integer sum or count, so the result is identical to the serial path.
+"""
+
+import os
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional, Iterable, Iterator
+
+from .columnar import EventBatch
+from .engine import BehaviorReport, SessionBehaviorEngine, analyze_sessions
+from .heatmap import DEFAULT_VIEWPORT, DEFAULT_BINS
+from .paths import DEFAULT_MAX_DEPTH
+
+# En dessous de ce nombre de sessions, le coût du pool dépasse le gain
+DEFAULT_MIN_PARALLEL_SESSIONS = 2000
+DEFAULT_SHARD_SIZE = 500
+
+
+def default_worker_count() -> int:
+    """Worker count from BEHAVIOR_WORKERS, or the number of CPUs."""
+    configured = os.getenv("BEHAVIOR_WORKERS", "auto")
+    if configured.isdigit():
+        return max(1, int(configured))
+    return os.cpu_count() or 1
+
+
+def _analyze_shard(shard: EventBatch, options: Dict[str, Any]) -> BehaviorReport:
+    return analyze_sessions(shard, **options)
+
+
+def iter_event_batches(sessions: Iterable[Dict[str, Any]], shard_size: int) -> Iterator[EventBatch]:
+    """
+    Convert sessions to columnar batches of at most ``shard_size`` sessions.
+
+    Sessions are read lazily: only the dicts of the current shard are
+    referenced while its batch is built.
+    """
+    iterator = iter(sessions)
+    while True:
+        batch = EventBatch.from_sessions(itertools.islice(iterator, shard_size))
+        if not batch.session_count:
+            return
+        yield batch
+
+
+def analyze_sessions_parallel(
+    sessions: Iterable[Dict[str, Any]],
+    workers: Optional[int] = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    min_sessions: int = DEFAULT_MIN_PARALLEL_SESSIONS,
+    **options
+) -> BehaviorReport:
+    """
+    Compute the behavior report of sessions on a process pool.
+
+    Small sets (fewer than ``min_sessions``) or a single worker fall back to
+    the serial engine. Either way the engine consumes EventBatches of
+    ``shard_size`` sessions. Sessions are read lazily, with at most two
+    shards per worker in flight.
+
+    Args:
+        sessions: Session recordings (list or lazy iterator)
+        workers: Number of processes (defaults to BEHAVIOR_WORKERS or the CPU count)
+        shard_size: Sessions per task
+        min_sessions: Minimum number of sessions before using the pool
+        **options: SessionBehaviorEngine options
+
+    Returns:
+        Behavior report, identical to analyze_sessions(sessions, **options)
+    """
+    workers = workers or default_worker_count()
+    iterator = iter(sessions)
+    head = list(itertools.islice(iterator, min_sessions))
+    batches = iter_event_batches(itertools.chain(head, iterator), shard_size)
+    if workers <= 1 or len(head) < min_sessions:
+        engine = SessionBehaviorEngine(**options)
+        for batch in batches:
+            engine.consume_batch(batch)
+        return engine.report
+
+    report = BehaviorReport(
+        options.get("viewport", DEFAULT_VIEWPORT),
+        options.get("bins", DEFAULT_BINS),
+        options.get("max_path_depth", DEFAULT_MAX_DEPTH)
+    )
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for shard in batches:
+            pending.append(executor.submit(_analyze_shard, shard, options))
+            # Fusionner dans l'ordre des shards pour garder l'ordre d'apparition du chemin série
+            while len(pending) > workers * 2:
+                report.merge(pending.popleft().result())
+        while pending:
+            report.merge(pending.popleft().result())
+    return report
@@ -0,0 +1,276 @@
+"""
+Navigation path analysis on a prefix trie.
+Each session contributes its sequence of visited pages once; paths sharing a
+prefix share their nodes. Top paths, funnel conversion and drop-off points
+are then answered by walking the trie, whose size depends on the number of
+distinct paths rather than on the number of sessions.
+"""
+
+import heapq
+from typing import Dict, List, Any, Optional, Iterable, Sequence, Tuple
+
+# Profondeur maximale des chemins: au-delà, la suite de la session est ignorée
+DEFAULT_MAX_DEPTH = 12
+
+
+def _event_page(props: Dict[str, Any]) -> Optional[str]:
+    return props.get("pathname") or props.get("path") or props.get("$pathname")
+
+
+def session_page_sequence(session: Dict[str, Any]) -> List[str]:
+    """
+    Pages visited during a session, in order, without consecutive repeats.
+
+    Args:
+        session: Session recording with its events
+
+    Returns:
+        Page paths from the $pageview events
+    """
+    pages = []
+    for event in session.get("events", []):
+        if event.get("type") != "$pageview":
+            continue
+        props = event.get("properties")
+        page = _event_page(props) if isinstance(props, dict) else None
+        # Un rechargement de la même page ne fait pas avancer le parcours
+        if page is not None and (not pages or pages[-1] != page):
+            pages.append(page)
+    return pages
+
+
+class _PathNode:
+    __slots__ = ("count", "ends", "children")
+
+    def __init__(self):
+        # Sessions passées par ce préfixe, et sessions qui s'y arrêtent
+        self.count = 0
+        self.ends = 0
+        self.children: Dict[str, "_PathNode"] = {}
+
+
+class NavigationTrie:
+    """
+    Prefix trie of session page sequences.
+
+    Sessions are added incrementally; tries built on separate batches of
+    sessions merge exactly (see merge).
+    """
+
+    def __init__(self, max_depth: int = DEFAULT_MAX_DEPTH):
+        """
+        Initialize an empty trie.
+
+        Args:
+            max_depth: Number of pages kept from the start of each session
+        """
+        if max_depth <= 0:
+            raise ValueError("max_depth must be positive")
+        self.max_depth = max_depth
+        self.root = _PathNode()
+        self.nodes = 0
+
+    @property
+    def sessions(self) -> int:
+        """Number of sessions with at least one page."""
+        return self.root.count
+
+    def add_path(self, pages: Sequence[str], weight: int = 1) -> None:
+        """
+        Add a page sequence.
+
+        Args:
+            pages: Visited pages, in order
+            weight: Number of sessions following this sequence
+        """
+        pages = pages[:self.max_depth]
+        if not pages:
+            return
+        node = self.root
+        node.count += weight
+        for page in pages:
+            child = node.children.get(page)
+            if child is None:
+                child = node.children[page] = _PathNode()
+                self.nodes += 1
+            child.count += weight
+            node = child
+        node.ends += weight
+
+    def add_session(self, session: Dict[str, Any]) -> List[str]:
+        """
+        Add the page sequence of a session.
+
+        Returns:
+            The sequence added
+        """
+        pages = session_page_sequence(session)
+        self.add_path(pages)
+        return pages
+
+    def add_sessions(self, sessions: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add the page sequences of sessions, consumed lazily.
+
+        Returns:
+            Number of sessions with at least one page
+        """
+        added = 0
+        for session in sessions:
+            if self.add_session(session):
+                added += 1
+        return added
+
+    def add_batch(self, batch) -> int:
+        """
+        Add the page sequences of a columnar EventBatch.
+
+        Returns:
+            Number of sessions with at least one page
+        """
+        pages, offsets = batch.pages, batch.offsets.tolist()
+        page_ids = batch.page.tolist()
+        added = 0
+        for i in range(batch.session_count):
+            sequence = []
+            for page_id in page_ids[offsets[i]:offsets[i + 1]]:
+                if page_id >= 0 and (not sequence or sequence[-1] != pages[page_id]):
+                    sequence.append(pages[page_id])
+            if sequence:
+                self.add_path(sequence)
+                added += 1
+        return added
+
+    def merge(self, other: "NavigationTrie") -> "NavigationTrie":
+        """
+        Add the paths of another trie, in place.
+
+        Returns:
+            self
+        """
+        if self.max_depth != other.max_depth:
+            raise ValueError("Tries with different max_depth cannot be merged")
+        stack = [(self.root, other.root)]
+        while stack:
+            mine, theirs = stack.pop()
+            mine.count += theirs.count
+            mine.ends += theirs.ends
+            for page, their_child in theirs.children.items():
+                child = mine.children.get(page)
+                if child is None:
+                    child = mine.children[page] = _PathNode()
+                    self.nodes += 1
+                stack.append((child, their_child))
+        return self
+
+    def iter_paths(self) -> Iterable[Tuple[Tuple[str, ...], int]]:
+        """
+        Yield every complete path with its number of sessions.
+
+        Adding these paths with add_path(path, weight) rebuilds the trie.
+        """
+        for path, node in self._walk():
+            if node.ends:
+                yield path, node.ends
+
+    def _walk(self) -> Iterable[Tuple[Tuple[str, ...], _PathNode]]:
+        """Yield (path, node) for every node except the root."""
+        stack = [((page,), child) for page, child in self.root.children.items()]
+        while stack:
+            path, node = stack.pop()
+            yield path, node
+            stack.extend((path + (page,), child) for page, child in node.children.items())
+
+    def top_paths(self, k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Most frequent complete session paths.
+
+        Args:
+            k: Number of paths to return
+
+        Returns:
+            Paths with their session count and share, most frequent first
+        """
+        best = heapq.nsmallest(
+            k,
+            ((-node.ends, path) for path, node in self._walk() if node.ends),
+        )
+        total = self.sessions
+        return [
+            {"path": list(path), "sessions": -ends, "share": -ends / total}
+            for ends, path in best
+        ]
+
+    def funnel(self, steps: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Conversion through ordered funnel steps.
+
+        A session reaches a step if it visits the pages of every step up to it
+        in that order, other pages in between being allowed.
+
+        Args:
+            steps: Pages of the funnel, in order
+
+        Returns:
+            One entry per step with the sessions reaching it, the conversion
+            from the previous step and from the first step
+        """
+        if not steps:
+            return []
+        reached = [0] * len(steps)
+        stack = [(self.root, 0)]
+        while stack:
+            node, matched = stack.pop()
+            for page, child in node.children.items():
+                step = matched
+                if step < len(steps) and steps[step] == page:
+                    # Tous les descendants sont déjà comptés pour cette étape
+                    reached[step] += child.count
+                    step += 1
+                if step < len(steps):
+                    stack.append((child, step))
+
+        result = []
+        for i, (page, count) in enumerate(zip(steps, reached)):
+            previous = reached[i - 1] if i else self.sessions
+            result.append({
+                "step": page,
+                "sessions": count,
+                "conversion": count / previous if previous else 0.0,
+                "overall_conversion": count / reached[0] if reached[0] else 0.0,
+                "drop_off": previous - count,
+            })
+        return result
+
+    def drop_off_points(self, top: int = 10, min_sessions: int = 5) -> List[Dict[str, Any]]:
+        """
+        Path prefixes where the most sessions stop.
+
+        Args:
+            top: Number of prefixes to return
+            min_sessions: Minimum sessions through a prefix for it to be reported
+
+        Returns:
+            Prefixes with their sessions, exits and exit rate, most exits first
+        """
+        candidates = (
+            (-node.ends, -node.count, path, node.count)
+            for path, node in self._walk()
+            if node.ends and node.count >= min_sessions
+        )
+        return [
+            {"path": list(path), "page": path[-1], "sessions": count,
+             "exits": -ends, "exit_rate": -ends / count}
+            for ends, _, path, count in heapq.nsmallest(top, candidates)
+        ]
+
+    def to_dict(self, top: int = 10) -> Dict[str, Any]:
+        """
+        JSON-serializable summary of the trie.
+        """
+        return {
+            "sessions": self.sessions,
+            "distinct_prefixes": self.nodes,
+            "top_paths": self.top_paths(top),
+            "drop_off_points": self.drop_off_points(top),
+        }
@@ -0,0 +1,332 @@
+"""
+Daily behavior rollups per page, persisted as small NumPy archives.
+Sessions are analyzed once at ingestion and folded into one BehaviorReport
+per (page, day): binned heatmap, rage clicks, navigation loops, dwell time
+histograms and paths. A date-range query then merges at most one rollup per
+day instead of refetching and reanalyzing raw sessions.
+"""
+
+import io
+import os
+import json
+import logging
+import tempfile
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable, Set, Tuple, Union
+from urllib.parse import quote
+
+import numpy as np
+
+from backend.services.session_index import normalize_page_path, page_prefixes, session_page_keys
+from backend.utils.bloom_filter import ScalableBloomFilter
+from .engine import BehaviorReport, SessionBehaviorEngine
+from .columnar import EventBatch, parse_event_time
+from .paths import session_page_sequence
+
+logger = logging.getLogger(__name__)
+
+
+def default_rollup_directory() -> Path:
+    """Default location of the behavior rollups."""
+    return Path(os.getenv("BASE_PATH", "data")) / "cache" / "behavior_rollups"
+
+
+def session_day(session: Dict[str, Any]) -> Optional[date]:
+    """
+    UTC day on which a session started.
+
+    Uses start_time, then the timestamp of the first event.
+    """
+    started_at = parse_event_time(session.get("start_time"))
+    if started_at is None:
+        for event in session.get("events", []):
+            started_at = parse_event_time(event.get("timestamp"))
+            if started_at is not None:
+                break
+    if started_at is None:
+        return None
+    return datetime.fromtimestamp(started_at, tz=timezone.utc).date()
+
+
+def _session_id(session: Dict[str, Any]) -> Optional[str]:
+    session_id = session.get("id") or session.get("session_id")
+    return str(session_id) if session_id is not None else None
+
+
+def rollup_pages(session: Dict[str, Any]) -> Set[str]:
+    """
+    Pages whose rollups a session contributes to.
+
+    Same keys as the page session index, plus the pages of its $pageview events.
+    """
+    pages = session_page_keys(session)
+    for page in session_page_sequence(session):
+        pages.update(page_prefixes(normalize_page_path(page)))
+    return pages
+
+
+def _seen_filter() -> ScalableBloomFilter:
+    # Quelques Ko par agrégat; un faux positif (1e-4) ignore une session sur dix mille
+    return ScalableBloomFilter(initial_capacity=1024, error_rate=1e-4)
+
+
+def _as_day(value: Union[str, date, datetime]) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
+
+
+def _as_utc(value: Union[str, date, datetime]) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    elif not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    # Les dates sans fuseau sont en UTC, comme session_day
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def covered_days(date_from: Union[str, date, datetime], date_to: Union[str, date, datetime]) -> List[date]:
+    """
+    UTC days lying entirely within a period.
+
+    A fetch over the period is exhaustive only for these days: the first and
+    last days may be cut by the bounds.
+
+    Args:
+        date_from: Start of the period (inclusive)
+        date_to: End of the period (exclusive)
+
+    Returns:
+        The covered days, in order
+    """
+    start, end = _as_utc(date_from), _as_utc(date_to)
+    day = start.date() if start.time() == datetime.min.time() else start.date() + timedelta(days=1)
+    days = []
+    while datetime.combine(day + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc) <= end:
+        days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def encode_report(report: BehaviorReport, **extra) -> Dict[str, np.ndarray]:
+    """
+    Arrays storing a behavior report (see decode_report).
+
+    Args:
+        report: Report to store
+        **extra: JSON-serializable metadata stored alongside
+
+    Returns:
+        Arrays for numpy.savez
+    """
+    meta = {
+        "sessions": report.sessions,
+        "events": report.events,
+        "viewport": report.heatmap.viewport,
+        "bins": report.heatmap.bins,
+        "max_path_depth": report.paths.max_depth,
+        "elements": dict(report.heatmap.element_counts),
+        "rage_clicks": report.rage_clicks,
+        "navigation_loops": report.navigation_loops,
+        "scroll_depth": report.scroll_depth,
+        "dwell_time": report.dwell_time,
+        "dwell_histogram": report.dwell_histogram,
+        "confusion": report.confusion,
+        # Les chemins complets suffisent à reconstruire le trie
+        "paths": [[list(path), count] for path, count in report.paths.iter_paths()],
+    }
+    meta.update(extra)
+    return {
+        "heatmap": report.heatmap.counts,
+        "meta": np.frombuffer(json.dumps(meta, separators=(",", ":")).encode("utf-8"), dtype=np.uint8),
+    }
+
+
+def decode_report(arrays) -> Tuple[BehaviorReport, Dict[str, Any]]:
+    """
+    Rebuild a behavior report from encode_report arrays.
+
+    Returns:
+        The report and its stored metadata
+    """
+    meta = json.loads(arrays["meta"].tobytes().decode("utf-8"))
+    report = BehaviorReport(tuple(meta["viewport"]), tuple(meta["bins"]), meta["max_path_depth"])
+    report.sessions = meta["sessions"]
+    report.events = meta["events"]
+    report.heatmap.counts = np.array(arrays["heatmap"], dtype=np.uint32)
+    report.heatmap.element_counts.update(meta["elements"])
+    report.rage_clicks = meta["rage_clicks"]
+    report.navigation_loops = meta["navigation_loops"]
+    report.scroll_depth = meta["scroll_depth"]
+    report.dwell_time = meta["dwell_time"]
+    report.dwell_histogram = meta["dwell_histogram"]
+    report.confusion = meta["confusion"]
+    for path, count in meta["paths"]:
+        report.paths.add_path(path, count)
+    return report, meta
+
+
+class BehaviorRollupStore:
+    """
+    Store of daily behavior rollups, one .npz file per page and day.
+
+    A rollup is marked complete once every session of its day has been
+    ingested for its page; queries report the days still missing so the
+    caller can fetch and ingest them.
+    """
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None, **options):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Directory of the rollups (defaults to data/cache/behavior_rollups)
+            **options: SessionBehaviorEngine options used at ingestion
+        """
+        self.directory = Path(directory or default_rollup_directory())
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.options = options
+        self._lock = threading.Lock()
+
+    def _path(self, page: str, day: date) -> Path:
+        return self.directory / quote(page, safe="") / f"{day.isoformat()}.npz"
+
+    def load(self, page: str, day: Union[str, date]) -> Tuple[Optional[BehaviorReport], Dict[str, Any]]:
+        """
+        Load the rollup of a page for one day.
+
+        Returns:
+            The report (None if absent) and its metadata
+        """
+        report, meta, _ = self._read(normalize_page_path(page), _as_day(day))
+        return report, meta
+
+    def _read(self, page: str, day: date) -> Tuple[Optional[BehaviorReport], Dict[str, Any], ScalableBloomFilter]:
+        """Report, metadata and Bloom filter of the session ids of a rollup."""
+        path = self._path(page, day)
+        seen = _seen_filter()
+        if not path.exists():
+            return None, {}, seen
+        try:
+            with np.load(path) as arrays:
+                report, meta = decode_report(arrays)
+                if "seen" in arrays:
+                    seen = ScalableBloomFilter.from_bytes(arrays["seen"].tobytes())
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable rollup {path}: {e}")
+            return None, {}, seen
+        # Agrégats écrits avant le filtre: la liste des identifiants est reprise
+        for session_id in meta.pop("session_ids", []):
+            seen.add(session_id)
+        return report, meta, seen
+
+    def _save(self, page: str, day: date, report: BehaviorReport, seen: ScalableBloomFilter, complete: bool) -> None:
+        path = self._path(page, day)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = encode_report(report, complete=complete)
+        arrays["seen"] = np.frombuffer(seen.to_bytes(), dtype=np.uint8)
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **arrays)
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(buffer.getvalue())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def ingest(
+        self,
+        sessions: Iterable[Dict[str, Any]],
+        pages: Optional[Iterable[str]] = None,
+        days: Optional[Iterable[Union[str, date]]] = None
+    ) -> int:
+        """
+        Fold sessions into the rollups of the pages they visited.
+
+        Sessions already ingested (same id) are skipped, so overlapping
+        fetches can be ingested safely. Ids are remembered in a Bloom filter
+        per rollup, whose size does not grow with a list of ids.
+
+        Args:
+            sessions: Session recordings, consumed lazily
+            pages: Only update the rollups of these pages (defaults to every visited page)
+            days: Days for which the sessions given are exhaustive (fetched
+                without error nor truncation); their rollups are marked
+                complete, even without any session
+
+        Returns:
+            Number of (page, day) rollups written
+        """
+        wanted = {normalize_page_path(page) for page in pages} if pages is not None else None
+        groups: Dict[Tuple[str, date], List[Dict[str, Any]]] = defaultdict(list)
+        for session in sessions:
+            day = session_day(session)
+            if day is None:
+                continue
+            for page in rollup_pages(session):
+                if wanted is None or page in wanted:
+                    groups[(page, day)].append(session)
+
+        complete_days = {_as_day(day) for day in days} if days is not None else set()
+        if wanted is not None:
+            for page in wanted:
+                for day in complete_days:
+                    groups.setdefault((page, day), [])
+
+        with self._lock:
+            for (page, day), day_sessions in groups.items():
+                report, meta, seen = self._read(page, day)
+                fresh = []
+                for session in day_sessions:
+                    session_id = _session_id(session)
+                    if session_id is None or seen.add(session_id):
+                        fresh.append(session)
+
+                complete = meta.get("complete", False) or day in complete_days
+                if report is not None and not fresh and complete == meta.get("complete", False):
+                    continue
+                partial = SessionBehaviorEngine(**self.options).consume_batch(EventBatch.from_sessions(fresh))
+                report = report.merge(partial) if report is not None else partial
+                self._save(page, day, report, seen, complete)
+        return len(groups)
+
+    def query(
+        self,
+        page: str,
+        date_from: Union[str, date, datetime],
+        date_to: Union[str, date, datetime],
+        include_partial: bool = False
+    ) -> Tuple[BehaviorReport, List[date]]:
+        """
+        Behavior of a page over a date range, from its daily rollups.
+
+        Args:
+            page: Page path or URL
+            date_from: First day (inclusive)
+            date_to: Last day (inclusive)
+            include_partial: Also merge the rollups not marked complete
+
+        Returns:
+            The merged report of the complete days (and partial ones if
+            requested), and the days without a complete rollup
+        """
+        page = normalize_page_path(page)
+        day, last = _as_day(date_from), _as_day(date_to)
+        merged = SessionBehaviorEngine(**self.options).report
+        missing = []
+        while day <= last:
+            report, meta = self.load(page, day)
+            if not meta.get("complete"):
+                missing.append(day)
+            if report is not None and (meta.get("complete") or include_partial):
+                merged.merge(report)
+            day += timedelta(days=1)
+        return merged, missing
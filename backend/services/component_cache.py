@@ -0,0 +1,100 @@
+"""
+Cache disque des composants Figma générés par Code.to.Design.
+Des recommandations de pages différentes produisent souvent la même
+spécification de composant: le résultat est indexé par le hash canonique de
+la spécification (et de l'API appelée), si bien qu'une spécification déjà
+générée ne repasse pas par l'API.
+"""
+
+import os
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
+
+from backend.services.recommendation_cache import canonical_json
+from backend.utils.disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+# Durée de vie par défaut d'un composant généré: 30 jours
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+
+
+def default_cache_directory() -> Path:
+    """Default location of the components cache."""
+    return Path(os.getenv("BASE_PATH", "data")) / "cache" / "components"
+
+
+class ComponentCache:
+    """
+    Cache des composants générés, indexé par le hash de leur spécification.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, Path]] = None,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+        max_bytes: Optional[int] = 32 * 1024 * 1024
+    ):
+        """
+        Initialise le cache.
+
+        Args:
+            directory: Répertoire du cache (par défaut data/cache/components)
+            ttl_seconds: Durée de vie des entrées (None pour aucune expiration)
+            max_bytes: Taille maximale du cache avant éviction LRU
+        """
+        self.store = DiskCache(directory or default_cache_directory(), max_bytes=max_bytes,
+                               ttl_seconds=ttl_seconds, compress=True)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(component_spec: Dict[str, Any], api_url: str = "") -> str:
+        """
+        Hash canonique d'une spécification de composant.
+
+        Args:
+            component_spec: Spécification envoyée à Code.to.Design
+            api_url: API qui génère le composant
+
+        Returns:
+            Hash SHA-256, indépendant de l'ordre des clés
+        """
+        payload = canonical_json({"api_url": api_url, "spec": component_spec})
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Retourne le composant en cache pour une empreinte.
+
+        Returns:
+            Composant généré, ou None si absent
+        """
+        component = self.store.get(f"component:{fingerprint}")
+        if component is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return component
+
+    def put(self, fingerprint: str, component: Dict[str, Any]) -> bool:
+        """
+        Met en cache un composant généré (les erreurs ne sont pas mises en cache).
+
+        Returns:
+            True si le composant a été mis en cache
+        """
+        if "error" in component:
+            return False
+        try:
+            self.store.set(f"component:{fingerprint}", component)
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not cache component {fingerprint[:12]}: {e}")
+            return False
+
+    def stats(self) -> Dict[str, int]:
+        """Hits, misses and size of the cache."""
+        return {"hits": self.hits, "misses": self.misses, "size_bytes": self.store.size_in_bytes}
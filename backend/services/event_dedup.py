@@ -0,0 +1,129 @@
+"""
+Déduplication des événements lors de l'ingestion.
+Les fenêtres d'export qui se chevauchent, les retries et l'ingestion depuis
+plusieurs sources (PostHog converti au format Amplitude, Amplitude) produisent
+des doublons. Ce module les filtre avec un filtre de Bloom persisté.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Any, Optional, Union
+
+from backend.utils.bloom_filter import ScalableBloomFilter
+
+logger = logging.getLogger(__name__)
+
+# Champs identifiant un événement, par ordre de préférence
+EVENT_ID_FIELDS = ("$insert_id", "insert_id", "uuid", "id")
+
+
+def default_state_path() -> Path:
+    """Default location of the persisted dedup filter."""
+    return Path(os.getenv("BASE_PATH", "data")) / "dedup" / "events.bloom"
+
+
+def event_key(event: Dict[str, Any]) -> str:
+    """
+    Compute the deduplication key of an event.
+
+    Uses the insert id / event id when present, otherwise a hash of the
+    event content so that exact replays are still detected.
+
+    Args:
+        event: Raw PostHog event or Amplitude-format event
+
+    Returns:
+        Stable key identifying the event
+    """
+    for field in EVENT_ID_FIELDS:
+        value = event.get(field)
+        if value not in (None, ""):
+            return f"id:{value}"
+
+    content = json.dumps(event, sort_keys=True, separators=(",", ":"), default=str)
+    return "content:" + hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+class EventDeduplicator:
+    """
+    Filters out events already seen in this or previous ingestion runs.
+
+    Seen keys are kept in a scalable Bloom filter so memory stays bounded
+    (a few bytes per event at the default error rate). A false positive
+    drops a genuinely new event with probability ``error_rate``; duplicates
+    are never let through.
+    """
+
+    def __init__(
+        self,
+        state_path: Optional[Union[str, Path]] = None,
+        initial_capacity: int = 1_000_000,
+        error_rate: float = 0.001
+    ):
+        """
+        Initialize the deduplicator, restoring its state from disk if present.
+
+        Args:
+            state_path: File where the filter is persisted (defaults to data/dedup/events.bloom)
+            initial_capacity: Capacity of the first filter slice
+            error_rate: Upper bound on the false positive rate
+        """
+        self.state_path = Path(state_path) if state_path else default_state_path()
+        self.filter = ScalableBloomFilter.load_or_create(
+            self.state_path,
+            initial_capacity=initial_capacity,
+            error_rate=error_rate
+        )
+        self.seen_count = 0
+        self.duplicate_count = 0
+
+    def is_duplicate(self, event: Dict[str, Any]) -> bool:
+        """
+        Check an event and record it as seen.
+
+        Args:
+            event: Event to check
+
+        Returns:
+            True if the event was already ingested
+        """
+        self.seen_count += 1
+        if self.filter.add(event_key(event)):
+            return False
+        self.duplicate_count += 1
+        return True
+
+    def filter_events(self, events: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield only the events that were not seen before.
+
+        Args:
+            events: Events to filter (consumed lazily)
+
+        Returns:
+            Iterator over new events
+        """
+        for event in events:
+            if not self.is_duplicate(event):
+                yield event
+
+    def save(self) -> Path:
+        """Persist the filter so later runs skip the same events."""
+        path = self.filter.save(self.state_path)
+        logger.info(
+            f"Dedup state saved to {path} ({len(self.filter)} keys, "
+            f"{self.filter.size_in_bytes / 1024:.0f} KiB)"
+        )
+        return path
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Counters for the current run."""
+        return {
+            "seen": self.seen_count,
+            "duplicates": self.duplicate_count,
+            "unique": self.seen_count - self.duplicate_count
+        }
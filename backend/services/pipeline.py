@@ -0,0 +1,381 @@
+"""
+Stage-level executor for the analysis → recommendation → validation →
+component → layout pipeline.
+Stages are declared as a DAG: each one names the pipeline inputs or upstream
+stages it reads, and the type of its output. Stages whose inputs are ready
+run concurrently, a mapped stage runs once per item of a list input on a
+bounded pool, and every output is memoized under the hash of the stage's
+inputs and version. Re-running after a prompt change (a new stage version)
+therefore only recomputes that stage and the stages whose inputs changed.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from typing import Dict, List, Any, Callable, Iterable, Mapping, Optional, Sequence, Tuple, Union
+
+from backend.services.recommendation_cache import canonical_json
+from backend.utils.disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+# Nombre de stages (ou d'éléments d'un stage mappé) exécutés en parallèle
+DEFAULT_PIPELINE_WORKERS = 4
+
+_MISSING = object()
+
+
+class PipelineStage:
+    """
+    One stage of a pipeline.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        inputs: Union[Sequence[str], Mapping[str, str]],
+        output_type: Optional[Union[type, Tuple[type, ...]]] = None,
+        version: str = "",
+        map_over: Optional[str] = None,
+        memoize: Union[bool, Callable[[Any], bool]] = True
+    ):
+        """
+        Declare a stage.
+
+        Args:
+            name: Stage name, also the name under which its output is available
+            func: Function computing the output, called with one keyword argument per input
+            inputs: Pipeline inputs or upstream stages read by the stage, either
+                as names (argument name = source name) or as {argument: source}
+            output_type: Expected type of the output (of each item for a mapped stage)
+            version: Version of the stage logic (e.g. prompt version); changing it
+                invalidates the memoized outputs of the stage
+            map_over: Argument holding a list: func is called once per item,
+                concurrently, and the output is the list of results in order
+            memoize: Whether outputs are memoized, or a predicate telling which
+                outputs are (e.g. to never memoize an error result)
+        """
+        self.name = name
+        self.func = func
+        self.inputs: Dict[str, str] = dict(inputs) if isinstance(inputs, Mapping) else {i: i for i in inputs}
+        self.output_type = output_type
+        self.version = version
+        self.map_over = map_over
+        self.memoize = memoize
+        if map_over is not None and map_over not in self.inputs:
+            raise ValueError(f"Stage {name!r} maps over unknown argument {map_over!r}")
+
+    @property
+    def sources(self) -> List[str]:
+        return list(self.inputs.values())
+
+    def memo_key(self, arguments: Dict[str, Any]) -> str:
+        """Hash of the stage, its version and its input values."""
+        payload = canonical_json({"stage": self.name, "version": self.version, "inputs": arguments})
+        return f"stage:{self.name}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    def should_memoize(self, value: Any) -> bool:
+        return self.memoize(value) if callable(self.memoize) else bool(self.memoize)
+
+    def check_output(self, value: Any) -> Any:
+        if self.output_type is not None and not isinstance(value, self.output_type):
+            raise TypeError(
+                f"Stage {self.name!r} returned {type(value).__name__}, expected {self.output_type}"
+            )
+        return value
+
+
+class PipelineResult:
+    """
+    Outputs of a pipeline run with per-stage timings.
+    """
+
+    def __init__(self):
+        self.outputs: Dict[str, Any] = {}
+        self.timings: Dict[str, Dict[str, Any]] = {}
+        self.started_at = datetime.now().isoformat()
+        self.seconds = 0.0
+
+    def __getitem__(self, name: str) -> Any:
+        return self.outputs[name]
+
+    @property
+    def recomputed(self) -> List[str]:
+        """Stages that were not (entirely) served from the memo."""
+        return [name for name, timing in self.timings.items() if not timing["memoized"]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at,
+            "seconds": round(self.seconds, 3),
+            "stages": self.timings,
+        }
+
+
+class Pipeline:
+    """
+    DAG of stages executed concurrently with memoized outputs.
+    """
+
+    def __init__(
+        self,
+        stages: Iterable[PipelineStage],
+        memo: Optional[DiskCache] = None,
+        max_workers: int = DEFAULT_PIPELINE_WORKERS
+    ):
+        """
+        Build a pipeline.
+
+        Args:
+            stages: Stages of the pipeline, in any order
+            memo: Persistent store of stage outputs (by default, in memory for
+                the lifetime of the pipeline); outputs must be JSON-serializable
+            max_workers: Maximum number of stages, or items of a mapped stage, running at once
+
+        Raises:
+            ValueError: If stage names are duplicated or the stages form a cycle
+        """
+        self.stages: Dict[str, PipelineStage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage {stage.name!r}")
+            self.stages[stage.name] = stage
+        self.memo = memo
+        self._memory: Dict[str, str] = {}
+        self.max_workers = max(1, max_workers)
+        self.order = self._topological_order()
+        self.inputs = sorted({
+            source for stage in self.stages.values() for source in stage.sources
+            if source not in self.stages
+        })
+
+    def _topological_order(self) -> List[str]:
+        pending = {
+            name: {source for source in stage.sources if source in self.stages}
+            for name, stage in self.stages.items()
+        }
+        order = []
+        while pending:
+            ready = [name for name, deps in pending.items() if not deps]
+            if not ready:
+                raise ValueError(f"Pipeline stages form a cycle: {', '.join(sorted(pending))}")
+            for name in ready:
+                del pending[name]
+                order.append(name)
+            for deps in pending.values():
+                deps.difference_update(ready)
+        return order
+
+    def _memo_get(self, key: str) -> Any:
+        if self.memo is not None:
+            return self.memo.get(key, _MISSING)
+        # Copie à chaque lecture: un stage qui modifie ses entrées n'altère pas le mémo
+        serialized = self._memory.get(key)
+        return _MISSING if serialized is None else json.loads(serialized)
+
+    def _memo_set(self, key: str, value: Any) -> None:
+        if self.memo is None:
+            self._memory[key] = json.dumps(value, default=str)
+            return
+        try:
+            self.memo.set(key, value)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not memoize {key}: {e}")
+
+    def _call(self, stage: PipelineStage, arguments: Dict[str, Any]) -> Tuple[Any, bool]:
+        """Output of a call, from the memo when possible, and whether it was memoized."""
+        key = stage.memo_key(arguments) if stage.memoize else None
+        if key is not None:
+            value = self._memo_get(key)
+            if value is not _MISSING:
+                return value, True
+        value = stage.check_output(stage.func(**arguments))
+        if key is not None and stage.should_memoize(value):
+            self._memo_set(key, value)
+        return value, False
+
+    def _run_stage(self, stage: PipelineStage, outputs: Dict[str, Any]) -> Tuple[Any, Dict[str, Any]]:
+        arguments = {argument: outputs[source] for argument, source in stage.inputs.items()}
+        start = time.perf_counter()
+        if stage.map_over is None:
+            value, memoized = self._call(stage, arguments)
+            timing = {"memoized": memoized}
+        else:
+            items = list(arguments[stage.map_over])
+            calls = [{**arguments, stage.map_over: item} for item in items]
+            if len(calls) > 1 and self.max_workers > 1:
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(calls))) as executor:
+                    results = list(executor.map(lambda call: self._call(stage, call), calls))
+            else:
+                results = [self._call(stage, call) for call in calls]
+            value = [result for result, _ in results]
+            memoized_items = sum(memoized for _, memoized in results)
+            timing = {"memoized": memoized_items == len(results), "items": len(results),
+                      "memoized_items": memoized_items}
+        timing["seconds"] = round(time.perf_counter() - start, 3)
+        return value, timing
+
+    def run(self, targets: Optional[Sequence[str]] = None, **inputs) -> PipelineResult:
+        """
+        Run the pipeline.
+
+        Args:
+            targets: Stages whose outputs are wanted (default: every stage);
+                only them and their upstream stages run
+            **inputs: Values of the pipeline inputs
+
+        Returns:
+            PipelineResult: Stage outputs and timings
+
+        Raises:
+            ValueError: If a needed pipeline input is missing
+        """
+        needed = self._needed_stages(targets)
+        missing = sorted({
+            source for name in needed for source in self.stages[name].sources
+            if source not in self.stages and source not in inputs
+        })
+        if missing:
+            raise ValueError(f"Missing pipeline inputs: {', '.join(missing)}")
+
+        result = PipelineResult()
+        outputs: Dict[str, Any] = dict(inputs)
+        remaining = [name for name in self.order if name in needed]
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+            while remaining or running:
+                # Lancer tous les stages dont les entrées sont prêtes
+                for name in list(remaining):
+                    if all(source in outputs for source in self.stages[name].sources):
+                        remaining.remove(name)
+                        running[executor.submit(self._run_stage, self.stages[name], outputs)] = name
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        value, timing = future.result()
+                    except Exception:
+                        for other in running:
+                            other.cancel()
+                        logger.error(f"Pipeline stage {name!r} failed")
+                        raise
+                    outputs[name] = value
+                    result.outputs[name] = value
+                    result.timings[name] = timing
+
+        result.seconds = time.perf_counter() - start
+        result.timings = {name: result.timings[name] for name in self.order if name in result.timings}
+        return result
+
+    def _needed_stages(self, targets: Optional[Sequence[str]]) -> set:
+        if targets is None:
+            return set(self.stages)
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.stages:
+                raise ValueError(f"Unknown pipeline stage {name!r}")
+            if name not in needed:
+                needed.add(name)
+                stack.extend(source for source in self.stages[name].sources if source in self.stages)
+        return needed
+
+
+def file_fingerprint(path: str) -> Dict[str, Any]:
+    """
+    Identity of the current content of a file: path, size and modification time.
+
+    Read by a stage instead of the bare path, it makes the stage recompute
+    whenever the file is rewritten.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return {"path": str(path), "size": None, "mtime_ns": None}
+    return {"path": str(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def design_pipeline(
+    recommendation_chain=None,
+    code_to_design=None,
+    memo: Optional[DiskCache] = None,
+    max_workers: int = DEFAULT_PIPELINE_WORKERS
+) -> Pipeline:
+    """
+    Pipeline from feedback analysis to a Figma layout.
+
+    Inputs: page_id, start_date, end_date and feedback_file. Stages:
+    feedback_source (the file's size and modification time, so that a
+    rewritten file is analyzed again), analysis (analyze_feedbacks), summary,
+    recommendations (generation), validated, component_specs, components
+    (CodeToDesignClient.generate_components: concurrent calls, each with its
+    own timeout, a failure only marking its component) and layout.
+
+    Args:
+        recommendation_chain: DesignRecommendationChain (created if not provided)
+        code_to_design: CodeToDesignClient (created if not provided)
+        memo: Persistent store of stage outputs
+        max_workers: Maximum number of concurrent stages or component generations
+
+    Returns:
+        Pipeline: The declared pipeline
+    """
+    from backend.models.feedback_analyzer import analyze_feedbacks
+    from models.design_recommendations import (
+        DesignRecommendationChain, RECOMMENDATION_PROMPT_VERSION, VALIDATION_PROMPT_VERSION
+    )
+    from models.code_to_design import CodeToDesignClient, FigmaLayoutGenerator
+
+    chain = recommendation_chain or DesignRecommendationChain()
+    client = code_to_design or CodeToDesignClient()
+    model = f"{chain.model}@{chain.temperature}"
+
+    def analysis(page_id, start_date, end_date, feedback_source):
+        return analyze_feedbacks(page_id, start_date, end_date, feedback_file=feedback_source["path"])
+
+    def summary(analysis):
+        if analysis.get("status") == "error":
+            raise ValueError(f"Feedback analysis failed: {analysis.get('results', {}).get('error')}")
+        # Les métadonnées (date d'analyse) sont exclues pour que la suite reste mémoïsable
+        results = analysis.get("results", {})
+        return results.get("summary", results)
+
+    def layout(page_id, validated, components):
+        components_result = CodeToDesignClient.build_components_result(validated, components, page_id)
+        return FigmaLayoutGenerator._aggregate_components_to_layout(components_result)
+
+    return Pipeline([
+        PipelineStage("feedback_source", file_fingerprint, {"path": "feedback_file"},
+                      output_type=dict, memoize=False),
+        PipelineStage("analysis", analysis,
+                      ["page_id", "start_date", "end_date", "feedback_source"], output_type=dict,
+                      version=chain.model, memoize=lambda analysis: analysis.get("status") == "success"),
+        PipelineStage("summary", summary, ["analysis"], output_type=dict),
+        PipelineStage("recommendations",
+                      lambda analysis_summary, page_id: chain.generate_recommendations(
+                          analysis_summary, page_id, validate=False),
+                      {"analysis_summary": "summary", "page_id": "page_id"}, output_type=dict,
+                      version=f"{model}:{RECOMMENDATION_PROMPT_VERSION}"),
+        PipelineStage("validated", chain.validate_recommendations,
+                      {"recommendations": "recommendations"}, output_type=dict,
+                      version=f"{model}:{VALIDATION_PROMPT_VERSION}"),
+        PipelineStage("component_specs",
+                      lambda validated: [client._recommendation_to_component_spec(rec)
+                                         for rec in validated.get("recommendations", [])],
+                      ["validated"], output_type=list),
+        # Les composants déjà générés d'une liste partiellement en échec sont
+        # servis par le cache du client lors de la reprise
+        PipelineStage("components", client.generate_components,
+                      {"component_specs": "component_specs"}, output_type=list,
+                      memoize=lambda components: not any("error" in c for c in components)),
+        PipelineStage("layout", layout, ["page_id", "validated", "components"],
+                      output_type=dict, memoize=False),
+    ], memo=memo, max_workers=max_workers)
@@ -0,0 +1,141 @@
+"""
+Pagination des endpoints de liste de l'API PostHog.
+Suit les curseurs `next` (événements) ou le drapeau `has_next` avec offset
+(enregistrements de session) jusqu'à épuisement ou jusqu'à un plafond configurable,
+en produisant les pages au fur et à mesure de leur arrivée.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+from backend.utils.http_client import HTTPClient
+
+logger = logging.getLogger(__name__)
+
+# Délai par défaut d'une requête de page (connexion, lecture) en secondes
+DEFAULT_PAGE_TIMEOUT = (5, 30)
+
+PageRequest = Tuple[str, Optional[Dict[str, Any]]]
+
+
+def _fetch_page(
+    session: HTTPClient,
+    request: PageRequest,
+    headers: Optional[Dict[str, str]],
+    timeout: Any
+) -> Dict[str, Any]:
+    url, params = request
+    response = session.get(url, headers=headers, params=params, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+def _next_request(
+    payload: Dict[str, Any],
+    request: PageRequest,
+    page_length: int,
+    follow_params: Optional[Dict[str, Any]]
+) -> Optional[PageRequest]:
+    """Compute the request for the page following ``payload``, if any."""
+    next_url = payload.get("next")
+    if next_url:
+        # L'URL `next` contient déjà les filtres, seule l'authentification est rajoutée
+        return next_url, dict(follow_params) if follow_params else None
+
+    if payload.get("has_next") and page_length:
+        url, params = request
+        params = dict(params or {})
+        params["offset"] = int(params.get("offset", 0)) + page_length
+        return url, params
+
+    return None
+
+
+def iter_posthog_pages(
+    session: HTTPClient,
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    max_items: Optional[int] = None,
+    prefetch: bool = False,
+    follow_params: Optional[Dict[str, Any]] = None,
+    timeout: Any = DEFAULT_PAGE_TIMEOUT
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Iterate over the pages of a PostHog list endpoint.
+
+    Args:
+        session: HTTP session used for every page (keeps connections alive)
+        url: Endpoint URL of the first page
+        params: Query parameters of the first page
+        headers: Request headers (authentication)
+        max_items: Stop after this many results in total (None for no cap,
+            0 for no request at all)
+        prefetch: Request the next page while the caller processes the current one
+        follow_params: Query parameters added to cursor URLs (e.g. query-param auth)
+        timeout: Per-request timeout passed to the HTTP client
+
+    Returns:
+        Iterator over lists of results, one per page
+    """
+    request: Optional[PageRequest] = (url, params) if max_items is None or max_items > 0 else None
+    pending: Optional[Future] = None
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    total = 0
+
+    try:
+        while request is not None:
+            if pending is not None:
+                payload = pending.result()
+                pending = None
+            else:
+                payload = _fetch_page(session, request, headers, timeout)
+
+            results = payload.get("results", []) if isinstance(payload, dict) else payload
+            if not isinstance(payload, dict):
+                # Certains endpoints renvoient directement une liste, sans pagination
+                payload = {}
+
+            if max_items is not None and total + len(results) >= max_items:
+                results = results[:max_items - total]
+                request = None
+            else:
+                request = _next_request(payload, request, len(results), follow_params)
+
+            total += len(results)
+            if not results:
+                break
+
+            # Lancer la page suivante avant de rendre la main à l'appelant
+            if request is not None and executor is not None:
+                pending = executor.submit(_fetch_page, session, request, headers, timeout)
+
+            yield results
+    finally:
+        if pending is not None:
+            pending.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    logger.debug(f"Paginated {total} results from {url}")
+
+
+def iter_posthog_results(
+    session: HTTPClient,
+    url: str,
+    **kwargs
+) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over individual results of a paginated PostHog endpoint.
+
+    Args:
+        session: HTTP session
+        url: Endpoint URL
+        **kwargs: Options forwarded to iter_posthog_pages
+
+    Returns:
+        Iterator over results
+    """
+    for page in iter_posthog_pages(session, url, **kwargs):
+        yield from page
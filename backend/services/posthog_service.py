@@ -8,9 +8,9 @@ import os
 import sys
 import json
 import logging
+import itertools
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Union
-import requests
+from typing import Dict, List, Any, Optional, Union, Iterator, Iterable
 import posthog
 from pathlib import Path
 
@@ -18,6 +18,11 @@ from pathlib import Path
 root_dir = str(Path(__file__).parent.parent.parent)
 sys.path.append(root_dir)
 
+from backend.services.event_dedup import EventDeduplicator
+from backend.services.posthog_pagination import iter_posthog_pages
+from backend.utils.http_client import get_http_client, HTTPStatusError
+from backend.utils.ndjson import write_records
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,6 +30,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def timestamp_to_ms(value: Any, default_ms: int) -> int:
+    """
+    Convertir un horodatage PostHog (ISO 8601, secondes ou millisecondes) en millisecondes.
+    
+    Args:
+        value: Horodatage de l'événement
+        default_ms: Valeur de repli si l'horodatage est absent ou invalide
+        
+    Returns:
+        int: Horodatage en millisecondes
+    """
+    if isinstance(value, str):
+        if not value:
+            return default_ms
+        # Chemin rapide: fromisoformat gère directement les horodatages ISO de PostHog
+        if value[-1] == "Z":
+            value = value[:-1] + "+00:00"
+        try:
+            return int(datetime.fromisoformat(value).timestamp() * 1000)
+        except ValueError:
+            return default_ms
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # Au-delà de 10^11, la valeur est déjà en millisecondes
+        return int(value) if value > 1e11 else int(value * 1000)
+    return default_ms
+
 class PostHogService:
     """
     Service pour récupérer et traiter les données de feedback depuis PostHog.
@@ -42,6 +73,10 @@ class PostHogService:
         self.api_key = api_key
         self.project_id = project_id.strip()  # S'assurer qu'il n'y a pas d'espaces
         self.base_url = base_url
+        self.page_size = int(os.getenv("POSTHOG_PAGE_SIZE", "100"))
+        
+        # Client HTTP partagé (keep-alive, timeouts et retries par défaut)
+        self.session = get_http_client()
         
         # Initialiser le client PostHog
         posthog.api_key = api_key
@@ -74,13 +109,13 @@ class PostHogService:
         if start_date is None:
             start_date = end_date - timedelta(days=30)
             
+        # Créer une liste pour stocker tous les événements récupérés
+        all_events = []
+        
         # Tentative d'utilisation de la bibliothèque officielle PostHog
         try:
             logger.info(f"Récupération des événements PostHog (événement: {event_name}, projet: {self.project_id})")
             
-            # Créer une liste pour stocker tous les événements récupérés
-            all_events = []
-            
             # Utiliser l'API de capture d'événements pour les tests
             # Cela nous permet de vérifier si l'authentification fonctionne
             posthog.capture(
@@ -93,36 +128,9 @@ class PostHogService:
             
             logger.info("Authentification PostHog réussie (événement de test envoyé)")
             
-            # Maintenant, essayons une approche alternative pour récupérer les événements
-            # Si l'API /events ne fonctionne pas avec votre clé API
-            url = f"{self.base_url}/api/projects/{self.project_id}/events"
-            if self.base_url == "https://app.posthog.com":
-                # Si c'est l'instance cloud, essayons l'export API
-                url = f"{self.base_url}/api/projects/{self.project_id}/export"
-                logger.info(f"Utilisation de l'API d'export: {url}")
-            
-            headers = {
-                "Authorization": f"Bearer {self.api_key}"
-            }
-            
-            params = {
-                "event": event_name,
-                "date_from": start_date.strftime("%Y-%m-%d"),
-                "date_to": end_date.strftime("%Y-%m-%d")
-            }
-            
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            
-            # Traiter la réponse selon son format
-            if "results" in response.json():
-                all_events = response.json()["results"]
-            else:
-                all_events = response.json()
-                
-            # Limiter le nombre d'événements si nécessaire
-            if len(all_events) > limit:
-                all_events = all_events[:limit]
+            # Parcourir toutes les pages en suivant les curseurs `next`, jusqu'à la limite
+            for page in self.iter_event_pages(event_name, start_date, end_date, limit=limit):
+                all_events.extend(page)
                 
             logger.info(f"Retrieved {len(all_events)} feedback events from PostHog")
             return all_events
@@ -131,9 +139,14 @@ class PostHogService:
             logger.error(f"Error retrieving events from PostHog: {e}")
             
             # Log plus détaillé pour le débogage
-            if isinstance(e, requests.exceptions.HTTPError) and hasattr(e, 'response'):
+            if isinstance(e, HTTPStatusError):
                 logger.error(f"Response status: {e.response.status_code}")
                 logger.error(f"Response body: {e.response.text}")
+            
+            # Les pages déjà récupérées sont de vraies données: les renvoyer plutôt que des données de test
+            if all_events:
+                logger.warning(f"Returning {len(all_events)} events fetched before the error")
+                return all_events
                 
             # Essayer une approche alternative avec la bibliothèque officielle
             try:
@@ -187,73 +200,113 @@ class PostHogService:
                 logger.error(f"L'approche alternative a également échoué: {inner_e}")
                 return []
     
-    def convert_to_amplitude_format(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def iter_event_pages(self,
+                         event_name: str,
+                         start_date: datetime,
+                         end_date: datetime,
+                         limit: Optional[int] = None,
+                         prefetch: bool = True) -> Iterator[List[Dict[str, Any]]]:
         """
-        Convertir les événements PostHog au format Amplitude attendu par notre analyseur.
+        Parcourir les événements PostHog page par page, au fur et à mesure de leur arrivée.
         
         Args:
-            events (List[Dict]): Liste des événements PostHog
+            event_name (str): Nom de l'événement à récupérer
+            start_date (datetime): Date de début pour filtrer les événements
+            end_date (datetime): Date de fin pour filtrer les événements
+            limit (int): Nombre maximum d'événements (None pour tout récupérer)
+            prefetch (bool): Précharger la page suivante pendant le traitement de la page courante
             
         Returns:
-            List[Dict]: Liste des événements au format Amplitude
+            Iterator[List[Dict]]: Itérateur sur les pages d'événements
+        """
+        # Si l'API /events ne fonctionne pas avec votre clé API, l'instance cloud expose l'export API
+        url = f"{self.base_url}/api/projects/{self.project_id}/events"
+        if self.base_url == "https://app.posthog.com":
+            url = f"{self.base_url}/api/projects/{self.project_id}/export"
+            logger.info(f"Utilisation de l'API d'export: {url}")
+        
+        headers = {
+            "Authorization": f"Bearer {self.api_key}"
+        }
+        
+        params = {
+            "event": event_name,
+            "date_from": start_date.strftime("%Y-%m-%d"),
+            "date_to": end_date.strftime("%Y-%m-%d")
+        }
+        if limit is not None:
+            params["limit"] = min(limit, self.page_size)
+        
+        return iter_posthog_pages(
+            self.session,
+            url,
+            params=params,
+            headers=headers,
+            max_items=limit,
+            prefetch=prefetch
+        )
+    
+    def iter_amplitude_format(self, events: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Convertir à la volée les événements PostHog au format Amplitude.
+        
+        Args:
+            events (Iterable[Dict]): Événements PostHog (liste, générateur...)
+            
+        Returns:
+            Iterator[Dict]: Événements au format Amplitude, produits un à un
         """
-        amplitude_events = []
+        # Heure de repli calculée une seule fois pour tout le flux
+        now_ms = int(datetime.now().timestamp() * 1000)
         
         for event in events:
             # Extraire les propriétés pertinentes
             properties = event.get("properties", {})
             
-            # Gérer les différents formats de timestamp
-            timestamp = event.get("timestamp", "")
-            if isinstance(timestamp, str) and timestamp:
-                try:
-                    # Convertir ISO timestamp en millisecondes
-                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                    time_ms = int(dt.timestamp() * 1000)
-                except Exception:
-                    # Fallback à l'heure actuelle
-                    time_ms = int(datetime.now().timestamp() * 1000)
-            else:
-                # Si c'est déjà un timestamp (en secondes ou ms)
-                time_ms = int(timestamp * 1000) if isinstance(timestamp, (int, float)) else int(datetime.now().timestamp() * 1000)
-            
             # Construire l'événement au format Amplitude
-            amplitude_event = {
+            yield {
+                "insert_id": event.get("uuid") or event.get("id"),
                 "user_id": event.get("distinct_id", "unknown"),
                 "event_type": "feedback",
-                "time": time_ms,
+                "time": timestamp_to_ms(event.get("timestamp"), now_ms),
                 "event_properties": {
                     "feedback_text": properties.get("feedback_text", ""),
                     "page": properties.get("current_url", "").split("?")[0],  # Extraire l'URL sans query params
                     "rating": properties.get("rating", 0)
                 }
             }
-            
-            amplitude_events.append(amplitude_event)
+    
+    def convert_to_amplitude_format(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Convertir les événements PostHog au format Amplitude attendu par notre analyseur.
         
+        Args:
+            events (List[Dict]): Liste des événements PostHog
+            
+        Returns:
+            List[Dict]: Liste des événements au format Amplitude
+        """
+        amplitude_events = list(self.iter_amplitude_format(events))
         logger.info(f"Converted {len(amplitude_events)} PostHog events to Amplitude format")
         return amplitude_events
     
-    def save_events(self, events: List[Dict[str, Any]], output_file: str) -> bool:
+    def save_events(self, events: Iterable[Dict[str, Any]], output_file: str) -> bool:
         """
-        Sauvegarder les événements dans un fichier JSON.
+        Sauvegarder les événements au fil de l'eau, avec remplacement atomique du fichier.
+        
+        Le format suit l'extension: NDJSON compact pour .ndjson/.jsonl, tableau JSON
+        compact pour .json, compressé avec gzip si le nom se termine par .gz.
         
         Args:
-            events (List[Dict]): Liste des événements à sauvegarder
+            events (Iterable[Dict]): Événements à sauvegarder (consommés un à un)
             output_file (str): Chemin du fichier de sortie
             
         Returns:
             bool: True si la sauvegarde a réussi, False sinon
         """
         try:
-            # Créer le répertoire si nécessaire
-            os.makedirs(os.path.dirname(output_file), exist_ok=True)
-            
-            # Sauvegarder les événements
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(events, f, ensure_ascii=False, indent=2)
-                
-            logger.info(f"Successfully saved {len(events)} events to {output_file}")
+            count = write_records(output_file, events)
+            logger.info(f"Successfully saved {count} events to {output_file}")
             return True
         except Exception as e:
             logger.error(f"Error saving events to {output_file}: {e}")
@@ -264,7 +317,8 @@ class PostHogService:
                                start_date: Optional[datetime] = None,
                                end_date: Optional[datetime] = None,
                                properties: Optional[Dict[str, Any]] = None,
-                               output_file: str = "data/posthog_data/processed/latest.json") -> str:
+                               output_file: str = "data/posthog_data/processed/latest.ndjson",
+                               deduplicator: Optional[EventDeduplicator] = None) -> str:
         """
         Récupérer les événements de feedback depuis PostHog et les sauvegarder.
         
@@ -274,6 +328,7 @@ class PostHogService:
             end_date (datetime): Date de fin pour filtrer les événements
             properties (Dict): Propriétés supplémentaires pour filtrer les événements
             output_file (str): Chemin du fichier de sortie
+            deduplicator (EventDeduplicator): Filtre des événements déjà ingérés (optionnel)
             
         Returns:
             str: Chemin du fichier de sortie ou message d'erreur
@@ -290,11 +345,28 @@ class PostHogService:
             logger.warning("No events retrieved from PostHog")
             return "No events retrieved"
         
-        # Convertir au format Amplitude
-        amplitude_events = self.convert_to_amplitude_format(events)
+        # Convertir au format Amplitude au fil de l'écriture, sans liste intermédiaire
+        amplitude_events = self.iter_amplitude_format(events)
+        
+        # Écarter les événements déjà ingérés (fenêtres qui se chevauchent, retries)
+        if deduplicator is not None:
+            amplitude_events = deduplicator.filter_events(amplitude_events)
+            first_event = next(amplitude_events, None)
+            if first_event is None:
+                deduplicator.save()
+                logger.warning("All retrieved events were duplicates")
+                return "No events retrieved"
+            amplitude_events = itertools.chain([first_event], amplitude_events)
         
         # Sauvegarder les événements
-        if self.save_events(amplitude_events, output_file):
+        saved = self.save_events(amplitude_events, output_file)
+        
+        # L'état n'est persisté que si les événements ont bien été écrits
+        if deduplicator is not None and saved:
+            deduplicator.save()
+            logger.info(f"Deduplication: {deduplicator.stats}")
+        
+        if saved:
             return output_file
         else:
             return "Error saving events"
@@ -322,7 +394,7 @@ if __name__ == "__main__":
     output_file = posthog_service.fetch_and_save_feedback(
         start_date=datetime.now() - timedelta(days=30),
         end_date=datetime.now(),
-        output_file="data/posthog_data/processed/latest.json"
+        output_file="data/posthog_data/processed/latest.ndjson"
     )
     
     print(f"Events saved to: {output_file}") 
\ No newline at end of file
@@ -0,0 +1,387 @@
+"""
+Cache disque des recommandations de design générées par le LLM.
+Une même analyse soumise pour la même page, avec la même liste de composants
+et le même modèle, produit la même requête LLM: le résultat validé est alors
+servi depuis le cache. La version des prompts fait partie de la clé, si bien
+qu'une modification d'un template invalide les entrées existantes.
+Le cache sémantique réutilise en plus les recommandations validées d'une
+analyse très proche (embeddings des résumés), par exemple entre plusieurs
+variantes d'une même page de paiement.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Optional, Tuple, Union
+
+import numpy as np
+
+from backend.utils.disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+# Durée de vie par défaut d'une entrée: 7 jours
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+
+def default_cache_directory() -> Path:
+    """Default location of the recommendations cache."""
+    return Path(os.getenv("BASE_PATH", "data")) / "cache" / "recommendations"
+
+
+def canonical_json(value: Any) -> str:
+    """Serialization independent of key order and whitespace."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def prompt_fingerprint(*templates: Any) -> str:
+    """
+    Version of a set of prompt templates, derived from their text.
+
+    Args:
+        *templates: PromptTemplate objects or template strings
+
+    Returns:
+        Short hash that changes whenever one of the templates changes
+    """
+    digest = hashlib.sha256()
+    for template in templates:
+        digest.update(getattr(template, "template", str(template)).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+class RecommendationCache:
+    """
+    Cache des recommandations, indexé par l'empreinte canonique de la requête.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, Path]] = None,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+        max_bytes: Optional[int] = 64 * 1024 * 1024
+    ):
+        """
+        Initialise le cache.
+
+        Args:
+            directory: Répertoire du cache (par défaut data/cache/recommendations)
+            ttl_seconds: Durée de vie des entrées (None pour aucune expiration)
+            max_bytes: Taille maximale du cache avant éviction LRU
+        """
+        self.store = DiskCache(directory or default_cache_directory(), max_bytes=max_bytes,
+                               ttl_seconds=ttl_seconds, compress=True)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(
+        analysis_summary: Dict[str, Any],
+        page_id: str,
+        components: List[str],
+        model: str,
+        prompt_version: str,
+        validated: bool = True
+    ) -> str:
+        """
+        Empreinte canonique d'une requête de recommandations.
+
+        Args:
+            analysis_summary: Résumé d'analyse envoyé au LLM
+            page_id: Page analysée
+            components: Liste des composants proposés au LLM
+            model: Modèle LLM utilisé
+            prompt_version: Version des templates de prompt (voir prompt_fingerprint)
+            validated: Recommandations validées ou brutes
+
+        Returns:
+            Hash SHA-256 de la requête
+        """
+        payload = canonical_json({
+            "summary": analysis_summary,
+            "page_id": page_id,
+            "components": list(components),
+            "model": model,
+            "prompt_version": prompt_version,
+            "validated": validated,
+        })
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Retourne les recommandations en cache pour une empreinte.
+
+        Returns:
+            Recommandations (lues depuis le disque à chaque appel), ou None si absentes
+        """
+        recommendations = self.store.get(f"recommendations:{fingerprint}")
+        if recommendations is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return recommendations
+
+    def put(self, fingerprint: str, recommendations: Dict[str, Any]) -> bool:
+        """
+        Met en cache des recommandations.
+
+        Returns:
+            True si les recommandations ont été mises en cache
+        """
+        try:
+            self.store.set(f"recommendations:{fingerprint}", recommendations)
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not cache recommendations {fingerprint[:12]}: {e}")
+            return False
+
+    def stats(self) -> Dict[str, int]:
+        """Hits, misses and size of the cache."""
+        return {"hits": self.hits, "misses": self.misses, "size_bytes": self.store.size_in_bytes}
+
+
+# Similarité cosinus minimale pour réutiliser un jeu de recommandations
+DEFAULT_SIMILARITY_THRESHOLD = 0.95
+
+# Champs d'un résumé d'analyse décrivant les problèmes relevés
+ISSUE_PROFILE_FIELDS = (
+    "summary", "overall_summary", "key_issues", "key_themes", "pain_points", "priority_recommendations"
+)
+
+
+def issue_profile(analysis_summary: Dict[str, Any]) -> str:
+    """
+    Texte des problèmes relevés par une analyse, base de son embedding.
+
+    Seules les valeurs des champs de ISSUE_PROFILE_FIELDS sont retenues (y
+    compris dans un résumé imbriqué): les noms de champs, compteurs et
+    métadonnées, communs à toutes les analyses, rapprocheraient des analyses
+    sans rapport. Sans aucun de ces champs, le résumé entier est utilisé.
+    """
+    lines: List[str] = []
+
+    def collect(value: Any) -> None:
+        if isinstance(value, dict):
+            for field in ISSUE_PROFILE_FIELDS:
+                if field in value:
+                    collect(value[field])
+        elif isinstance(value, list):
+            for item in value:
+                collect(item)
+        elif isinstance(value, str) and value.strip():
+            lines.append(value.strip())
+
+    collect(analysis_summary)
+    return "\n".join(lines) if lines else canonical_json(analysis_summary)
+
+
+class SemanticRecommendationCache:
+    """
+    Cache sémantique des recommandations validées.
+
+    Les résumés d'analyse sont représentés par l'embedding (normalisé) de
+    leur profil de problèmes (voir issue_profile); un nouveau résumé dont la
+    similarité cosinus avec un résumé déjà traité dépasse le seuil réutilise
+    son jeu de recommandations validées, adapté à la nouvelle page. Les entrées ne sont comparées qu'au sein d'un même
+    périmètre (modèle, version des prompts, validation), et l'index des
+    embeddings est conservé dans un fichier .npz à côté des recommandations.
+    """
+
+    def __init__(
+        self,
+        embed: Optional[Callable[[str], List[float]]] = None,
+        directory: Optional[Union[str, Path]] = None,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+        max_entries: int = 1000,
+        max_bytes: Optional[int] = 64 * 1024 * 1024
+    ):
+        """
+        Initialise le cache sémantique.
+
+        Args:
+            embed: Fonction texte -> embedding (par défaut le modèle d'embeddings OpenAI)
+            directory: Répertoire du cache (par défaut data/cache/recommendations/semantic)
+            threshold: Similarité cosinus minimale d'une réutilisation
+            ttl_seconds: Durée de vie des entrées (None pour aucune expiration)
+            max_entries: Nombre maximal d'analyses indexées (les plus anciennes sont retirées)
+            max_bytes: Taille maximale des recommandations stockées
+        """
+        self.directory = Path(directory or default_cache_directory() / "semantic")
+        self.store = DiskCache(self.directory / "sets", max_bytes=max_bytes,
+                               ttl_seconds=ttl_seconds, compress=True)
+        self._embed = embed
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index_path = self.directory / "index.npz"
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        self._entries: List[Dict[str, Any]] = []
+        self._load_index()
+
+    def _load_index(self) -> None:
+        try:
+            with np.load(self._index_path) as arrays:
+                vectors = arrays["vectors"]
+                entries = json.loads(arrays["entries"].tobytes().decode("utf-8"))
+        except (FileNotFoundError, OSError, KeyError, ValueError) as e:
+            if self._index_path.exists():
+                logger.warning(f"Ignoring unreadable semantic cache index {self._index_path}: {e}")
+            return
+        if len(entries) == len(vectors):
+            self._vectors, self._entries = vectors.astype(np.float32), entries
+
+    def _save_index(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entries = np.frombuffer(json.dumps(self._entries).encode("utf-8"), dtype=np.uint8)
+        tmp_path = self._index_path.with_suffix(".tmp.npz")
+        np.savez(tmp_path, vectors=self._vectors, entries=entries)
+        os.replace(tmp_path, self._index_path)
+
+    def embed(self, analysis_summary: Dict[str, Any]) -> Optional[np.ndarray]:
+        """
+        Embedding normalisé d'un résumé d'analyse.
+
+        Returns:
+            Vecteur de norme 1, ou None si l'embedding n'a pas pu être calculé
+        """
+        if self._embed is None:
+            from backend.models.embeddings import get_embeddings_model
+            self._embed = get_embeddings_model().embed_query
+        try:
+            vector = np.asarray(self._embed(issue_profile(analysis_summary)), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Could not embed analysis summary: {e}")
+            return None
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else None
+
+    def lookup(self, embedding: np.ndarray, scope: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Jeu de recommandations de l'analyse la plus proche, si assez similaire.
+
+        Args:
+            embedding: Embedding normalisé du résumé (voir embed)
+            scope: Périmètre de comparaison (modèle, version des prompts, validation)
+
+        Returns:
+            (entrée, similarité), ou None si aucune analyse ne dépasse le seuil
+        """
+        with self._lock:
+            now = time.time()
+            candidates = [
+                i for i, entry in enumerate(self._entries)
+                if entry["scope"] == scope
+                and (self.ttl_seconds is None or now - entry["stored_at"] <= self.ttl_seconds)
+            ]
+            if not candidates or self._vectors.shape[1] != embedding.shape[0]:
+                self.misses += 1
+                return None
+            similarities = self._vectors[candidates] @ embedding
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            entry = self._entries[candidates[best]]
+        if similarity < self.threshold:
+            self.misses += 1
+            return None
+
+        recommendations = self.store.get(f"semantic:{entry['id']}")
+        if recommendations is None:
+            # Recommandations expirées ou évincées: l'entrée de l'index est obsolète
+            self._remove(entry["id"])
+            self.misses += 1
+            return None
+        self.hits += 1
+        return {**entry, "recommendations": recommendations}, similarity
+
+    @staticmethod
+    def is_reusable(recommendations: Dict[str, Any]) -> bool:
+        """
+        True pour un jeu complet: chaque recommandation validée, sans échec de validation.
+        """
+        recs = recommendations.get("recommendations")
+        summary = recommendations.get("validation_summary")
+        if not recs or not isinstance(summary, dict) or summary.get("total_recommendations") != len(recs):
+            return False
+        return not any(
+            isinstance(rec, dict) and rec.get("validation", {}).get("failed", False)
+            for rec in recs
+        )
+
+    def add(self, embedding: np.ndarray, scope: str, page_id: str, recommendations: Dict[str, Any]) -> None:
+        """
+        Indexe un jeu de recommandations validées.
+
+        Les jeux partiels ou dont une validation a échoué ne sont pas indexés
+        (voir is_reusable).
+
+        Args:
+            embedding: Embedding normalisé du résumé d'analyse
+            scope: Périmètre de comparaison
+            page_id: Page pour laquelle les recommandations ont été générées
+            recommendations: Recommandations validées
+        """
+        if not self.is_reusable(recommendations):
+            logger.info(f"Not caching incomplete recommendation set for {page_id}")
+            return
+        entry_id = hashlib.sha256(embedding.tobytes() + scope.encode("utf-8")).hexdigest()[:24]
+        try:
+            self.store.set(f"semantic:{entry_id}", recommendations)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not cache recommendations for {page_id}: {e}")
+            return
+
+        with self._lock:
+            keep = [i for i, entry in enumerate(self._entries) if entry["id"] != entry_id]
+            keep = keep[-(self.max_entries - 1):] if self.max_entries > 1 else []
+            vectors = self._vectors[keep] if keep and self._vectors.shape[1] == embedding.shape[0] else None
+            self._entries = [self._entries[i] for i in keep] if vectors is not None else []
+            self._entries.append({"id": entry_id, "scope": scope, "page_id": page_id, "stored_at": time.time()})
+            row = embedding.astype(np.float32)[np.newaxis, :]
+            self._vectors = row if vectors is None else np.vstack([vectors, row])
+            self._save_index()
+
+    def _remove(self, entry_id: str) -> None:
+        with self._lock:
+            keep = [i for i, entry in enumerate(self._entries) if entry["id"] != entry_id]
+            self._entries = [self._entries[i] for i in keep]
+            self._vectors = self._vectors[keep]
+            self._save_index()
+
+    @staticmethod
+    def adapt(entry: Dict[str, Any], page_id: str, similarity: float) -> Dict[str, Any]:
+        """
+        Adapte un jeu de recommandations réutilisé à une nouvelle page.
+
+        Returns:
+            Recommandations avec la nouvelle page; le jeu et chaque recommandation
+            indiquent l'origine de la réutilisation
+        """
+        source = {"source_page_id": entry["page_id"], "similarity": round(similarity, 4)}
+        recommendations = dict(entry["recommendations"])
+        recommendations["page_id"] = page_id
+        recommendations["recommendations"] = [
+            {**rec, "semantic_cache": dict(source)} if isinstance(rec, dict) else rec
+            for rec in recommendations.get("recommendations", [])
+        ]
+        recommendations["semantic_cache"] = source
+        return recommendations
+
+    def stats(self) -> Dict[str, Any]:
+        """Hits, misses, hit rate and threshold of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "threshold": self.threshold,
+            "entries": len(self._entries),
+        }
@@ -0,0 +1,121 @@
+"""
+Cache disque des enregistrements de session PostHog.
+Un enregistrement ne change plus une fois la session terminée: il est alors
+servi depuis le cache au lieu d'être re-téléchargé à chaque analyse. Les
+sessions encore en cours ne sont jamais mises en cache.
+"""
+
+import os
+import logging
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional, Union
+
+from backend.utils.disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+# PostHog clôt une session après 30 minutes d'inactivité
+SESSION_INACTIVITY_TIMEOUT = timedelta(minutes=30)
+
+
+def default_cache_directory() -> Path:
+    """Default location of the recordings cache."""
+    return Path(os.getenv("BASE_PATH", "data")) / "cache" / "posthog_recordings"
+
+
+def is_session_complete(recording: Dict[str, Any], now: Optional[datetime] = None) -> bool:
+    """
+    Determine whether a recording belongs to a finished session.
+
+    Args:
+        recording: Session recording returned by PostHog
+        now: Reference time (defaults to the current UTC time)
+
+    Returns:
+        True if the session can no longer change
+    """
+    if not recording:
+        return False
+    if recording.get("ongoing") is True:
+        return False
+
+    end_time = recording.get("end_time")
+    if not isinstance(end_time, str) or not end_time:
+        # Sans heure de fin, on ne peut se fier qu'au drapeau explicite
+        return recording.get("ongoing") is False
+
+    try:
+        ended_at = datetime.fromisoformat(end_time.replace("Z", "+00:00"))
+    except ValueError:
+        return False
+    if ended_at.tzinfo is None:
+        ended_at = ended_at.replace(tzinfo=timezone.utc)
+
+    now = now or datetime.now(timezone.utc)
+    return now - ended_at > SESSION_INACTIVITY_TIMEOUT
+
+
+class SessionRecordingCache:
+    """
+    Cache des enregistrements de session terminés, indexé par projet et session.
+    """
+
+    def __init__(
+        self,
+        project_id: str,
+        directory: Optional[Union[str, Path]] = None,
+        max_bytes: Optional[int] = 512 * 1024 * 1024
+    ):
+        """
+        Initialise le cache.
+
+        Args:
+            project_id: Identifiant du projet PostHog
+            directory: Répertoire du cache (par défaut data/cache/posthog_recordings)
+            max_bytes: Taille maximale du cache avant éviction LRU
+        """
+        self.project_id = project_id
+        self.store = DiskCache(directory or default_cache_directory(), max_bytes=max_bytes, compress=True)
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, session_id: str) -> str:
+        return f"posthog:{self.project_id}:{session_id}"
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retourne l'enregistrement en cache d'une session terminée.
+
+        Args:
+            session_id: Identifiant de la session
+
+        Returns:
+            Enregistrement ou None si absent du cache
+        """
+        recording = self.store.get(self._key(session_id))
+        if recording is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return recording
+
+    def put(self, session_id: str, recording: Dict[str, Any]) -> bool:
+        """
+        Met en cache un enregistrement si la session est terminée.
+
+        Args:
+            session_id: Identifiant de la session
+            recording: Enregistrement renvoyé par PostHog
+
+        Returns:
+            True si l'enregistrement a été mis en cache
+        """
+        if not is_session_complete(recording):
+            return False
+        try:
+            self.store.set(self._key(session_id), recording)
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not cache recording {session_id}: {e}")
+            return False
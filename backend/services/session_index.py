@@ -0,0 +1,262 @@
+"""
+Index inversé page -> sessions pour le filtrage des sessions PostHog.
+Chaque session est indexée une seule fois, sous les chemins normalisés de
+toutes les pages qu'elle a visitées (et leurs préfixes), ce qui transforme
+"les sessions contenant la page X" en une recherche parmi les chemins
+distincts au lieu d'un parcours de toutes les URLs de toutes les sessions.
+"""
+
+from urllib.parse import urlsplit
+from typing import Dict, List, Any, Optional, Set, Iterator, Iterable, Sequence
+
+
+def normalize_page_path(value: str) -> str:
+    """
+    Normalize a URL, path or page id to a comparable path.
+
+    Drops scheme, host, query string, fragment and trailing slash, and adds
+    a leading slash: "https://example.com/checkout/?step=2" -> "/checkout".
+
+    Args:
+        value: URL, path or page identifier
+
+    Returns:
+        Normalized path
+    """
+    if not value:
+        return ""
+    value = value.strip()
+    if "://" in value:
+        path = urlsplit(value).path
+    else:
+        path = value.split("?", 1)[0].split("#", 1)[0]
+    path = "/" + path.strip("/")
+    return path
+
+
+def page_prefixes(path: str) -> Iterator[str]:
+    """
+    Yield a normalized path and its parent paths ("/a/b" -> "/a/b", "/a").
+
+    Indexing parents keeps a page matching its sub-pages, as the substring
+    check used before the index did.
+    """
+    if path == "/":
+        yield path
+        return
+    while path and path != "/":
+        yield path
+        path = path.rsplit("/", 1)[0]
+
+
+def iter_session_urls(session: Dict[str, Any]) -> Iterator[str]:
+    """
+    Yield every page URL referenced by a session recording.
+
+    Looks at start_url, urls, snapshots.pages, pages and each event's $current_url.
+    """
+    start_url = session.get("start_url")
+    if isinstance(start_url, str) and start_url:
+        yield start_url
+
+    urls = session.get("urls")
+    if isinstance(urls, list):
+        for url in urls:
+            if isinstance(url, str):
+                yield url
+
+    snapshots = session.get("snapshots")
+    pages = snapshots.get("pages") if isinstance(snapshots, dict) else None
+    for page_list in (pages, session.get("pages")):
+        if isinstance(page_list, list):
+            for page in page_list:
+                if isinstance(page, dict) and isinstance(page.get("url"), str):
+                    yield page["url"]
+
+    events = session.get("events")
+    if isinstance(events, list):
+        for event in events:
+            if isinstance(event, dict):
+                props = event.get("properties")
+                if isinstance(props, dict) and isinstance(props.get("$current_url"), str):
+                    yield props["$current_url"]
+
+
+def session_page_keys(session: Dict[str, Any]) -> Set[str]:
+    """Normalized paths (with parents) a session is indexed under."""
+    keys: Set[str] = set()
+    seen_paths: Set[str] = set()
+    for url in iter_session_urls(session):
+        path = normalize_page_path(url)
+        if path and path not in seen_paths:
+            seen_paths.add(path)
+            keys.update(page_prefixes(path))
+    return keys
+
+
+def page_pattern(page_id: str) -> str:
+    """
+    Fragment a normalized path must contain to match a page id.
+
+    Page ids are matched like the substring check used before the index:
+    "checkout" matches "/checkout" and "/shop/checkout". An absolute path or
+    URL keeps its leading slash, so "/checkout" still matches "/shop/checkout"
+    but not "/mycheckout".
+    """
+    path = normalize_page_path(page_id)
+    page_id = (page_id or "").strip()
+    if page_id.startswith("/") or "://" in page_id:
+        return path
+    return path.lstrip("/")
+
+
+def session_has_url_metadata(session: Dict[str, Any]) -> bool:
+    """True if the recording lists its URLs without needing the full details."""
+    return bool(session.get("start_url") or session.get("urls"))
+
+
+class SessionBatch(list):
+    """
+    Identifiants des sessions d'un lot, dans l'ordre renvoyé par l'API.
+
+    Attributes:
+        complete: True si le lot couvre toute la période demandée, sans
+            troncature ni session en échec
+    """
+
+    def __init__(self, session_ids: Iterable[str] = (), complete: bool = True):
+        super().__init__(session_ids)
+        self.complete = complete
+
+
+class PageSessionIndex:
+    """
+    Index inversé des sessions par page visitée.
+
+    L'index peut être conservé d'un lot à l'autre: une session déjà indexée
+    depuis son enregistrement définitif n'a plus besoin d'être re-téléchargée.
+    """
+
+    def __init__(self, sessions: Optional[Iterable[Dict[str, Any]]] = None,
+                 max_sessions: Optional[int] = None):
+        """
+        Initialise l'index.
+
+        Args:
+            sessions: Sessions à indexer immédiatement (optionnel)
+            max_sessions: Nombre maximum de sessions conservées, les moins
+                récemment indexées étant évincées (None: illimité)
+        """
+        self.max_sessions = max_sessions
+        self._pages: Dict[str, Set[str]] = {}
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._session_keys: Dict[str, Set[str]] = {}
+        self._order: Dict[str, int] = {}
+        self._final: Set[str] = set()
+        self._next_order = 0
+
+        for session in sessions or []:
+            self.add_session(session)
+
+    def add_session(self, session: Dict[str, Any], session_id: Optional[str] = None,
+                    final: bool = False) -> Set[str]:
+        """
+        Indexe une session (ou la remplace par une version plus détaillée).
+
+        Args:
+            session: Enregistrement de session
+            session_id: Identifiant, si absent de l'enregistrement
+            final: True si l'enregistrement est complet et ne changera plus
+
+        Returns:
+            Chemins normalisés sous lesquels la session est indexée
+        """
+        session_id = session_id or session.get("id")
+        if not session_id:
+            return set()
+
+        keys = session_page_keys(session)
+        previous = self._session_keys.get(session_id, set())
+        for key in previous - keys:
+            self._pages[key].discard(session_id)
+        for key in keys - previous:
+            self._pages.setdefault(key, set()).add(session_id)
+
+        self._session_keys[session_id] = keys
+        # Réinsérer la session la place en fin d'ordre d'éviction
+        self._sessions.pop(session_id, None)
+        self._sessions[session_id] = session
+        if session_id not in self._order:
+            self._order[session_id] = self._next_order
+            self._next_order += 1
+        if final:
+            self._final.add(session_id)
+        else:
+            self._final.discard(session_id)
+
+        if self.max_sessions is not None:
+            while len(self._sessions) > self.max_sessions:
+                self.discard(next(iter(self._sessions)))
+        return keys
+
+    def discard(self, session_id: str) -> None:
+        """Retire une session de l'index."""
+        for key in self._session_keys.pop(session_id, set()):
+            self._pages[key].discard(session_id)
+        self._sessions.pop(session_id, None)
+        self._order.pop(session_id, None)
+        self._final.discard(session_id)
+
+    def is_final(self, session_id: str) -> bool:
+        """True si la session est indexée depuis son enregistrement définitif."""
+        return session_id in self._final
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Enregistrement indexé d'une session, ou None."""
+        return self._sessions.get(session_id)
+
+    def session_ids_for_page(self, page_id: str) -> Set[str]:
+        """Identifiants des sessions ayant visité la page (ou une page la contenant)."""
+        pattern = page_pattern(page_id)
+        if not pattern:
+            return set()
+        session_ids: Set[str] = set()
+        # Les préfixes étant indexés, il suffit de parcourir les chemins distincts
+        for key, key_sessions in self._pages.items():
+            if pattern in key:
+                session_ids.update(key_sessions)
+        return session_ids
+
+    def sessions_for_page(self, page_id: str,
+                          session_ids: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Sessions ayant visité la page.
+
+        Args:
+            page_id: Page recherchée (chemin, URL ou identifiant)
+            session_ids: Limite la recherche à ces sessions, renvoyées dans cet
+                ordre (par défaut: toutes, dans l'ordre d'indexation)
+
+        Returns:
+            Liste des sessions
+        """
+        matching = self.session_ids_for_page(page_id)
+        if session_ids is not None:
+            return [self._sessions[session_id] for session_id in session_ids if session_id in matching]
+        ordered = sorted(matching, key=self._order.__getitem__)
+        return [self._sessions[session_id] for session_id in ordered]
+
+    def contains(self, session_id: str, page_id: str) -> bool:
+        """True si la session indexée a visité la page."""
+        pattern = page_pattern(page_id)
+        return bool(pattern) and any(pattern in key for key in self._session_keys.get(session_id, ()))
+
+    def pages(self) -> List[str]:
+        """Chemins indexés ayant au moins une session."""
+        return sorted(path for path, session_ids in self._pages.items() if session_ids)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
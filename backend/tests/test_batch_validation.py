@@ -0,0 +1,101 @@
+"""
+Test script for the batched validation of design recommendations.
+"""
+
+import os
+import sys
+import json
+import asyncio
+from pathlib import Path
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from models.recommendation_validator import RecommendationValidator
+
+def _validation(rec, **extra):
+    return {"recommendation_title": rec["title"], "is_feasible": True, "feasibility_score": rec["score"],
+            "issues": [], "modified_recommendation": dict(rec), **extra}
+
+class FakeBatchChain:
+    """Answers batched prompts, dropping one recommendation and mislabelling another."""
+
+    def __init__(self):
+        self.prompts = []
+
+    def invoke(self, inputs):
+        items = json.loads(inputs["recommendations"])
+        self.prompts.append([item["index"] for item in items])
+        answer = []
+        for item in items:
+            rec = item["recommendation"]
+            if rec["title"] == "rec-2":
+                continue
+            # Index erroné: la correspondance se fait par titre
+            index = 999 if rec["title"] == "rec-1" else item["index"]
+            answer.append(_validation(rec, index=index))
+        return "```json\n" + json.dumps(answer) + "\n```"
+
+    async def ainvoke(self, inputs):
+        return self.invoke(inputs)
+
+class FakeSingleChain:
+    def __init__(self):
+        self.titles = []
+
+    def invoke(self, inputs):
+        rec = json.loads(inputs["recommendation"])
+        self.titles.append(rec["title"])
+        return json.dumps(_validation(rec, issues=[{"issue_type": "ux"}]))
+
+    async def ainvoke(self, inputs):
+        return self.invoke(inputs)
+
+def _validator(**options):
+    # Le client OpenAI exige une clé, même si les chaînes sont remplacées
+    had_key = "OPENAI_API_KEY" in os.environ
+    os.environ.setdefault("OPENAI_API_KEY", "test-key")
+    try:
+        validator = RecommendationValidator(batched=True, **options)
+    finally:
+        if not had_key:
+            del os.environ["OPENAI_API_KEY"]
+    validator.batch_validation_chain = FakeBatchChain()
+    validator.validation_chain = FakeSingleChain()
+    return validator
+
+RECS = [
+    {"title": f"rec-{i}", "description": "Make the button larger", "component": "Button",
+     "location": "Footer", "priority": "medium", "score": 60 + i}
+    for i in range(5)
+]
+
+def test_batched_results_matched_back():
+    """One prompt validates the set; missing items fall back to a single prompt."""
+    validator = _validator()
+    results = validator.validate_recommendations_batch(RECS)
+
+    assert validator.batch_validation_chain.prompts == [[0, 1, 2, 3, 4]]
+    assert validator.validation_chain.titles == ["rec-2"]
+    assert [r["recommendation_title"] for r in results] == [rec["title"] for rec in RECS]
+    assert results[2]["issues"] == [{"issue_type": "ux"}]
+
+def test_token_budget_splits_prompts():
+    validator = _validator(batch_token_budget=40)
+    validator.validate_all_recommendations({"recommendations": RECS})
+    prompts = validator.batch_validation_chain.prompts
+    assert len(prompts) > 1 and sorted(i for prompt in prompts for i in prompt) == list(range(5))
+
+def test_async_batched_validation():
+    validator = _validator()
+    result = asyncio.run(validator.avalidate_all_recommendations({"recommendations": RECS}))
+    assert result["validation_summary"]["total_recommendations"] == 5
+    assert result["validation_summary"]["needs_modification_count"] == 1
+
+if __name__ == "__main__":
+    test_batched_results_matched_back()
+    test_token_budget_splits_prompts()
+    test_async_batched_validation()
+    print("✅ All batched validation tests passed")
@@ -0,0 +1,65 @@
+"""
+Test script for the single-pass session behavior engine.
+"""
+
+import sys
+from pathlib import Path
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from backend.services.behavior import SessionBehaviorEngine, BehaviorReport, analyze_sessions
+
+def _event(event_type, second, **props):
+    return {"type": event_type, "timestamp": f"2024-05-01T10:00:{second:02d}Z", "properties": props}
+
+def _session():
+    return {"events": [
+        _event("$pageview", 0, pathname="/cart"),
+        _event("$scroll", 2, scrollY=300),
+        _event("$scroll", 3, scrollY=-100),
+        _event("$pageview", 10, pathname="/checkout"),
+        # Trois clics en moins d'une seconde: une rafale de rage clicks
+        _event("$click", 11, element="button.pay", positionX=900, positionY=600),
+        _event("$click", 11, element="button.pay", positionX=905, positionY=602),
+        _event("$click", 12, element="button.pay", positionX=903, positionY=598),
+        _event("$click", 20, element="button.pay", positionX=903, positionY=598),
+        _event("$pageview", 30, pathname="/cart"),
+        _event("$click", 40, element="a.back", positionX=20, positionY=30),
+    ]}
+
+def test_single_pass_metrics():
+    """All metrics come out of one pass over the events."""
+    report = analyze_sessions(iter([_session(), {"events": []}]))
+
+    assert report.sessions == 2 and report.events == 10
+    assert report.rage_clicks == {"button.pay": [1, 1]}
+    assert report.navigation_loops == {"/cart": [1, 1]}
+    assert report.dwell_time["/cart"] == [20_000, 2]
+    assert report.dwell_time["/checkout"] == [20_000, 1]
+    assert report.scroll_depth["/cart"] == [300, 2]
+    assert report.heatmap.total_clicks == 5
+    assert report.heatmap.element_counts == {"button.pay": 4, "a.back": 1}
+
+    areas = report.confusion_areas()
+    assert [(a["area"], a["type"]) for a in areas] == [("/cart", "navigation_loop"), ("button.pay", "repeated_clicks")]
+    assert areas[1]["score"] == 4 / 3
+
+def test_reports_merge_exactly():
+    """Reports of separate batches merge into the report of all sessions."""
+    sessions = [_session() for _ in range(3)]
+    whole = analyze_sessions(sessions)
+
+    merged = BehaviorReport()
+    for session in sessions:
+        engine = SessionBehaviorEngine()
+        merged.merge(engine.consume([session]))
+
+    assert merged.to_dict() == whole.to_dict()
+
+if __name__ == "__main__":
+    test_single_pass_metrics()
+    test_reports_merge_exactly()
+    print("✅ All behavior engine tests passed")
@@ -0,0 +1,76 @@
+"""
+Test script for the process-pool behavior analysis.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from backend.services.behavior import analyze_sessions, analyze_sessions_parallel, BehaviorRollupStore, EventBatch
+from backend.services.behavior.engine import SessionBehaviorEngine
+from backend.services.behavior.parallel import iter_event_batches
+
+def _session(index):
+    page = f"/page-{index % 4}"
+    return {"events": [
+        {"type": "$pageview", "timestamp": 1714557600000 + index, "properties": {"pathname": page}},
+        {"type": "$scroll", "timestamp": 1714557601000 + index, "properties": {"scrollY": 120 + index}},
+        {"type": "$pageview", "timestamp": 1714557605000 + index, "properties": {"pathname": "/cart"}},
+        {"type": "$pageview", "timestamp": 1714557609000 + index, "properties": {"pathname": page}},
+    ] + [
+        {"type": "$click", "timestamp": 1714557610000 + index + i * 100,
+         "properties": {"element": f"button.b{index % 3}", "positionX": 10 * i + index, "positionY": 20 * i}}
+        for i in range(index % 5)
+    ]}
+
+def test_parallel_matches_serial():
+    """Sharded analysis on a process pool gives the serial report."""
+    sessions = [_session(i) for i in range(60)]
+    serial = analyze_sessions(sessions)
+    parallel = analyze_sessions_parallel(iter(sessions), workers=2, shard_size=7, min_sessions=1)
+
+    assert parallel.sessions == 60
+    assert parallel.to_dict() == serial.to_dict()
+
+def test_small_sets_stay_serial():
+    """Below min_sessions the serial engine is used, with the same result."""
+    sessions = [_session(i) for i in range(5)]
+    report = analyze_sessions_parallel(sessions, workers=4, min_sessions=100)
+    assert report.to_dict() == analyze_sessions(sessions).to_dict()
+
+def test_sessions_reach_the_engine_as_event_batches():
+    """Fetched sessions are converted to columnar batches before the engine and the workers."""
+    sessions = [{**_session(i), "id": f"s{i}", "start_time": "2024-05-01T10:00:00Z"} for i in range(30)]
+    expected = analyze_sessions(sessions).to_dict()
+
+    batches = list(iter_event_batches(iter(sessions), 8))
+    assert all(isinstance(batch, EventBatch) for batch in batches)
+    assert [batch.session_count for batch in batches] == [8, 8, 8, 6]
+
+    def dict_path(self, session):
+        raise AssertionError("session consumed as a dict")
+
+    consume_session = SessionBehaviorEngine.consume_session
+    SessionBehaviorEngine.consume_session = dict_path
+    try:
+        serial = analyze_sessions_parallel(sessions, workers=1, shard_size=8)
+        parallel = analyze_sessions_parallel(sessions, workers=2, shard_size=8, min_sessions=1)
+        assert serial.to_dict() == parallel.to_dict() == expected
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = BehaviorRollupStore(tmp_dir)
+            store.ingest(sessions, pages=["/cart"])
+            report, _ = store.query("/cart", "2024-05-01", "2024-05-01", include_partial=True)
+            assert report.to_dict() == expected
+    finally:
+        SessionBehaviorEngine.consume_session = consume_session
+
+if __name__ == "__main__":
+    test_parallel_matches_serial()
+    test_small_sets_stay_serial()
+    test_sessions_reach_the_engine_as_event_batches()
+    print("✅ All parallel behavior tests passed")
@@ -0,0 +1,127 @@
+"""
+Test script for the daily per-page behavior rollups.
+"""
+
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from backend.services.behavior import BehaviorRollupStore, analyze_sessions, covered_days
+from backend.services.behavior.rollups import encode_report
+from models.design_recommendations import PostHogClient
+
+def _session(session_id, day, clicks=3):
+    events = [
+        {"type": "$pageview", "timestamp": f"2024-05-{day:02d}T10:00:00Z", "properties": {"pathname": "/checkout"}},
+        {"type": "$pageview", "timestamp": f"2024-05-{day:02d}T10:00:40Z", "properties": {"pathname": "/cart"}},
+    ]
+    events += [
+        {"type": "$click", "timestamp": f"2024-05-{day:02d}T10:00:41Z",
+         "properties": {"element": "button.pay", "positionX": 900 + i, "positionY": 600}}
+        for i in range(clicks)
+    ]
+    return {"id": session_id, "start_time": f"2024-05-{day:02d}T10:00:00Z", "events": events}
+
+class FakeProvider:
+    """Provider returning fixed sessions, flagged exhaustive or not."""
+
+    def __init__(self, sessions, complete=True, error=None):
+        self.sessions = sessions
+        self.complete = complete
+        self.error = error
+
+    def fetch_sessions(self, page_id, date_from=None, date_to=None):
+        if self.error:
+            raise self.error
+        return self.sessions, self.complete
+
+class FakePostHogClient(PostHogClient):
+    def __init__(self, provider, rollup_store):
+        self.provider = provider
+        self.rollups = rollup_store
+
+def test_query_sums_daily_rollups():
+    """A date-range query gives the report of the raw sessions of that range."""
+    sessions = [_session("a", 1), _session("b", 1, clicks=1), _session("c", 2), _session("d", 3)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BehaviorRollupStore(tmp_dir)
+        store.ingest(sessions, days=[date(2024, 5, 1), date(2024, 5, 2), date(2024, 5, 3)])
+
+        report, missing = store.query("/checkout", "2024-05-01", "2024-05-02")
+        assert missing == []
+        assert report.to_dict() == analyze_sessions(sessions[:3]).to_dict()
+        assert report.dwell_histogram["/checkout"] == [0, 0, 0, 3, 0, 0, 0, 0]
+
+def test_incremental_ingestion_and_missing_days():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BehaviorRollupStore(tmp_dir)
+        store.ingest([_session("a", 1)], pages=["/checkout"], days=["2024-05-01"])
+        # Une session déjà ingérée n'est pas comptée deux fois
+        store.ingest([_session("a", 1), _session("b", 1)], pages=["/checkout"])
+
+        report, missing = store.query("https://shop.example/checkout/", "2024-05-01", "2024-05-03")
+        assert report.sessions == 2
+        assert missing == [date(2024, 5, 2), date(2024, 5, 3)]
+
+        # Un jour sans session, une fois couvert, n'est plus manquant
+        store.ingest([], pages=["/checkout"], days=["2024-05-02"])
+        assert store.query("/checkout", "2024-05-01", "2024-05-03")[1] == [date(2024, 5, 3)]
+
+def test_covered_days():
+    """Only the days entirely inside the period are covered."""
+    assert covered_days("2024-05-01T00:00:00", "2024-05-03T00:00:00") == [date(2024, 5, 1), date(2024, 5, 2)]
+    assert covered_days("2024-05-01T10:00:00Z", "2024-05-03T12:00:00+00:00") == [date(2024, 5, 2)]
+    assert covered_days("2024-05-01T00:00:00", "2024-05-01T23:00:00") == []
+
+def test_seen_sessions_survive_reload_and_legacy_lists():
+    """Ingested ids are kept in the stored Bloom filter, and old id lists are still honoured."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BehaviorRollupStore(tmp_dir)
+        store.ingest([_session("a", 1)], pages=["/checkout"])
+        store.ingest([_session("a", 1), _session("b", 1)], pages=["/checkout"])
+        report, meta = store.load("/checkout", "2024-05-01")
+        assert report.sessions == 2 and "session_ids" not in meta
+
+        # Agrégat écrit avec une liste d'identifiants
+        report, _, _ = store._read("/checkout", date(2024, 5, 1))
+        path = store._path("/checkout", date(2024, 5, 1))
+        np.savez_compressed(path, **encode_report(report, session_ids=["a", "b"], complete=False))
+        store.ingest([_session("b", 1), _session("c", 1)], pages=["/checkout"])
+        assert store.load("/checkout", "2024-05-01")[0].sessions == 3
+
+def test_days_are_complete_only_after_exhaustive_fetch():
+    """Truncated or failed fetches fold their sessions in without completing the days."""
+    period = ("2024-05-01T00:00:00", "2024-05-03T00:00:00")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = BehaviorRollupStore(tmp_dir)
+
+        truncated = FakePostHogClient(FakeProvider([_session("a", 1)], complete=False), store)
+        truncated.fetch_sessions_for_page("/checkout", *period)
+        report, missing = store.query("/checkout", "2024-05-01", "2024-05-02")
+        assert missing == [date(2024, 5, 1), date(2024, 5, 2)]
+        assert store.query("/checkout", "2024-05-01", "2024-05-02", include_partial=True)[0].sessions == 1
+
+        failing = FakePostHogClient(FakeProvider([], error=RuntimeError("API down")), store)
+        assert failing.fetch_sessions_for_page("/checkout", *period) == ([], False)
+        assert store.query("/checkout", "2024-05-01", "2024-05-02")[1] == missing
+
+        client = FakePostHogClient(FakeProvider([_session("a", 1), _session("b", 2)]), store)
+        client.fetch_sessions_for_page("/checkout", *period)
+        report, missing = store.query("/checkout", "2024-05-01", "2024-05-02")
+        assert missing == [] and report.sessions == 2
+
+if __name__ == "__main__":
+    test_query_sums_daily_rollups()
+    test_incremental_ingestion_and_missing_days()
+    test_covered_days()
+    test_seen_sessions_survive_reload_and_legacy_lists()
+    test_days_are_complete_only_after_exhaustive_fetch()
+    print("✅ All behavior rollup tests passed")
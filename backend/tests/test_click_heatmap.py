@@ -0,0 +1,65 @@
+"""
+Test script for the binned click heatmap.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from backend.services.behavior import ClickHeatmap
+
+def _session(clicks):
+    return {"events": [
+        {"type": "$click", "properties": {"element": element, "positionX": x, "positionY": y}}
+        for element, x, y in clicks
+    ] + [{"type": "$pageview", "properties": {"pathname": "/checkout"}}]}
+
+def test_bins_clicks_and_counts_elements():
+    """Clicks land in their cell, out-of-viewport clicks in the edge cell."""
+    heatmap = ClickHeatmap.from_sessions(
+        [_session([("button.submit", 5, 5), ("button.submit", 15, 8), ("a.help", 5000, -20)])],
+        viewport=(100, 100), bins=(10, 10)
+    )
+
+    assert heatmap.total_clicks == 3
+    assert heatmap.counts[0, 0] == 1 and heatmap.counts[0, 1] == 1 and heatmap.counts[0, 9] == 1
+    assert heatmap.element_counts == {"button.submit": 2, "a.help": 1}
+
+def test_merge_equals_single_pass():
+    """Merging per-day heatmaps gives the heatmap of all clicks at once."""
+    rng = np.random.default_rng(7)
+    xs, ys = rng.uniform(0, 1920, 200_000), rng.uniform(0, 1080, 200_000)
+
+    merged = ClickHeatmap()
+    for day in range(4):
+        part = ClickHeatmap()
+        part.add_clicks(xs[day::4], ys[day::4])
+        merged += part
+
+    whole = ClickHeatmap()
+    whole.add_clicks(xs, ys)
+    assert np.array_equal(merged.counts, whole.counts)
+    assert merged.total_clicks == 200_000
+    assert merged.nbytes < 8 * 1024
+
+def test_dict_round_trip():
+    """The JSON representation rebuilds an identical heatmap."""
+    heatmap = ClickHeatmap.from_sessions([_session([("nav", 300, 40)] * 6)])
+    data = heatmap.to_dict()
+
+    assert data["elements"] == {"nav": 6}
+    assert data["hotspots"][0]["clicks"] == 6
+    rebuilt = ClickHeatmap.from_dict(data)
+    assert np.array_equal(rebuilt.counts, heatmap.counts)
+
+if __name__ == "__main__":
+    test_bins_clicks_and_counts_elements()
+    test_merge_equals_single_pass()
+    test_dict_round_trip()
+    print("✅ All click heatmap tests passed")
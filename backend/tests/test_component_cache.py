@@ -0,0 +1,96 @@
+"""
+Test script for the cache and deduplication of generated Figma components.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+from pathlib import Path
+
+import httpx
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from backend.services.component_cache import ComponentCache
+from backend.utils.http_client import HTTPClient, RetryPolicy, HostLatencyMetrics
+from models.code_to_design import CodeToDesignClient
+
+class CountingCodeToDesignClient(CodeToDesignClient):
+    """Client counting the API calls; specs named "broken" fail."""
+
+    def __init__(self, cache):
+        super().__init__(api_key="test-key", cache=cache)
+        self.posted = []
+        self.lock = threading.Lock()
+
+    def _post_component(self, component_spec):
+        with self.lock:
+            self.posted.append(component_spec["name"])
+        time.sleep(0.02)
+        if component_spec["name"] == "broken":
+            return {"error": "500 Server Error"}
+        return {"figma_url": f"https://figma.test/{component_spec['name']}"}
+
+def _recommendations(page_id, titles):
+    return {"page_id": page_id, "recommendations": [
+        {"title": title, "component": "Button", "priority": "high",
+         "description": "Enlarge the button", "before_after": {"before": "Small", "after": "Large"}}
+        for title in titles
+    ]}
+
+def test_fingerprint_ignores_key_order():
+    spec = {"name": "Pay", "style": {"priority": "high", "size": "L"}}
+    reordered = {"style": {"size": "L", "priority": "high"}, "name": "Pay"}
+    assert ComponentCache.fingerprint(spec) == ComponentCache.fingerprint(reordered)
+    assert ComponentCache.fingerprint(spec) != ComponentCache.fingerprint(spec, "https://other.api")
+
+def test_identical_specs_are_generated_once():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        client = CountingCodeToDesignClient(ComponentCache(tmp_dir))
+
+        result = client.transform_recommendations_to_components(
+            _recommendations("/checkout", ["Pay", "Pay", "Cancel", "Pay", "broken"]))
+        assert sorted(client.posted) == ["Cancel", "Pay", "broken"]
+        assert [c["status"] for c in result["components"]] == ["generated"] * 4 + ["failed"]
+
+        # Autre page, mêmes spécifications: servies depuis le cache, sauf l'erreur
+        client.posted.clear()
+        client.transform_recommendations_to_components(_recommendations("/cart", ["Cancel", "Pay", "broken"]))
+        assert client.posted == ["broken"]
+        assert client.cache.stats()["hits"] == 2
+
+def test_cache_entries_expire():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        client = CountingCodeToDesignClient(ComponentCache(tmp_dir, ttl_seconds=0.05))
+        client.transform_recommendations_to_components(_recommendations("/checkout", ["Pay"]))
+        time.sleep(0.1)
+        client.transform_recommendations_to_components(_recommendations("/checkout", ["Pay"]))
+        assert client.posted == ["Pay", "Pay"]
+
+def test_invalid_json_response_is_an_error():
+    """A 200 response whose body is not JSON is reported as an error, not raised or cached."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ComponentCache(tmp_dir)
+        client = CodeToDesignClient(api_key="test-key", cache=cache)
+        client.http = HTTPClient(
+            retry=RetryPolicy(max_retries=0),
+            metrics=HostLatencyMetrics(),
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, text="<html>maintenance</html>"))
+        )
+
+        component = client.generate_component({"name": "Pay"})
+
+        assert "error" in component
+        assert cache.get(cache.fingerprint({"name": "Pay"}, client.api_url)) is None
+
+if __name__ == "__main__":
+    test_fingerprint_ignores_key_order()
+    test_identical_specs_are_generated_once()
+    test_cache_entries_expire()
+    test_invalid_json_response_is_an_error()
+    print("✅ All component cache tests passed")
@@ -0,0 +1,99 @@
+"""
+Test script for the concurrent generation of Figma components.
+"""
+
+import os
+import sys
+import time
+import threading
+from pathlib import Path
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from models.code_to_design import CodeToDesignClient, FigmaLayoutGenerator
+
+class FakeCodeToDesignClient(CodeToDesignClient):
+    """Client answering after a delay; "slow*" never answers in time, "broken" raises."""
+
+    def __init__(self, **kwargs):
+        super().__init__(api_key="test-key", cache=False, **kwargs)
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def generate_component(self, component_spec):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            if component_spec["name"] == "broken":
+                raise RuntimeError("connection reset")
+            time.sleep(1.0 if component_spec["name"].startswith("slow") else 0.05)
+            return {"figma_url": f"https://figma.test/{component_spec['name']}", "component_id": component_spec["name"]}
+        finally:
+            with self.lock:
+                self.active -= 1
+
+def _recommendations(titles):
+    priorities = ["low", "high", "medium"]
+    return {"page_id": "/checkout", "recommendations": [
+        {"title": title, "component": "Button", "priority": priorities[i % 3]}
+        for i, title in enumerate(titles)
+    ]}
+
+def test_components_are_generated_concurrently_in_order():
+    client = FakeCodeToDesignClient(max_concurrency=3)
+    titles = [f"c{i}" for i in range(6)]
+    start = time.perf_counter()
+    result = client.transform_recommendations_to_components(_recommendations(titles))
+    elapsed = time.perf_counter() - start
+
+    assert [c["recommendation_title"] for c in result["components"]] == titles
+    assert client.peak == 3 and elapsed < 0.25
+    assert result["failed_count"] == 0
+
+def test_failures_and_timeouts_are_marked():
+    client = FakeCodeToDesignClient(max_concurrency=4, call_timeout=0.2)
+    start = time.perf_counter()
+    result = client.transform_recommendations_to_components(_recommendations(["ok", "slow", "broken", "fine"]))
+    elapsed = time.perf_counter() - start
+
+    status = {c["recommendation_title"]: c["status"] for c in result["components"]}
+    assert status == {"ok": "generated", "slow": "failed", "broken": "failed", "fine": "generated"}
+    assert "Timed out" in result["components"][1]["component_result"]["error"]
+    assert result["failed_count"] == 2 and elapsed < 0.8
+
+    # L'ordre par priorité du layout est conservé
+    layout = FigmaLayoutGenerator._aggregate_components_to_layout(result)
+    assert [s["components"] for s in layout["layout"]["sections"]] == [["slow"], ["broken"], ["ok", "fine"]]
+
+def test_calls_share_one_bounded_pool():
+    client = FakeCodeToDesignClient(max_concurrency=2, call_timeout=0.2)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.extend(client.generate_components(
+            [{"name": f"c{i}"}, {"name": f"d{i}"}])))
+        for i in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert client.peak == 2 and len(results) == 6
+
+    # Pool occupé par des appels expirés: les appels suivants échouent au lieu de bloquer
+    expired = client.generate_components([{"name": "slow"}, {"name": "slow-2"}])
+    assert all("Timed out" in result["error"] for result in expired)
+    start = time.perf_counter()
+    queued = client.generate_components([{"name": "c0"}])
+    assert "Not started" in queued[0]["error"] and time.perf_counter() - start < 0.5
+    client.close()
+
+if __name__ == "__main__":
+    test_components_are_generated_concurrently_in_order()
+    test_failures_and_timeouts_are_marked()
+    test_calls_share_one_bounded_pool()
+    print("✅ All component generation tests passed")
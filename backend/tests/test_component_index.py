@@ -0,0 +1,63 @@
+"""
+Test script for the normalized component index.
+"""
+
+import sys
+from pathlib import Path
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from models.component_index import ComponentIndex, component_tokens, normalize_component_name
+from models.recommendation_rules import SUPPORTED_COMPONENTS, SUPPORTED_COMPONENT_INDEX, check_component_support
+from models.code_to_design import CodeToDesignClient
+
+def test_normalization():
+    assert component_tokens("RadioButton") == ["radio", "button"]
+    assert component_tokens("search-bar input") == ["search", "bar", "input"]
+    assert normalize_component_name("Text Field") == normalize_component_name("TextField") == "textfield"
+
+def test_exact_lookup_and_aliases():
+    index = ComponentIndex(["Input", "Navbar"], aliases={"TextField": "Input"})
+    assert index.lookup("navbar") == "Navbar"
+    assert index.lookup("text-field") == "Input"
+    assert "text field" in index and "INPUT" in index
+    assert "textfields" not in index
+    assert index.lookup("Carousel") is None
+
+def test_ranked_alternatives():
+    assert check_component_support("date picker") == (True, [])
+    assert check_component_support("Radio") == (False, ["RadioButton"])
+    assert check_component_support("dropdownmenu")[1][:2] == ["Dropdown", "Menu"]
+    assert check_component_support("progressbar")[1][0] == "Progress"
+    # Aucun composant proche: liste de repli par mot-clé
+    assert check_component_support("input") == (False, ["TextField", "Dropdown", "Checkbox"])
+    assert check_component_support("HologramPanel")[1] == ["Container", "Card", "Layout"]
+
+def test_resolve_requires_close_match():
+    assert SUPPORTED_COMPONENT_INDEX.resolve("Tooltips") == "Tooltip"
+    assert SUPPORTED_COMPONENT_INDEX.resolve("Hologram") is None
+
+def test_code_to_design_mapping_of_supported_components():
+    expected = {
+        "Button": "button", "TextField": "input", "Dropdown": "dropdown",
+        "Checkbox": "checkbox", "RadioButton": "radio", "Toggle": "toggle",
+        "Form": "form", "Card": "card", "Modal": "modal", "Navigation": "navigation",
+        "Menu": "menu", "Table": "table", "List": "list", "SearchBar": "input"
+    }
+    client = CodeToDesignClient(api_key="test-key", cache=False)
+    for component in SUPPORTED_COMPONENTS:
+        assert client._map_component_type(component) == expected.get(component, "generic"), component
+    # Un nom seulement proche n'est pas assimilé à un autre type
+    assert client._map_component_type("Formula") == "generic"
+    assert client._map_component_type("tab") == "generic"
+
+if __name__ == "__main__":
+    test_normalization()
+    test_exact_lookup_and_aliases()
+    test_ranked_alternatives()
+    test_resolve_requires_close_match()
+    test_code_to_design_mapping_of_supported_components()
+    print("✅ All component index tests passed")
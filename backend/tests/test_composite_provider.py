@@ -0,0 +1,86 @@
+"""
+Test script for the concurrent multi-provider fan-out.
+"""
+
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from backend.models.analytics_providers import AnalyticsProvider, CompositeAnalyticsProvider
+
+class SlowProvider(AnalyticsProvider):
+    """Blocking provider answering after `delay` seconds."""
+
+    def __init__(self, events, delay=0.2, fail=False):
+        self.events = events
+        self.delay = delay
+        self.fail = fail
+
+    def get_sessions(self, page_id, date_from=None, date_to=None, limit=100):
+        return []
+
+    def get_events(self, event_name, page_id=None, date_from=None, date_to=None, limit=100):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("source unavailable")
+        return self.events[:limit]
+
+    def get_user_feedback(self, page_id=None, date_from=None, date_to=None):
+        return []
+
+    def get_session_recordings(self, session_id):
+        return {}
+
+def _composite():
+    return CompositeAnalyticsProvider({
+        "posthog": SlowProvider([{"id": "p1", "timestamp": "2024-05-02T10:00:00"}]),
+        "amplitude": SlowProvider([{"id": "a1", "timestamp": "2024-05-01T10:00:00"}, {"id": "a2"}]),
+        "mixpanel": SlowProvider([], fail=True),
+    })
+
+def test_async_fan_out_is_concurrent_and_merged():
+    """Sources are queried concurrently, tagged, sorted by time and failures are skipped."""
+    start = time.perf_counter()
+    events = asyncio.run(_composite().aget_events("$pageview", page_id="/checkout"))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5
+    assert [(e["source"], e["id"]) for e in events] == [("amplitude", "a1"), ("posthog", "p1"), ("amplitude", "a2")]
+
+def test_sync_fan_out_matches_async():
+    """The blocking API returns the same merged stream, limited as a whole."""
+    composite = _composite()
+    assert composite.get_events("$pageview", limit=2) == [
+        {"id": "a1", "timestamp": "2024-05-01T10:00:00", "source": "amplitude"},
+        {"id": "p1", "timestamp": "2024-05-02T10:00:00", "source": "posthog"},
+    ]
+
+def test_merge_normalizes_timestamps():
+    """ISO strings, Amplitude event_time and epoch `time` values sort on one time axis."""
+    composite = CompositeAnalyticsProvider({
+        "posthog": SlowProvider([
+            {"id": "p1", "timestamp": "2024-05-01T12:00:00+00:00"},
+            {"id": "p2", "timestamp": "2024-05-01T09:00:00Z"},
+        ], delay=0),
+        "amplitude": SlowProvider([
+            {"id": "a1", "event_time": "2024-05-01 10:00:00.000000+00:00"},
+            {"id": "a2", "time": 1714561200000},
+            {"id": "a3", "time": 1714550400},
+        ], delay=0),
+    })
+
+    events = composite.get_events("$pageview")
+    assert [e["id"] for e in events] == ["a3", "p2", "a1", "a2", "p1"]
+    assert [e["id"] for e in composite.get_events("$pageview", limit=3)] == ["a3", "p2", "a1"]
+
+if __name__ == "__main__":
+    test_async_fan_out_is_concurrent_and_merged()
+    test_sync_fan_out_matches_async()
+    test_merge_normalizes_timestamps()
+    print("✅ All composite provider tests passed")
@@ -0,0 +1,87 @@
+"""
+Test script for the columnar event batch and its behavior engines.
+"""
+
+import sys
+from pathlib import Path
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from backend.services.behavior import EventBatch, NavigationTrie, analyze_sessions
+
+def _session(index):
+    page = f"/page-{index % 3}"
+    events = [
+        {"type": "$pageview", "timestamp": 1714557600000 + index, "properties": {"pathname": page}},
+        {"type": "$scroll", "timestamp": 1714557601000 + index, "properties": {"scrollY": 150}},
+        {"type": "$scroll", "timestamp": 1714557602000 + index, "properties": {"$scroll_depth": 90}},
+        {"type": "$pageview", "timestamp": 1714557605000 + index, "properties": {"pathname": "/cart"}},
+        {"type": "$pageview", "timestamp": 1714557609000 + index, "properties": {"pathname": page}},
+        {"type": "$autocapture", "timestamp": 1714557609500 + index, "properties": {}},
+        {"type": "$click", "timestamp": 1714557609600 + index, "properties": {"element": "a.nolink"}},
+    ]
+    events += [
+        {"type": "$click", "timestamp": 1714557610000 + index + i * 100,
+         "properties": {"element": f"button.b{index % 2}", "positionX": 15 * i + index, "positionY": 30 * i}}
+        for i in range(index % 5)
+    ]
+    return {"id": f"s{index}", "events": events}
+
+def test_batch_matches_dict_sessions():
+    """Engines fed with a batch give the report of the raw sessions."""
+    sessions = [_session(i) for i in range(20)]
+    batch = EventBatch.from_sessions(sessions)
+
+    assert batch.session_count == 20 and len(batch) == sum(len(s["events"]) for s in sessions)
+    assert batch.elements[:2] == ["a.nolink", "button.b1"]
+    assert analyze_sessions(batch).to_dict() == analyze_sessions(sessions).to_dict()
+
+    trie = NavigationTrie()
+    trie.add_batch(batch)
+    assert trie.to_dict() == analyze_sessions(sessions).paths.to_dict()
+
+def test_batch_edge_sessions_match_dict_sessions():
+    """Sessions ending on an unused event, without events or without timestamps give the same report."""
+    sessions = [
+        {"id": "tail", "events": [
+            {"type": "$pageview", "timestamp": 1714557600000, "properties": {"pathname": "/checkout"}},
+            {"type": "$autocapture", "timestamp": 1714557640000, "properties": {}},
+        ]},
+        {"id": "empty", "events": []},
+        {"id": "untimed", "events": [
+            {"type": "$pageview", "properties": {"pathname": "/cart"}},
+            {"type": "$click", "properties": {"element": "button.pay"}},
+        ]},
+        _session(3),
+    ]
+    batch = EventBatch.from_sessions(sessions)
+
+    assert analyze_sessions(batch).to_dict() == analyze_sessions(sessions).to_dict()
+    assert analyze_sessions(batch).dwell_time["/checkout"] == [40000, 1]
+
+def test_amplitude_events():
+    """Amplitude exports are grouped by session and ordered by time."""
+    events = [
+        {"session_id": 7, "event_type": "[Amplitude] Element Clicked", "event_time": "2024-05-01 10:00:03.000000",
+         "event_properties": {"[Amplitude] Element Selector": "button.pay", "x": 10, "y": 20}},
+        {"session_id": 7, "event_type": "[Amplitude] Page Viewed", "event_time": "2024-05-01 10:00:00.000000",
+         "event_properties": {"[Amplitude] Page Path": "/checkout"}},
+        {"session_id": -1, "user_id": "u1", "event_type": "custom", "time": 1714557600000},
+    ]
+    batch = EventBatch.from_amplitude_events(events)
+
+    assert batch.session_ids == ["7", "user:u1"]
+    assert batch.pages == ["/checkout"] and batch.elements == ["button.pay"]
+    assert batch.timestamp[0] == 1714557600.0
+    report = analyze_sessions(batch)
+    assert report.heatmap.total_clicks == 1
+    assert report.dwell_time == {"/checkout": [3000, 1]}
+
+if __name__ == "__main__":
+    test_batch_matches_dict_sessions()
+    test_batch_edge_sessions_match_dict_sessions()
+    test_amplitude_events()
+    print("✅ All event batch tests passed")
@@ -0,0 +1,96 @@
+"""
+Test script for event deduplication during ingestion.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from backend.utils.bloom_filter import ScalableBloomFilter
+from backend.services.event_dedup import EventDeduplicator, event_key
+from backend.services.amplitude.data_processor import process_raw_file, ingest_raw_file
+from backend.utils.ndjson import write_records, load_records
+
+def test_scalable_bloom_filter_growth():
+    """The filter grows past its initial capacity without losing keys."""
+    bloom = ScalableBloomFilter(initial_capacity=100, error_rate=0.01)
+
+    added = sum(1 for i in range(1000) if bloom.add(f"event-{i}"))
+
+    # Aucun faux négatif, quelques faux positifs tolérés
+    assert added >= 980
+    assert len(bloom.filters) > 1
+    assert all(f"event-{i}" in bloom for i in range(1000))
+    assert not bloom.add("event-42")
+
+    # Le taux de faux positifs reste sous la borne configurée
+    false_positives = sum(1 for i in range(5000) if f"other-{i}" in bloom)
+    assert false_positives / 5000 < 0.02
+
+def test_event_key_prefers_ids():
+    """Insert ids win over content hashes, identical content hashes identically."""
+    assert event_key({"$insert_id": "abc", "time": 1}) == "id:abc"
+    assert event_key({"uuid": "u-1", "id": "ignored"}) == "id:u-1"
+
+    first = {"user_id": "user_1", "time": 1000, "event_properties": {"page": "/home"}}
+    replay = {"event_properties": {"page": "/home"}, "time": 1000, "user_id": "user_1"}
+    assert event_key(first) == event_key(replay)
+    assert event_key(first) != event_key({**first, "time": 1001})
+
+def test_deduplicator_persists_between_runs():
+    """Events ingested in a previous run are dropped in the next one."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        state_path = os.path.join(tmp_dir, "events.bloom")
+        batch = [{"insert_id": f"ev_{i}", "event_type": "feedback"} for i in range(50)]
+
+        deduplicator = EventDeduplicator(state_path=state_path, initial_capacity=16, error_rate=1e-6)
+        assert len(list(deduplicator.filter_events(batch + batch[:10]))) == 50
+        assert deduplicator.stats["duplicates"] == 10
+        deduplicator.save()
+
+        # Fenêtre d'export qui chevauche la précédente
+        overlapping = batch[40:] + [{"insert_id": f"ev_{i}"} for i in range(50, 60)]
+        next_run = EventDeduplicator(state_path=state_path)
+        new_events = list(next_run.filter_events(overlapping))
+        assert [e["insert_id"] for e in new_events] == [f"ev_{i}" for i in range(50, 60)]
+
+def test_raw_file_state_saved_only_after_write():
+    """Processing alone does not persist the filter; a successful ingestion does."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        state_path = os.path.join(tmp_dir, "events.bloom")
+        raw_file = os.path.join(tmp_dir, "raw.ndjson")
+        write_records(raw_file, [{"insert_id": f"ev_{i}"} for i in range(5)])
+
+        # Traitement sans écriture (échec en aval): les événements restent à ingérer
+        assert len(process_raw_file(Path(raw_file), EventDeduplicator(state_path=state_path))) == 5
+        assert not os.path.exists(state_path)
+
+        # Écriture impossible: l'état n'est pas persisté
+        missing_dir = os.path.join(tmp_dir, "missing", "sub")
+        open(os.path.join(tmp_dir, "missing"), "w").close()
+        try:
+            ingest_raw_file(Path(raw_file), os.path.join(missing_dir, "out.ndjson"), EventDeduplicator(state_path=state_path))
+            assert False, "write should fail"
+        except OSError:
+            pass
+        assert not os.path.exists(state_path)
+
+        output_file = os.path.join(tmp_dir, "out.ndjson")
+        assert ingest_raw_file(Path(raw_file), output_file, EventDeduplicator(state_path=state_path)) == 5
+        assert len(load_records(output_file)) == 5
+        assert ingest_raw_file(Path(raw_file), output_file, EventDeduplicator(state_path=state_path)) == 0
+        # Aucun nouvel événement: la sortie précédente est conservée
+        assert len(load_records(output_file)) == 5
+
+if __name__ == "__main__":
+    test_scalable_bloom_filter_growth()
+    test_event_key_prefers_ids()
+    test_deduplicator_persists_between_runs()
+    test_raw_file_state_saved_only_after_write()
+    print("✅ All event deduplication tests passed")
@@ -0,0 +1,79 @@
+"""
+Test script for the shared HTTP transport.
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+import httpx
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from backend.utils.http_client import HTTPClient, AsyncHTTPClient, RetryPolicy, HostLatencyMetrics
+
+def _flaky_transport(failures, calls):
+    """Answers 503 to the first `failures` requests, then 200 echoing the URL."""
+    def handler(request):
+        calls.append(request)
+        if len(calls) <= failures:
+            return httpx.Response(503, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"url": str(request.url)})
+    return handler
+
+def test_retries_transient_errors_and_records_metrics():
+    """Idempotent requests are retried on 5xx and every attempt is measured per host."""
+    calls, metrics = [], HostLatencyMetrics()
+    client = HTTPClient(
+        retry=RetryPolicy(max_retries=3, backoff_factor=0),
+        metrics=metrics,
+        transport=httpx.MockTransport(_flaky_transport(2, calls))
+    )
+
+    response = client.get("https://posthog.test/events?cursor=abc", params={"token": "phc"})
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+    # Les paramètres sont fusionnés avec la query string, comme avec requests
+    assert response.json()["url"] == "https://posthog.test/events?cursor=abc&token=phc"
+    stats = metrics.snapshot()["posthog.test"]
+    assert stats["requests"] == 3 and stats["retries"] == 2 and stats["errors"] == 2
+
+def test_post_is_not_retried():
+    """Non-idempotent requests return the first response as is."""
+    calls = []
+    client = HTTPClient(
+        retry=RetryPolicy(max_retries=3, backoff_factor=0),
+        metrics=HostLatencyMetrics(),
+        transport=httpx.MockTransport(_flaky_transport(2, calls))
+    )
+
+    assert client.post("https://auth.test/oauth/token", json={}).status_code == 503
+    assert len(calls) == 1
+
+def test_async_client_retries():
+    """The async client applies the same retry policy."""
+    calls = []
+
+    async def run():
+        client = AsyncHTTPClient(
+            retry=RetryPolicy(max_retries=1, backoff_factor=0),
+            metrics=HostLatencyMetrics(),
+            transport=httpx.MockTransport(_flaky_transport(1, calls))
+        )
+        try:
+            return await client.get("https://amplitude.test/export")
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()).status_code == 200
+    assert len(calls) == 2
+
+if __name__ == "__main__":
+    test_retries_transient_errors_and_records_metrics()
+    test_post_is_not_retried()
+    test_async_client_retries()
+    print("✅ All HTTP client tests passed")
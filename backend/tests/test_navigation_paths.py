@@ -0,0 +1,71 @@
+"""
+Test script for the navigation path trie (top paths, funnels, drop-off).
+"""
+
+import sys
+from pathlib import Path
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from backend.services.behavior import NavigationTrie, session_page_sequence, analyze_sessions
+
+def _session(*pages):
+    return {"events": [{"type": "$pageview", "properties": {"pathname": page}} for page in pages]}
+
+PATHS = [
+    ("/", "/products", "/cart", "/checkout", "/thanks"),
+    ("/", "/products", "/cart", "/checkout"),
+    ("/", "/products", "/cart"),
+    ("/", "/products", "/cart"),
+    ("/", "/search", "/cart", "/checkout", "/thanks"),
+    ("/", "/products"),
+]
+
+def _trie():
+    trie = NavigationTrie()
+    for path in PATHS:
+        trie.add_path(path)
+    return trie
+
+def test_page_sequence_skips_reloads():
+    """Consecutive views of the same page count once."""
+    assert session_page_sequence(_session("/", "/", "/cart", "/")) == ["/", "/cart", "/"]
+
+def test_top_paths_and_drop_off():
+    trie = _trie()
+    top = trie.top_paths(2)
+    assert top[0] == {"path": ["/", "/products", "/cart"], "sessions": 2, "share": 2 / 6}
+    assert top[1]["sessions"] == 1
+
+    worst = trie.drop_off_points(top=1, min_sessions=2)[0]
+    assert worst["path"] == ["/", "/products", "/cart"]
+    assert worst["exits"] == 2 and worst["sessions"] == 4
+
+def test_funnel_allows_intermediate_pages():
+    """Steps are matched in order, whatever the pages in between."""
+    funnel = _trie().funnel(["/", "/cart", "/thanks"])
+    assert [step["sessions"] for step in funnel] == [6, 5, 2]
+    assert funnel[1]["drop_off"] == 1
+    assert funnel[2]["overall_conversion"] == 2 / 6
+
+def test_incremental_and_merge():
+    """Tries built on separate batches merge into the trie of all sessions."""
+    left, right = NavigationTrie(), NavigationTrie()
+    for i, path in enumerate(PATHS):
+        (left if i % 2 else right).add_path(path)
+    assert left.merge(right).to_dict() == _trie().to_dict()
+
+def test_behavior_report_builds_trie():
+    report = analyze_sessions(_session(*path) for path in PATHS)
+    assert report.paths.to_dict() == _trie().to_dict()
+
+if __name__ == "__main__":
+    test_page_sequence_skips_reloads()
+    test_top_paths_and_drop_off()
+    test_funnel_allows_intermediate_pages()
+    test_incremental_and_merge()
+    test_behavior_report_builds_trie()
+    print("✅ All navigation path tests passed")
@@ -0,0 +1,66 @@
+"""
+Test script for NDJSON record files and the streaming PostHog conversion.
+"""
+
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from backend.utils.ndjson import NDJSONWriter, write_records, load_records
+from backend.services.posthog_service import timestamp_to_ms
+
+RECORDS = [{"id": i, "text": f"Feedback é {i}"} for i in range(50)]
+
+def test_round_trip_formats():
+    """NDJSON, gzipped NDJSON and JSON arrays are written and read back identically."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in ("events.ndjson", "events.jsonl.gz", "events.json"):
+            path = Path(tmp_dir) / name
+            assert write_records(path, iter(RECORDS)) == len(RECORDS)
+            assert load_records(path) == RECORDS
+
+        # Les fichiers .json restent lisibles par json.load
+        assert json.loads((Path(tmp_dir) / "events.json").read_text(encoding="utf-8")) == RECORDS
+        assert (Path(tmp_dir) / "events.ndjson").read_text(encoding="utf-8").count("\n") == len(RECORDS)
+
+        # Ancien format indenté
+        legacy = Path(tmp_dir) / "legacy.json"
+        legacy.write_text(json.dumps(RECORDS, indent=2), encoding="utf-8")
+        assert load_records(legacy) == RECORDS
+
+def test_failed_write_keeps_previous_file():
+    """A write interrupted by an error leaves the existing file untouched."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "latest.ndjson"
+        write_records(path, RECORDS[:3])
+
+        try:
+            with NDJSONWriter(path) as writer:
+                writer.write({"id": "partial"})
+                raise RuntimeError("stream interrupted")
+        except RuntimeError:
+            pass
+
+        assert load_records(path) == RECORDS[:3]
+        assert [p.name for p in Path(tmp_dir).iterdir()] == ["latest.ndjson"]
+
+def test_timestamp_to_ms():
+    """ISO strings, seconds and milliseconds are converted, invalid values fall back."""
+    assert timestamp_to_ms("2024-05-01T10:00:00Z", 0) == 1714557600000
+    assert timestamp_to_ms("2024-05-01T10:00:00+00:00", 0) == 1714557600000
+    assert timestamp_to_ms(1714557600, 0) == 1714557600000
+    assert timestamp_to_ms(1714557600000, 0) == 1714557600000
+    assert timestamp_to_ms("not a date", 42) == 42
+    assert timestamp_to_ms(None, 42) == 42
+
+if __name__ == "__main__":
+    test_round_trip_formats()
+    test_failed_write_keeps_previous_file()
+    test_timestamp_to_ms()
+    print("✅ All NDJSON tests passed")
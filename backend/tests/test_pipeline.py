@@ -0,0 +1,155 @@
+"""
+Test script for the stage-level pipeline executor.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+from pathlib import Path
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+import backend.models.feedback_analyzer as feedback_analyzer
+from backend.services.pipeline import Pipeline, PipelineStage, design_pipeline
+from backend.utils.disk_cache import DiskCache
+
+def _pipeline(calls, version="v1", memo=None):
+    barrier = threading.Barrier(2, timeout=5)
+
+    def record(name, value):
+        calls.append(name)
+        return value
+
+    def left(text):
+        barrier.wait()  # left et right doivent tourner en même temps
+        return record("left", {"text": text.upper()})
+
+    def right(text):
+        barrier.wait()
+        return record("right", {"length": len(text)})
+
+    def items(left, right):
+        return record("items", [left["text"]] * right["length"])
+
+    def decorate(item, suffix):
+        time.sleep(0.01)
+        return record("decorate", item + suffix)
+
+    return Pipeline([
+        PipelineStage("decorated", decorate, {"item": "items", "suffix": "suffix"}, output_type=str,
+                      map_over="item", version=version),
+        PipelineStage("items", items, ["left", "right"], output_type=list),
+        PipelineStage("left", left, ["text"], output_type=dict),
+        PipelineStage("right", right, ["text"], output_type=dict),
+    ], memo=memo)
+
+def test_stages_run_in_dependency_order_and_concurrently():
+    calls = []
+    result = _pipeline(calls).run(text="abc", suffix="!")
+    assert result["decorated"] == ["ABC!"] * 3
+    assert list(result.timings) == ["left", "right", "items", "decorated"]
+    assert result.timings["decorated"]["items"] == 3
+    assert calls.count("decorate") == 3
+
+def test_memoized_stages_are_not_recomputed():
+    calls = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        memo = DiskCache(tmp_dir)
+        _pipeline(calls, memo=memo).run(text="abc", suffix="!")
+
+        calls.clear()
+        result = _pipeline(calls, memo=memo).run(text="abc", suffix="!")
+        assert calls == [] and result.recomputed == []
+
+        # Nouvelle version du dernier stage: seul lui est recalculé
+        result = _pipeline(calls, version="v2", memo=memo).run(text="abc", suffix="!")
+        assert calls == ["decorate"] * 3 and result.recomputed == ["decorated"]
+
+        # Nouvelle entrée en aval: l'amont reste mémoïsé
+        calls.clear()
+        result = _pipeline(calls, version="v2", memo=memo).run(text="abc", suffix="?")
+        assert result.recomputed == ["decorated"]
+
+def test_invalid_pipelines_are_rejected():
+    identity = lambda **kwargs: kwargs
+    try:
+        Pipeline([PipelineStage("a", identity, ["b"]), PipelineStage("b", identity, ["a"])])
+        assert False, "cycle not detected"
+    except ValueError as e:
+        assert "cycle" in str(e)
+
+    pipeline = Pipeline([PipelineStage("a", lambda x: x, ["x"], output_type=dict)])
+    try:
+        pipeline.run(x=[1])
+        assert False, "output type not checked"
+    except TypeError:
+        pass
+    try:
+        pipeline.run()
+        assert False, "missing input not detected"
+    except ValueError as e:
+        assert "x" in str(e)
+
+class FakeRecommendationChain:
+    model = "fake"
+    temperature = 0
+
+    def generate_recommendations(self, analysis_summary, page_id, validate=True):
+        return {"page_id": page_id, "recommendations": [{"title": "Ok", "component": "Button"},
+                                                        {"title": "Broken", "component": "Card"}]}
+
+    def validate_recommendations(self, recommendations):
+        return recommendations
+
+def test_design_pipeline_isolates_components_and_tracks_feedback_file():
+    from models.code_to_design import CodeToDesignClient
+
+    class FlakyClient(CodeToDesignClient):
+        def generate_component(self, component_spec):
+            if component_spec["name"] == "Broken":
+                raise RuntimeError("API unreachable")
+            return {"id": component_spec["name"]}
+
+    analyses = []
+
+    def fake_analyze_feedbacks(page_id, start_date, end_date, feedback_file):
+        analyses.append(Path(feedback_file).read_text())
+        return {"status": "success", "results": {"summary": {"summary": analyses[-1]}}}
+
+    analyze = feedback_analyzer.analyze_feedbacks
+    feedback_analyzer.analyze_feedbacks = fake_analyze_feedbacks
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            feedback_file = Path(tmp_dir) / "feedback.json"
+            feedback_file.write_text("[1]")
+            pipeline = design_pipeline(FakeRecommendationChain(), FlakyClient(api_key="test-key", cache=False))
+            inputs = {"page_id": "/checkout", "start_date": None, "end_date": None,
+                      "feedback_file": str(feedback_file)}
+
+            result = pipeline.run(**inputs)
+            assert result["components"] == [{"id": "Ok"}, {"error": "API unreachable"}]
+            layout = result["layout"]
+            assert [c["status"] for c in layout["layout"]["components"]] == ["generated", "failed"]
+            assert layout["failed_count"] == 1
+
+            pipeline.run(**inputs)
+            assert analyses == ["[1]"]
+
+            # Fichier réécrit: l'analyse est refaite
+            feedback_file.write_text("[1, 2]")
+            pipeline.run(**inputs)
+            assert analyses == ["[1]", "[1, 2]"]
+    finally:
+        feedback_analyzer.analyze_feedbacks = analyze
+
+if __name__ == "__main__":
+    test_stages_run_in_dependency_order_and_concurrently()
+    test_memoized_stages_are_not_recomputed()
+    test_invalid_pipelines_are_rejected()
+    test_design_pipeline_isolates_components_and_tracks_feedback_file()
+    print("✅ All pipeline tests passed")
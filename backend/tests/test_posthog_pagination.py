@@ -0,0 +1,118 @@
+"""
+Test script for PostHog list endpoint pagination.
+"""
+
+import sys
+from pathlib import Path
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from backend.services.posthog_pagination import iter_posthog_pages, iter_posthog_results
+from backend.services.posthog_service import PostHogService
+
+class FakeResponse:
+    """Minimal stand-in for a requests response."""
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+class CursorSession:
+    """Serves 5 pages of 3 events linked by `next` cursors."""
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        self.calls.append((url, params))
+        page = 0 if url == "https://posthog.test/events" else int(url.rsplit("=", 1)[1])
+        results = [{"id": f"ev_{page}_{i}"} for i in range(3)]
+        next_url = f"https://posthog.test/events?cursor={page + 1}" if page < 4 else None
+        return FakeResponse({"results": results, "next": next_url})
+
+class OffsetSession:
+    """Serves 7 recordings with offset pagination and `has_next`."""
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        offset, limit = params.get("offset", 0), params["limit"]
+        results = [{"id": f"rec_{i}"} for i in range(offset, min(offset + limit, 7))]
+        return FakeResponse({"results": results, "has_next": offset + limit < 7})
+
+class FailingCursorSession(CursorSession):
+    """Serves the first 2 cursor pages, then fails."""
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        if "cursor=2" in url:
+            raise ConnectionError("page 2 unavailable")
+        return super().get(url, headers=headers, params=params, timeout=timeout)
+
+def test_follows_next_cursors():
+    """Every page is fetched by following `next` and auth params are kept."""
+    session = CursorSession()
+    pages = list(iter_posthog_pages(
+        session,
+        "https://posthog.test/events",
+        params={"event": "feedback_submitted"},
+        follow_params={"token": "phc_test"}
+    ))
+
+    assert len(pages) == 5
+    assert sum(len(page) for page in pages) == 15
+    assert session.calls[1] == ("https://posthog.test/events?cursor=1", {"token": "phc_test"})
+
+def test_cap_and_prefetch():
+    """The cap truncates the last page and prefetching does not change the output."""
+    serial = list(iter_posthog_results(CursorSession(), "https://posthog.test/events", max_items=7))
+    prefetched = list(iter_posthog_results(
+        CursorSession(), "https://posthog.test/events", max_items=7, prefetch=True
+    ))
+
+    assert [event["id"] for event in serial] == [event["id"] for event in prefetched]
+    assert len(serial) == 7
+    assert serial[-1]["id"] == "ev_2_0"
+
+def test_zero_cap_requests_nothing():
+    """max_items=0 means no result at all (None is the uncapped value)."""
+    session = CursorSession()
+    assert list(iter_posthog_pages(session, "https://posthog.test/events", max_items=0)) == []
+    assert session.calls == []
+
+def test_offset_pagination():
+    """Endpoints flagging `has_next` are paginated by offset."""
+    recordings = list(iter_posthog_results(
+        OffsetSession(), "https://posthog.test/session_recordings", params={"limit": 3}
+    ))
+    assert [r["id"] for r in recordings] == [f"rec_{i}" for i in range(7)]
+
+def test_partial_pages_are_returned_on_error():
+    """Pages fetched before a failure are returned instead of test data."""
+    import posthog
+    disabled, posthog.disabled = posthog.disabled, True
+    try:
+        service = PostHogService("phc_test", "1", base_url="https://posthog.test")
+        service.session = FailingCursorSession()
+        service.iter_event_pages = lambda *args, **kwargs: iter_posthog_pages(
+            service.session, "https://posthog.test/events"
+        )
+
+        events = service.get_events(limit=100)
+    finally:
+        posthog.disabled = disabled
+
+    assert [event["id"] for event in events] == [f"ev_{page}_{i}" for page in range(2) for i in range(3)]
+
+if __name__ == "__main__":
+    test_follows_next_cursors()
+    test_cap_and_prefetch()
+    test_zero_cap_requests_nothing()
+    test_offset_pagination()
+    test_partial_pages_are_returned_on_error()
+    print("✅ All PostHog pagination tests passed")
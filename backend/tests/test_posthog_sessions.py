@@ -0,0 +1,214 @@
+"""
+Test script for the concurrent PostHog session detail fetch.
+"""
+
+import os
+import sys
+import time
+import threading
+from pathlib import Path
+
+import httpx
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from backend.models.analytics_providers import PostHogProvider
+from backend.utils.http_client import HTTPClient, RetryPolicy, HostLatencyMetrics
+
+ENV = {
+    "POSTHOG_API_KEY": "phc_test",
+    "POSTHOG_PROJECT_ID": "1",
+    "POSTHOG_API_URL": "https://posthog.test/api",
+    "POSTHOG_RECORDING_CACHE": "false",
+    "POSTHOG_DETAIL_WORKERS": "4",
+    "POSTHOG_REQUEST_TIMEOUT": "2.5",
+}
+
+class RecordingsAPI:
+    """
+    Lists `count` recordings without URL metadata and serves their details.
+
+    Recordings listed first answer last, and ids in `failing` / `timing_out`
+    answer 500 / time out.
+    """
+
+    def __init__(self, count, failing=(), timing_out=()):
+        self.count = count
+        self.failing = set(failing)
+        self.timing_out = set(timing_out)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.timeouts = []
+
+    def __call__(self, request):
+        path = request.url.path
+        if path.endswith("/session_recordings"):
+            results = [{"id": f"s{i}"} for i in range(self.count)]
+            return httpx.Response(200, json={"results": results, "has_next": False})
+
+        session_id = path.rsplit("/", 1)[1]
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.timeouts.append(request.extensions["timeout"]["read"])
+        try:
+            time.sleep(0.01 * (self.count - int(session_id[1:])))
+            if session_id in self.timing_out:
+                raise httpx.ReadTimeout("timed out", request=request)
+            if session_id in self.failing:
+                return httpx.Response(500)
+            url = "https://shop.test/checkout" if int(session_id[1:]) % 2 == 0 else "https://shop.test/cart"
+            return httpx.Response(200, json={
+                "id": session_id,
+                "events": [{"properties": {"$current_url": url}}]
+            })
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+class MetadataAPI:
+    """Lists finished recordings with URL metadata and serves fuller details."""
+
+    LISTED = [
+        {"id": "a", "urls": ["https://shop.test/checkout"]},
+        {"id": "b", "start_url": "https://shop.test/shop/checkout"},
+        {"id": "c", "urls": ["https://shop.test/checkout", "https://shop.test/cart"]},
+    ]
+    DETAILS = {
+        "a": ["https://shop.test/checkout", "https://shop.test/cart"],
+        "b": ["https://shop.test/shop/checkout"],
+        "c": ["https://shop.test/checkout", "https://shop.test/cart"],
+    }
+
+    def __init__(self):
+        self.detail_requests = []
+
+    def __call__(self, request):
+        path = request.url.path
+        if path.endswith("/session_recordings"):
+            return httpx.Response(200, json={"results": self.LISTED, "has_next": False})
+        session_id = path.rsplit("/", 1)[1]
+        self.detail_requests.append(session_id)
+        return httpx.Response(200, json={
+            "id": session_id,
+            "end_time": "2024-01-02T00:00:00Z",
+            "events": [{"properties": {"$current_url": url}} for url in self.DETAILS[session_id]]
+        })
+
+def _provider(api, **env):
+    """PostHog provider talking to `api` through a mock transport."""
+    env = {**ENV, **env}
+    saved = {key: os.environ.get(key) for key in env}
+    connection_test = PostHogProvider._test_connection
+    os.environ.update(env)
+    PostHogProvider._test_connection = lambda self: None
+    try:
+        provider = PostHogProvider()
+    finally:
+        PostHogProvider._test_connection = connection_test
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    provider.session = HTTPClient(
+        retry=RetryPolicy(max_retries=0),
+        metrics=HostLatencyMetrics(),
+        transport=httpx.MockTransport(api)
+    )
+    return provider
+
+def test_details_are_fetched_concurrently_in_api_order():
+    """Detail fetches overlap within the worker bound and results keep the API order."""
+    api = RecordingsAPI(12)
+    provider = _provider(api)
+
+    sessions = provider.get_sessions("/checkout", date_from="2024-01-01", date_to="2024-01-31")
+
+    assert [s["id"] for s in sessions] == [f"s{i}" for i in range(0, 12, 2)]
+    assert 1 < api.max_in_flight <= provider.detail_workers
+
+def test_each_detail_fetch_has_its_own_timeout():
+    """The configured timeout is applied per request and a timeout only drops its session."""
+    api = RecordingsAPI(6, timing_out={"s2"})
+    provider = _provider(api)
+
+    sessions = provider.get_sessions("/checkout", date_from="2024-01-01", date_to="2024-01-31")
+
+    assert api.timeouts == [2.5] * 6
+    assert [s["id"] for s in sessions] == ["s0", "s4"]
+
+def test_failed_detail_fetch_keeps_other_sessions():
+    """A failing detail request does not abort the batch."""
+    api = RecordingsAPI(6, failing={"s0", "s3"})
+    provider = _provider(api)
+
+    sessions_by_page = provider.get_sessions_for_pages(
+        ["/checkout", "/cart"], date_from="2024-01-01", date_to="2024-01-31"
+    )
+
+    assert [s["id"] for s in sessions_by_page["/checkout"]] == ["s2", "s4"]
+    assert [s["id"] for s in sessions_by_page["/cart"]] == ["s1", "s5"]
+
+def test_metadata_match_on_one_page_still_fetches_details_for_others():
+    """A session listing only some of the requested pages is detailed, and page ids match as substrings."""
+    api = MetadataAPI()
+    provider = _provider(api)
+
+    sessions_by_page = provider.get_sessions_for_pages(
+        ["checkout", "/cart"], date_from="2024-01-01", date_to="2024-01-31"
+    )
+
+    assert [s["id"] for s in sessions_by_page["checkout"]] == ["a", "b", "c"]
+    assert [s["id"] for s in sessions_by_page["/cart"]] == ["a", "c"]
+    assert sorted(api.detail_requests) == ["a", "b"]
+
+def test_index_is_kept_between_calls():
+    """Finished sessions indexed from their details are not fetched again."""
+    api = MetadataAPI()
+    provider = _provider(api)
+
+    provider.get_sessions_for_pages(["/cart"], date_from="2024-01-01", date_to="2024-01-31")
+    sessions = provider.get_sessions("/cart", date_from="2024-01-01", date_to="2024-01-31")
+
+    assert [s["id"] for s in sessions] == ["a", "c"]
+    assert sorted(api.detail_requests) == ["a", "b"]
+
+def test_fetch_sessions_reports_completeness():
+    """A batch is exhaustive only without failed details and below the result cap."""
+    period = {"date_from": "2024-01-01", "date_to": "2024-01-31"}
+
+    sessions, complete = _provider(RecordingsAPI(4)).fetch_sessions("/checkout", **period)
+    assert [s["id"] for s in sessions] == ["s0", "s2"] and complete
+
+    assert _provider(RecordingsAPI(4, failing={"s1"})).fetch_sessions("/checkout", **period)[1] is False
+
+    capped = _provider(RecordingsAPI(4))
+    capped.max_results = 4
+    assert capped.fetch_sessions("/checkout", **period)[1] is False
+
+def test_zero_max_results_disables_the_cap():
+    """POSTHOG_MAX_RESULTS=0 fetches everything; an explicit limit of 0 fetches nothing."""
+    period = {"date_from": "2024-01-01", "date_to": "2024-01-31"}
+    provider = _provider(RecordingsAPI(4), POSTHOG_MAX_RESULTS="0")
+    assert provider.max_results is None
+
+    sessions, complete = provider.fetch_sessions("/checkout", **period)
+    assert [s["id"] for s in sessions] == ["s0", "s2"] and complete
+
+    batch = provider.fetch_session_index(limit=0, page_ids=["/checkout"], **period)
+    assert list(batch) == [] and batch.complete is False
+
+if __name__ == "__main__":
+    test_details_are_fetched_concurrently_in_api_order()
+    test_each_detail_fetch_has_its_own_timeout()
+    test_failed_detail_fetch_keeps_other_sessions()
+    test_metadata_match_on_one_page_still_fetches_details_for_others()
+    test_index_is_kept_between_calls()
+    test_fetch_sessions_reports_completeness()
+    test_zero_max_results_disables_the_cap()
+    print("✅ All PostHog session fetch tests passed")
@@ -0,0 +1,86 @@
+"""
+Test script for the cache of generated design recommendations.
+"""
+
+import os
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from backend.services.recommendation_cache import RecommendationCache, prompt_fingerprint
+from models.design_recommendations import DesignRecommendationChain
+from models.recommendation_validator import RecommendationValidator
+
+SUMMARY = {"summary": "Checkout is confusing", "key_issues": ["Too many fields", "Hidden button"]}
+
+def test_fingerprint_is_canonical():
+    """Key order does not matter; page, model and prompt version do."""
+    base = RecommendationCache.fingerprint(SUMMARY, "/checkout", ["Button"], "gpt-4o", "v1")
+    reordered = {"key_issues": ["Too many fields", "Hidden button"], "summary": "Checkout is confusing"}
+    assert RecommendationCache.fingerprint(reordered, "/checkout", ["Button"], "gpt-4o", "v1") == base
+    assert RecommendationCache.fingerprint(SUMMARY, "/cart", ["Button"], "gpt-4o", "v1") != base
+    assert RecommendationCache.fingerprint(SUMMARY, "/checkout", ["Button"], "gpt-4o", "v2") != base
+    assert prompt_fingerprint("a {x}") != prompt_fingerprint("a {y}")
+
+class FakeRecommendationChain:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, inputs):
+        self.calls += 1
+        return json.dumps({"page_id": inputs["page_id"], "recommendations": [{"title": "Show the pay button"}]})
+
+def test_identical_requests_hit_the_cache():
+    had_key = "OPENAI_API_KEY" in os.environ
+    os.environ.setdefault("OPENAI_API_KEY", "test-key")
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            chain = DesignRecommendationChain(cache=RecommendationCache(tmp_dir))
+            chain.recommendation_chain = FakeRecommendationChain()
+
+            first = chain.generate_recommendations(SUMMARY, "/checkout", validate=False)
+            second = chain.generate_recommendations(dict(SUMMARY), "/checkout", validate=False)
+            assert first == second
+            assert chain.recommendation_chain.calls == 1
+            assert chain.cache.hits == 1
+
+            chain.generate_recommendations(SUMMARY, "/cart", validate=False)
+            assert chain.recommendation_chain.calls == 2
+    finally:
+        if not had_key:
+            del os.environ["OPENAI_API_KEY"]
+
+class TimingOutValidationChain:
+    def invoke(self, inputs):
+        raise TimeoutError("LLM request timed out")
+
+def test_failed_validations_are_not_cached():
+    had_key = "OPENAI_API_KEY" in os.environ
+    os.environ.setdefault("OPENAI_API_KEY", "test-key")
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            validator = RecommendationValidator(max_concurrency=1, prevalidate=False)
+            validator.validation_chain = TimingOutValidationChain()
+            chain = DesignRecommendationChain(validator=validator, cache=RecommendationCache(tmp_dir))
+            chain.recommendation_chain = FakeRecommendationChain()
+
+            first = chain.generate_recommendations(SUMMARY, "/checkout")
+            assert first["recommendations"][0]["validation"]["failed"] is True
+            chain.generate_recommendations(SUMMARY, "/checkout")
+            assert chain.recommendation_chain.calls == 2
+            assert chain.cache.hits == 0
+    finally:
+        if not had_key:
+            del os.environ["OPENAI_API_KEY"]
+
+if __name__ == "__main__":
+    test_fingerprint_is_canonical()
+    test_identical_requests_hit_the_cache()
+    test_failed_validations_are_not_cached()
+    print("✅ All recommendation cache tests passed")
@@ -0,0 +1,78 @@
+"""
+Test script for the rule-based pre-validation of design recommendations.
+"""
+
+import os
+import sys
+import json
+from pathlib import Path
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from models.recommendation_rules import RecommendationRuleEngine, check_component_support
+from models.recommendation_validator import RecommendationValidator
+
+def _rec(title, **fields):
+    rec = {"title": title, "description": "Move the pay button above the fold", "component": "Button",
+           "location": "Checkout form", "priority": "high",
+           "expected_impact": "Reduce checkout abandonment by 15%"}
+    rec.update(fields)
+    return rec
+
+RECS = [
+    _rec("Move pay button"),
+    _rec("Hologram checkout", component="HologramPanel"),
+    _rec("Missing location", location=""),
+    _rec("move  PAY button"),
+    _rec("Bold claim", expected_impact="Reduce abandonment by 150%"),
+    _rec("Add progress bar", component="Progress"),
+]
+
+def test_rules_resolve_decidable_recommendations():
+    results, stats = RecommendationRuleEngine().prevalidate(RECS)
+
+    assert results[0] is None and results[5] is None
+    assert results[1]["is_feasible"] is False and "Container" in results[1]["issues"][0]["suggested_fix"]
+    assert "location" in results[2]["issues"][0]["description"]
+    assert results[3]["issues"][0]["description"] == "Duplicate of recommendation #1"
+    assert results[4]["is_feasible"] is True and results[4]["issues"][0]["issue_type"] == "consistency"
+    assert stats == {"total": 6, "resolved_by_rules": 4, "sent_to_llm": 2, "skipped_fraction": 4 / 6}
+
+def test_component_support():
+    assert check_component_support("button") == (True, [])
+    assert check_component_support("nav bar")[0] is False
+
+class FakeChain:
+    def __init__(self):
+        self.titles = []
+
+    def invoke(self, inputs):
+        rec = json.loads(inputs["recommendation"])
+        self.titles.append(rec["title"])
+        return json.dumps({"recommendation_title": rec["title"], "is_feasible": True,
+                           "feasibility_score": 90, "issues": [], "modified_recommendation": rec})
+
+def test_only_ambiguous_recommendations_reach_the_llm():
+    had_key = "OPENAI_API_KEY" in os.environ
+    os.environ.setdefault("OPENAI_API_KEY", "test-key")
+    try:
+        validator = RecommendationValidator(max_concurrency=1)
+    finally:
+        if not had_key:
+            del os.environ["OPENAI_API_KEY"]
+    validator.validation_chain = FakeChain()
+
+    result = validator.validate_all_recommendations({"recommendations": RECS})
+    assert validator.validation_chain.titles == ["Move pay button", "Add progress bar"]
+    summary = result["validation_summary"]
+    assert summary["rule_prevalidation"]["skipped_fraction"] == 4 / 6
+    assert summary["infeasible_count"] == 3 and summary["feasible_count"] == 2
+
+if __name__ == "__main__":
+    test_rules_resolve_decidable_recommendations()
+    test_component_support()
+    test_only_ambiguous_recommendations_reach_the_llm()
+    print("✅ All recommendation rule tests passed")
@@ -712,11 +712,11 @@ def analyze_data(analytics_data: Dict[str, Any], verbose: bool = False) -> Dict[
     
     # Identify high traffic areas
     high_traffic_areas = []
-    for element, clicks in click_heatmap.items():
-        if len(clicks) > 5:  # Arbitrary threshold for "high traffic areas"
+    for element, clicks in click_heatmap.get("elements", {}).items():
+        if clicks > 5:  # Arbitrary threshold for "high traffic areas"
             high_traffic_areas.append({
                 "element": element,
-                "clicks": len(clicks)
+                "clicks": clicks
             })
     
     # Sort by descending number of clicks
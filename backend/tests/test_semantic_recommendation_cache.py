@@ -0,0 +1,121 @@
+"""
+Test script for the semantic reuse of validated recommendations.
+"""
+
+import os
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from backend.services.recommendation_cache import SemanticRecommendationCache, issue_profile
+from models.design_recommendations import DesignRecommendationChain
+
+CHECKOUT = {"summary": "Checkout form is too long", "key_issues": ["Too many fields"]}
+CHECKOUT_VARIANT = {"summary": "Checkout form is too long!", "key_issues": ["Too many fields"]}
+PRICING = {"summary": "Pricing table is unreadable", "key_issues": ["Small fonts"]}
+
+def fake_embed(text):
+    """Embedding by topic: checkout summaries are close, pricing is orthogonal."""
+    if "Checkout" in text:
+        return [1.0, 0.05 if "!" in text else 0.0, 0.0]
+    return [0.0, 0.0, 1.0]
+
+class FakeRecommendationChain:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, inputs):
+        self.calls += 1
+        return json.dumps({"page_id": inputs["page_id"], "recommendations": [{"title": "Shorten the form"}]})
+
+VALIDATED = {
+    "page_id": "/checkout",
+    "recommendations": [{"title": "Shorten the form", "validation": {"is_feasible": True}}],
+    "validation_summary": {"total_recommendations": 1}
+}
+
+class FakeValidator:
+    def validate_all_recommendations(self, recommendations):
+        return {**recommendations, "validation_summary": {"total_recommendations": 1}}
+
+def test_issue_profile_keeps_only_issue_fields():
+    """Shared field names, counters and metadata do not enter the embedded text."""
+    profile = issue_profile({
+        "summary": {"overall_summary": "Checkout form is too long", "key_themes": ["Forms"],
+                    "sentiment_distribution": {"NEGATIVE": 70}},
+        "key_issues": ["Too many fields"],
+        "meta": {"analyzed_count": 12}
+    })
+    assert profile == "Checkout form is too long\nForms\nToo many fields"
+    assert issue_profile({"page": "/checkout"}) == '{"page":"/checkout"}'
+
+def test_lookup_respects_threshold_and_scope():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = SemanticRecommendationCache(embed=fake_embed, directory=tmp_dir, threshold=0.95)
+        checkout = cache.embed(CHECKOUT)
+        cache.add(checkout, "gpt-4o", "/checkout", VALIDATED)
+
+        entry, similarity = cache.lookup(cache.embed(CHECKOUT_VARIANT), "gpt-4o")
+        assert entry["page_id"] == "/checkout" and similarity > 0.99
+        assert cache.lookup(cache.embed(PRICING), "gpt-4o") is None
+        assert cache.lookup(checkout, "other-model") is None
+        assert cache.stats()["hit_rate"] == 1 / 3
+
+        # L'index est rechargé depuis le disque
+        reloaded = SemanticRecommendationCache(embed=fake_embed, directory=tmp_dir)
+        assert reloaded.lookup(checkout, "gpt-4o") is not None
+
+def test_similar_analysis_reuses_validated_set():
+    had_key = "OPENAI_API_KEY" in os.environ
+    os.environ.setdefault("OPENAI_API_KEY", "test-key")
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            semantic_cache = SemanticRecommendationCache(embed=fake_embed, directory=tmp_dir)
+            chain = DesignRecommendationChain(validator=FakeValidator(), cache=False, semantic_cache=semantic_cache)
+            chain.recommendation_chain = FakeRecommendationChain()
+
+            chain.generate_recommendations(CHECKOUT, "/checkout")
+            reused = chain.generate_recommendations(CHECKOUT_VARIANT, "/checkout-b")
+            assert chain.recommendation_chain.calls == 1
+            assert reused["page_id"] == "/checkout-b"
+            assert reused["semantic_cache"]["source_page_id"] == "/checkout"
+
+            # Bypass et analyse différente: nouvelle génération
+            chain.generate_recommendations(CHECKOUT_VARIANT, "/checkout-b", use_semantic_cache=False)
+            chain.generate_recommendations(PRICING, "/pricing")
+            assert chain.recommendation_chain.calls == 3
+    finally:
+        if not had_key:
+            del os.environ["OPENAI_API_KEY"]
+
+def test_incomplete_sets_are_not_indexed():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = SemanticRecommendationCache(embed=fake_embed, directory=tmp_dir)
+        checkout = cache.embed(CHECKOUT)
+        failed = {**VALIDATED, "recommendations": [{"title": "Shorten the form", "validation": {"failed": True}}]}
+        partial = {**VALIDATED, "validation_summary": {"total_recommendations": 2}}
+        for recommendations in (failed, partial, {"page_id": "/checkout", "recommendations": []}):
+            cache.add(checkout, "gpt-4o", "/checkout", recommendations)
+        assert cache.lookup(checkout, "gpt-4o") is None
+
+def test_reused_recommendations_are_tagged():
+    entry = {"page_id": "/checkout", "recommendations": VALIDATED}
+    adapted = SemanticRecommendationCache.adapt(entry, "/checkout-b", 0.97)
+    tag = {"source_page_id": "/checkout", "similarity": 0.97}
+    assert adapted["semantic_cache"] == tag
+    assert [rec["semantic_cache"] for rec in adapted["recommendations"]] == [tag]
+    assert "semantic_cache" not in VALIDATED["recommendations"][0]
+
+if __name__ == "__main__":
+    test_issue_profile_keeps_only_issue_fields()
+    test_lookup_respects_threshold_and_scope()
+    test_similar_analysis_reuses_validated_set()
+    test_incomplete_sets_are_not_indexed()
+    test_reused_recommendations_are_tagged()
+    print("✅ All semantic recommendation cache tests passed")
@@ -0,0 +1,83 @@
+"""
+Test script for the PostHog session recording disk cache.
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from backend.utils.disk_cache import DiskCache
+from backend.services.session_cache import SessionRecordingCache, is_session_complete
+
+def _recording(session_id, ended_minutes_ago, ongoing=None):
+    recording = {
+        "id": session_id,
+        "end_time": (datetime.now(timezone.utc) - timedelta(minutes=ended_minutes_ago)).isoformat(),
+        "events": [{"type": "$click", "properties": {"element": "button.submit"}}] * 20
+    }
+    if ongoing is not None:
+        recording["ongoing"] = ongoing
+    return recording
+
+def test_only_finished_sessions_are_cached():
+    """Finished sessions are served from cache, in-progress ones bypass it."""
+    assert is_session_complete(_recording("a", ended_minutes_ago=120))
+    assert not is_session_complete(_recording("b", ended_minutes_ago=5))
+    assert not is_session_complete(_recording("c", ended_minutes_ago=120, ongoing=True))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = SessionRecordingCache("project_1", directory=tmp_dir)
+        finished = _recording("finished", ended_minutes_ago=120)
+
+        assert cache.put("finished", finished)
+        assert not cache.put("live", _recording("live", ended_minutes_ago=1))
+        assert cache.get("finished") == finished
+        assert cache.get("live") is None
+
+        # Les clés sont propres à chaque projet
+        assert SessionRecordingCache("project_2", directory=tmp_dir).get("finished") is None
+
+def test_lru_eviction_under_size_cap():
+    """The least recently used entries are evicted once the cap is exceeded."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = DiskCache(tmp_dir, max_bytes=10_000, compress=False)
+        payload = "x" * 1500
+
+        for i in range(5):
+            cache.set(f"key-{i}", payload)
+            time.sleep(0.01)
+        # key-0 est relue, elle devient la plus récemment utilisée
+        assert cache.get("key-0") == payload
+        time.sleep(0.01)
+
+        for i in range(5, 8):
+            cache.set(f"key-{i}", payload)
+            time.sleep(0.01)
+
+        assert cache.size_in_bytes <= 10_000
+        assert "key-0" in cache
+        assert "key-1" not in cache
+        assert "key-7" in cache
+
+def test_ttl_expiry():
+    """Entries older than the TTL are treated as misses."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = DiskCache(tmp_dir, ttl_seconds=0.05)
+        cache.set("key", {"value": 1})
+        assert cache.get("key") == {"value": 1}
+        time.sleep(0.1)
+        assert cache.get("key") is None
+
+if __name__ == "__main__":
+    test_only_finished_sessions_are_cached()
+    test_lru_eviction_under_size_cap()
+    test_ttl_expiry()
+    print("✅ All session cache tests passed")
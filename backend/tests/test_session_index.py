@@ -0,0 +1,65 @@
+"""
+Test script for the page -> session inverted index.
+"""
+
+import sys
+from pathlib import Path
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from backend.services.session_index import PageSessionIndex, normalize_page_path
+
+SESSIONS = [
+    {"id": "s1", "start_url": "https://shop.test/checkout/step2?coupon=1"},
+    {"id": "s2", "urls": ["https://shop.test/", "https://shop.test/products/42/"]},
+    {"id": "s3", "events": [{"properties": {"$current_url": "https://shop.test/checkout"}}]},
+    {"id": "s4", "snapshots": {"pages": [{"url": "/account#settings"}]}},
+    {"id": "s5", "urls": ["https://shop.test/shop/checkout"]},
+]
+
+def test_normalize_page_path():
+    """URLs, paths and page ids normalize to the same path."""
+    assert normalize_page_path("https://shop.test/checkout/?step=2") == "/checkout"
+    assert normalize_page_path("checkout") == "/checkout"
+    assert normalize_page_path("/checkout/") == "/checkout"
+    assert normalize_page_path("https://shop.test") == "/"
+
+def test_lookup_matches_pages_and_sub_pages():
+    """A page matches sessions that visited it or one of its sub-pages, in order."""
+    index = PageSessionIndex(SESSIONS)
+
+    assert [s["id"] for s in index.sessions_for_page("checkout")] == ["s1", "s3", "s5"]
+    assert [s["id"] for s in index.sessions_for_page("/checkout/step2")] == ["s1"]
+    assert [s["id"] for s in index.sessions_for_page("/shop")] == ["s5"]
+    assert index.session_ids_for_page("https://shop.test/products") == {"s2"}
+    assert index.session_ids_for_page("/account") == {"s4"}
+    assert index.session_ids_for_page("/missing") == set()
+
+def test_reindexing_replaces_previous_pages():
+    """Indexing a detailed recording replaces the pages of its metadata."""
+    index = PageSessionIndex(SESSIONS)
+    index.add_session({"events": [{"properties": {"$current_url": "/cart"}}]}, session_id="s1")
+
+    assert index.session_ids_for_page("/checkout") == {"s3", "s5"}
+    assert index.contains("s1", "/cart")
+    assert len(index) == 5
+
+def test_batch_scoped_lookup_and_eviction():
+    """A lookup can be restricted to one batch, and the oldest sessions are evicted."""
+    index = PageSessionIndex(SESSIONS, max_sessions=4)
+
+    assert "s1" not in index and len(index) == 4
+    assert [s["id"] for s in index.sessions_for_page("checkout", session_ids=["s5", "s2", "s3"])] == ["s5", "s3"]
+
+    index.add_session({"id": "s6", "urls": ["/checkout"]}, final=True)
+    assert "s2" not in index and index.is_final("s6")
+
+if __name__ == "__main__":
+    test_normalize_page_path()
+    test_lookup_matches_pages_and_sub_pages()
+    test_reindexing_replaces_previous_pages()
+    test_batch_scoped_lookup_and_eviction()
+    print("✅ All session index tests passed")
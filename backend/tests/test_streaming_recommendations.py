@@ -0,0 +1,148 @@
+"""
+Test script for the streamed generation of design recommendations.
+"""
+
+import os
+import sys
+import json
+import tempfile
+import threading
+from pathlib import Path
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from backend.utils.json_stream import IncrementalArrayParser, parse_json_response
+from backend.services.recommendation_cache import RecommendationCache
+from models.design_recommendations import DesignRecommendationChain
+from models.recommendation_validator import RecommendationValidator
+
+RECOMMENDATIONS = [
+    {
+        "title": f"Recommendation {i} with {{braces}} and \"quotes\"",
+        "description": "Move the [primary] button",
+        "component": "Button",
+        "location": "Checkout footer",
+        "priority": "high",
+        "before_after": {"before": "Hidden", "after": "Visible"}
+    }
+    for i in range(3)
+]
+DOCUMENT = "```json\n" + json.dumps({
+    "page_id": "/checkout",
+    "notes": {"recommendations": "not this one"},
+    "recommendations": RECOMMENDATIONS,
+    "implementation_notes": "Ship in one sprint"
+}, indent=2) + "\n```"
+
+# Fin du premier objet: fermeture de before_after, puis de la recommandation
+FIRST_END = DOCUMENT.index("}", DOCUMENT.index("}", DOCUMENT.index('"after"')) + 1) + 1
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+def test_parser_emits_each_object_when_it_closes():
+    for size in (1, 7, len(DOCUMENT)):
+        parser = IncrementalArrayParser("recommendations")
+        emitted = []
+        for chunk in chunked(DOCUMENT, size):
+            emitted.extend(parser.feed(chunk))
+        assert emitted == RECOMMENDATIONS
+        assert parser.document()["implementation_notes"] == "Ship in one sprint"
+
+    # Le premier objet est émis avant la fin du document
+    parser = IncrementalArrayParser("recommendations")
+    assert parser.feed(DOCUMENT[:FIRST_END]) == RECOMMENDATIONS[:1]
+    assert parse_json_response("Sure: {\"a\": 1} done") == {"a": 1}
+
+class FakeStreamingChain:
+    """Streams the document and blocks after the first recommendation until it is validated."""
+
+    def __init__(self, first_validated):
+        self.first_validated = first_validated
+
+    def stream(self, inputs):
+        yield DOCUMENT[:FIRST_END]
+        assert self.first_validated.wait(timeout=5), "validation did not overlap with generation"
+        yield from chunked(DOCUMENT[FIRST_END:], 16)
+
+class FakeValidationChain:
+    """Validation chain signalling its first call."""
+
+    def __init__(self):
+        self.first_validated = threading.Event()
+
+    def invoke(self, inputs):
+        self.first_validated.set()
+        rec = json.loads(inputs["recommendation"])
+        return json.dumps({"is_feasible": True, "feasibility_score": 90, "issues": [], "modified_recommendation": rec})
+
+def test_validation_overlaps_generation():
+    had_key = "OPENAI_API_KEY" in os.environ
+    os.environ.setdefault("OPENAI_API_KEY", "test-key")
+    try:
+        validator = RecommendationValidator(max_concurrency=2)
+        validator.validation_chain = FakeValidationChain()
+        chain = DesignRecommendationChain(validator=validator, cache=False)
+        chain.recommendation_chain = FakeStreamingChain(validator.validation_chain.first_validated)
+
+        events = list(chain.stream_recommendations({"summary": "Checkout"}, "/checkout"))
+        kinds = [event["event"] for event in events]
+        assert kinds[0] == "recommendation" and kinds[-1] == "complete"
+        assert kinds.count("recommendation") == 3 and kinds.count("validation") == 3
+        result = events[-1]["recommendations"]
+        assert result["validation_summary"]["total_recommendations"] == 3
+        assert result["implementation_notes"] == "Ship in one sprint"
+        assert result["validation_summary"]["rule_prevalidation"]["sent_to_llm"] == 3
+    finally:
+        if not had_key:
+            del os.environ["OPENAI_API_KEY"]
+
+class TruncatedStreamingChain:
+    """Stream cut off after the first recommendation."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def stream(self, inputs):
+        self.calls += 1
+        yield DOCUMENT[:FIRST_END]
+
+class CompleteStreamingChain:
+    def stream(self, inputs):
+        yield from chunked(DOCUMENT, 64)
+
+def test_truncated_output_is_not_cached_and_hits_replay_validations():
+    had_key = "OPENAI_API_KEY" in os.environ
+    os.environ.setdefault("OPENAI_API_KEY", "test-key")
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            validator = RecommendationValidator(max_concurrency=2)
+            validator.validation_chain = FakeValidationChain()
+            chain = DesignRecommendationChain(validator=validator, cache=RecommendationCache(tmp_dir))
+            chain.recommendation_chain = TruncatedStreamingChain()
+
+            for _ in range(2):
+                events = list(chain.stream_recommendations({"summary": "Checkout"}, "/checkout"))
+                assert len(events[-1]["recommendations"]["recommendations"]) == 1
+            assert chain.recommendation_chain.calls == 2 and chain.cache.hits == 0
+
+            # Jeu complet: mis en cache, et rejoué avec ses événements de validation
+            chain.recommendation_chain = CompleteStreamingChain()
+            list(chain.stream_recommendations({"summary": "Checkout"}, "/checkout"))
+            events = list(chain.stream_recommendations({"summary": "Checkout"}, "/checkout"))
+            assert chain.cache.hits == 1
+            kinds = [event["event"] for event in events]
+            assert kinds == ["recommendation", "validation"] * 3 + ["complete"]
+            assert events[1]["validation"]["is_feasible"] is True
+    finally:
+        if not had_key:
+            del os.environ["OPENAI_API_KEY"]
+
+if __name__ == "__main__":
+    test_parser_emits_each_object_when_it_closes()
+    test_validation_overlaps_generation()
+    test_truncated_output_is_not_cached_and_hits_replay_validations()
+    print("✅ All streaming recommendation tests passed")
@@ -0,0 +1,118 @@
+"""
+Test script for the concurrent validation of design recommendations.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import threading
+from pathlib import Path
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from models.recommendation_validator import RecommendationValidator
+
+class FakeValidationChain:
+    """Validation chain answering after a delay, tracking concurrent calls."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def _answer(self, inputs):
+        rec = json.loads(inputs["recommendation"])
+        score = rec["score"]
+        return {
+            "recommendation_title": rec["title"],
+            "is_feasible": score >= 50,
+            "feasibility_score": score,
+            "issues": [],
+            "modified_recommendation": dict(rec),
+        }
+
+    def invoke(self, inputs):
+        if json.loads(inputs["recommendation"])["title"] == "rec-broken":
+            raise TimeoutError("LLM request timed out")
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return json.dumps(self._answer(inputs))
+
+    async def ainvoke(self, inputs):
+        if json.loads(inputs["recommendation"])["title"] == "rec-broken":
+            raise TimeoutError("LLM request timed out")
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return json.dumps(self._answer(inputs))
+
+def _recommendations():
+    return {"page_id": "/checkout", "recommendations": [
+        {"title": f"rec-{i}", "description": "Make the button larger", "component": "Button",
+         "location": "Footer", "priority": "high" if i % 2 else "low", "score": 10 * i}
+        for i in range(8)
+    ]}
+
+def _validator(max_concurrency):
+    # Le client OpenAI exige une clé, même si la chaîne est remplacée
+    had_key = "OPENAI_API_KEY" in os.environ
+    os.environ.setdefault("OPENAI_API_KEY", "test-key")
+    try:
+        validator = RecommendationValidator(max_concurrency=max_concurrency)
+    finally:
+        if not had_key:
+            del os.environ["OPENAI_API_KEY"]
+    validator.validation_chain = FakeValidationChain()
+    return validator
+
+def test_validations_run_concurrently():
+    """Validations overlap up to the limit and keep their recommendation."""
+    concurrent = _validator(3)
+    result = concurrent.validate_all_recommendations(_recommendations())
+    assert concurrent.validation_chain.peak == 3
+
+    serial = _validator(1)
+    expected = serial.validate_all_recommendations(_recommendations())
+    assert serial.validation_chain.peak == 1
+    assert result == expected
+    assert result["validation_summary"]["infeasible_count"] == 5
+    for rec in result["recommendations"]:
+        assert rec["validation"]["feasibility_score"] == rec["score"]
+
+def test_async_validation():
+    validator = _validator(2)
+    result = asyncio.run(validator.avalidate_all_recommendations(_recommendations()))
+    assert validator.validation_chain.peak == 2
+    assert result == _validator(1).validate_all_recommendations(_recommendations())
+
+def test_failing_validation_keeps_the_others():
+    """A validation that raises fails its own recommendation only."""
+    recommendations = _recommendations()
+    recommendations["recommendations"][2]["title"] = "rec-broken"
+
+    for result in (
+        _validator(3).validate_all_recommendations(recommendations),
+        asyncio.run(_validator(3).avalidate_all_recommendations(recommendations)),
+    ):
+        validations = {rec["title"]: rec["validation"] for rec in result["recommendations"]}
+        broken = validations.pop("rec-broken")
+        assert broken["is_feasible"] is False
+        assert "timed out" in broken["issues"][0]["description"]
+        assert sorted(v["feasibility_score"] for v in validations.values()) == [0, 10, 30, 40, 50, 60, 70]
+
+if __name__ == "__main__":
+    test_validations_run_concurrently()
+    test_async_validation()
+    test_failing_validation_keeps_the_others()
+    print("✅ All validation concurrency tests passed")
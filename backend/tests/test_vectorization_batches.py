@@ -0,0 +1,64 @@
+"""
+Test script for the batched preparation of feedback documents for vectorization.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add root directory to Python path
+root_dir = str(Path(__file__).parent.parent.parent)
+sys.path.append(root_dir)
+
+# Import necessary modules
+from backend.services.amplitude.data_processor import (
+    iter_vectorization_batches, prepare_for_vectorization, text_fingerprint
+)
+
+def _events(texts):
+    return [
+        {"event_id": i, "user_id": f"user_{i}", "event_type": "feedback", "platform": "Web",
+         "os_name": "", "event_properties": {"feedback": text, "page": "/checkout"}}
+        for i, text in enumerate(texts)
+    ]
+
+def test_batches_respect_size_and_char_limits():
+    batches = list(iter_vectorization_batches(_events([f"text {i}" for i in range(25)]), batch_size=10))
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+
+    long_texts = ["x" * 40] * 5
+    batches = list(iter_vectorization_batches(_events(long_texts), max_batch_chars=100))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+    # Les événements sans texte sont ignorés
+    assert sum(len(b) for b in iter_vectorization_batches(_events(["a", "", "b"]))) == 2
+
+def test_metadata_is_compact():
+    document = next(iter_vectorization_batches(_events(["hello"])))[0]
+    assert document.metadata["platform"] == "Web" and document.metadata["page"] == "/checkout"
+    assert "os_name" not in document.metadata and "device_id" not in document.metadata
+
+    full = prepare_for_vectorization(_events(["hello", "hello"]))
+    assert len(full) == 2 and full[0].metadata["os_name"] == ""
+
+def test_dedup_records_texts_only_when_confirmed():
+    embedded = {text_fingerprint("old")}
+    stats = {}
+    events = _events(["old", "new", "new", "other"])
+
+    batches = list(iter_vectorization_batches(events, embedded=embedded, stats=stats))
+    assert [d.page_content for d in batches[0]] == ["new", "other"]
+    assert stats == {"emitted": 2, "already_embedded": 1, "duplicates": 1}
+
+    # Lot non confirmé (échec de l'appel d'embedding): réémis à l'exécution suivante
+    retry = list(iter_vectorization_batches(events, embedded=embedded))
+    assert [d.page_content for d in retry[0]] == ["new", "other"]
+
+    retry[0].mark_embedded()
+    assert list(iter_vectorization_batches(events, embedded=embedded)) == []
+
+if __name__ == "__main__":
+    test_batches_respect_size_and_char_limits()
+    test_metadata_is_compact()
+    test_dedup_records_texts_only_when_confirmed()
+    print("✅ All vectorization batch tests passed")
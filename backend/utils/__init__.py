@@ -31,4 +31,27 @@ from .encryption import (
     secure_hash,
     hmac_sign,
     hmac_verify
-) 
\ No newline at end of file
+)
+
+from .bloom_filter import (
+    BloomFilter,
+    ScalableBloomFilter
+)
+
+from .disk_cache import DiskCache
+
+from .http_client import (
+    HTTPClient,
+    AsyncHTTPClient,
+    RetryPolicy,
+    get_http_client,
+    get_async_http_client,
+    get_latency_metrics
+)
+
+from .ndjson import (
+    NDJSONWriter,
+    write_records,
+    iter_records,
+    load_records
+)
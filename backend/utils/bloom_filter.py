@@ -0,0 +1,276 @@
+"""
+Probabilistic set membership utilities.
+Provides a scalable Bloom filter that can be persisted to disk, used to
+deduplicate very large streams of keys with bounded memory.
+"""
+
+import os
+import json
+import math
+import struct
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Union
+
+# Signature des fichiers de filtre persistés
+_FILE_MAGIC = b"SBF1"
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter.
+
+    Sized from the expected number of items and the target false positive
+    rate. Positions are derived from a single blake2b digest with double
+    hashing, so adding or checking a key costs one hash call.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Initialize an empty Bloom filter.
+
+        Args:
+            capacity: Number of items the filter is sized for
+            error_rate: Target false positive rate once capacity is reached
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: bytes):
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", digest)
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: bytes) -> bool:
+        """
+        Add a key to the filter.
+
+        Args:
+            key: Key to add
+
+        Returns:
+            True if the key was not already (probably) present
+        """
+        added = False
+        for position in self._positions(key):
+            byte_index, mask = position >> 3, 1 << (position & 7)
+            if not self.bits[byte_index] & mask:
+                self.bits[byte_index] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, key: bytes) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    @property
+    def is_full(self) -> bool:
+        return self.count >= self.capacity
+
+
+class ScalableBloomFilter:
+    """
+    Bloom filter that grows as items are added.
+
+    New slices are appended when the current one reaches its capacity, each
+    one larger and with a tighter error rate, so the overall false positive
+    rate stays below ``error_rate`` whatever the number of items.
+    """
+
+    def __init__(
+        self,
+        initial_capacity: int = 100_000,
+        error_rate: float = 0.001,
+        growth_factor: int = 2,
+        tightening_ratio: float = 0.9
+    ):
+        """
+        Initialize an empty scalable Bloom filter.
+
+        Args:
+            initial_capacity: Capacity of the first slice
+            error_rate: Upper bound on the overall false positive rate
+            growth_factor: Capacity multiplier between successive slices
+            tightening_ratio: Error rate multiplier between successive slices
+        """
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth_factor = growth_factor
+        self.tightening_ratio = tightening_ratio
+        self.filters: List[BloomFilter] = []
+
+    @staticmethod
+    def _to_bytes(key: Union[str, bytes]) -> bytes:
+        return key.encode("utf-8") if isinstance(key, str) else key
+
+    def _add_slice(self) -> BloomFilter:
+        index = len(self.filters)
+        capacity = self.initial_capacity * (self.growth_factor ** index)
+        slice_error = self.error_rate * (1 - self.tightening_ratio) * (self.tightening_ratio ** index)
+        bloom = BloomFilter(capacity, slice_error)
+        self.filters.append(bloom)
+        return bloom
+
+    def add(self, key: Union[str, bytes]) -> bool:
+        """
+        Add a key to the filter.
+
+        Args:
+            key: Key to add
+
+        Returns:
+            True if the key was new, False if it was (probably) already seen
+        """
+        key = self._to_bytes(key)
+        if self._contains(key):
+            return False
+        current = self.filters[-1] if self.filters else None
+        if current is None or current.is_full:
+            current = self._add_slice()
+        current.add(key)
+        return True
+
+    def _contains(self, key: bytes) -> bool:
+        # Les tranches récentes contiennent le plus d'éléments, on commence par elles
+        return any(key in bloom for bloom in reversed(self.filters))
+
+    def __contains__(self, key: Union[str, bytes]) -> bool:
+        return self._contains(self._to_bytes(key))
+
+    def __len__(self) -> int:
+        return sum(bloom.count for bloom in self.filters)
+
+    @property
+    def size_in_bytes(self) -> int:
+        """Memory used by the bit arrays."""
+        return sum(len(bloom.bits) for bloom in self.filters)
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the filter (the format written by save()).
+
+        Returns:
+            Serialized filter
+        """
+        header = json.dumps({
+            "initial_capacity": self.initial_capacity,
+            "error_rate": self.error_rate,
+            "growth_factor": self.growth_factor,
+            "tightening_ratio": self.tightening_ratio,
+            "filters": [
+                {
+                    "capacity": bloom.capacity,
+                    "error_rate": bloom.error_rate,
+                    "count": bloom.count
+                }
+                for bloom in self.filters
+            ]
+        }).encode("utf-8")
+        parts = [_FILE_MAGIC, struct.pack("<I", len(header)), header]
+        parts.extend(bytes(bloom.bits) for bloom in self.filters)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ScalableBloomFilter":
+        """
+        Rebuild a filter serialized with to_bytes().
+
+        Args:
+            data: Serialized filter
+
+        Returns:
+            The restored filter
+        """
+        if data[:4] != _FILE_MAGIC:
+            raise ValueError("Not a Bloom filter")
+        (header_length,) = struct.unpack("<I", data[4:8])
+        offset = 8 + header_length
+        header = json.loads(data[8:offset].decode("utf-8"))
+
+        instance = cls(
+            initial_capacity=header["initial_capacity"],
+            error_rate=header["error_rate"],
+            growth_factor=header["growth_factor"],
+            tightening_ratio=header["tightening_ratio"]
+        )
+        for spec in header["filters"]:
+            bloom = BloomFilter(spec["capacity"], spec["error_rate"])
+            bits = data[offset:offset + len(bloom.bits)]
+            if len(bits) != len(bloom.bits):
+                raise ValueError("Truncated Bloom filter")
+            offset += len(bits)
+            bloom.bits = bytearray(bits)
+            bloom.count = spec["count"]
+            instance.filters.append(bloom)
+        return instance
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """
+        Persist the filter to disk, replacing any existing file atomically.
+
+        Args:
+            path: Destination file
+
+        Returns:
+            Path to the saved file
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self.to_bytes())
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ScalableBloomFilter":
+        """
+        Load a filter previously written with save().
+
+        Args:
+            path: File to load
+
+        Returns:
+            The restored filter
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        try:
+            return cls.from_bytes(data)
+        except ValueError as e:
+            raise ValueError(f"{path}: {e}") from None
+
+    @classmethod
+    def load_or_create(cls, path: Optional[Union[str, Path]], **kwargs) -> "ScalableBloomFilter":
+        """
+        Load a filter from disk if the file exists, otherwise create a new one.
+
+        Args:
+            path: File to load from (may be None)
+            **kwargs: Parameters used when creating a new filter
+
+        Returns:
+            Loaded or new filter
+        """
+        if path is not None and Path(path).exists():
+            return cls.load(path)
+        return cls(**kwargs)
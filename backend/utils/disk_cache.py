@@ -0,0 +1,202 @@
+"""
+Persistent key-value cache stored on the local filesystem.
+Values are JSON documents, optionally gzip-compressed, stored under a
+content-addressed file name. The cache supports a total size cap with
+least-recently-used eviction and an optional time-to-live.
+"""
+
+import os
+import json
+import gzip
+import time
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Optional, Union
+
+
+class DiskCache:
+    """
+    JSON cache on disk with LRU eviction.
+
+    Each entry lives in its own file named after the SHA-256 of its key.
+    File modification times record the last access, so eviction removes
+    the least recently used entries first once ``max_bytes`` is exceeded.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        compress: bool = True
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory holding the cache files (created if needed)
+            max_bytes: Total size cap of the cache files (None for no cap)
+            ttl_seconds: Entries older than this are ignored and removed (None for no expiry)
+            compress: Store entries gzip-compressed
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.compress = compress
+        self._suffix = ".json.gz" if compress else ".json"
+        self._lock = threading.Lock()
+        self._size = sum(path.stat().st_size for path in self._iter_files())
+
+    @staticmethod
+    def key_digest(key: str) -> str:
+        """Content address of a key."""
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        digest = self.key_digest(key)
+        return self.directory / digest[:2] / f"{digest}{self._suffix}"
+
+    def _iter_files(self):
+        return self.directory.glob(f"*/*{self._suffix}")
+
+    def _read(self, path: Path) -> Any:
+        opener = gzip.open if self.compress else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Return the cached value of a key.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Cached value or default
+        """
+        path = self._path(key)
+        try:
+            entry = self._read(path)
+        except (FileNotFoundError, OSError, ValueError):
+            return default
+
+        if self.ttl_seconds is not None and time.time() - entry.get("stored_at", 0) > self.ttl_seconds:
+            self.delete(key)
+            return default
+
+        # Marquer l'entrée comme récemment utilisée pour l'éviction LRU
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("value", default)
+
+    def __contains__(self, key: str) -> bool:
+        sentinel = object()
+        return self.get(key, sentinel) is not sentinel
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a value, replacing any previous entry atomically.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps(
+            {"key": key, "stored_at": time.time(), "value": value},
+            ensure_ascii=False,
+            separators=(",", ":")
+        ).encode("utf-8")
+        if self.compress:
+            payload = gzip.compress(payload, compresslevel=6)
+
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            with self._lock:
+                previous = path.stat().st_size if path.exists() else 0
+                os.replace(tmp_path, path)
+                self._size += len(payload) - previous
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        if self.max_bytes is not None and self._size > self.max_bytes:
+            self.evict()
+
+    def delete(self, key: str) -> bool:
+        """
+        Remove an entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if an entry was removed
+        """
+        path = self._path(key)
+        with self._lock:
+            try:
+                size = path.stat().st_size
+                path.unlink()
+            except FileNotFoundError:
+                return False
+            self._size -= size
+        return True
+
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until the cache fits in 90% of max_bytes.
+
+        Returns:
+            Number of removed entries
+        """
+        if self.max_bytes is None:
+            return 0
+
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        with self._lock:
+            entries = []
+            for path in self._iter_files():
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            self._size = sum(size for _, size, _ in entries)
+
+            for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+                if self._size <= target:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    continue
+                self._size -= size
+                removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            for path in self._iter_files():
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            self._size = 0
+
+    @property
+    def size_in_bytes(self) -> int:
+        """Total size of the cache files."""
+        return self._size
@@ -0,0 +1,461 @@
+"""
+Shared HTTP transport for outbound integrations.
+Provides pooled synchronous and asynchronous clients (keep-alive, HTTP/2 when
+the ``h2`` package is installed), default timeouts, retries with exponential
+backoff on transient failures, and per-host latency metrics.
+"""
+
+import os
+import time
+import random
+import asyncio
+import threading
+import weakref
+from collections import deque
+from typing import Any, Dict, Optional, Iterable, Union, Tuple
+
+import httpx
+
+# Exceptions exposed to callers so they don't depend on the underlying library
+HTTPError = httpx.HTTPError
+HTTPStatusError = httpx.HTTPStatusError
+TransportError = httpx.TransportError
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+DEFAULT_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+DEFAULT_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+DEFAULT_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+
+TimeoutType = Union[None, float, Tuple[float, float], httpx.Timeout]
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a request.
+
+    Only idempotent methods are retried by default: a POST may have reached
+    the server even if its response was lost.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = int(os.getenv("HTTP_MAX_RETRIES", "3")),
+        backoff_factor: float = float(os.getenv("HTTP_RETRY_BACKOFF", "0.5")),
+        max_backoff: float = 30.0,
+        status_forcelist: Iterable[int] = (429, 500, 502, 503, 504),
+        methods: Iterable[str] = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            max_retries: Retries after the first attempt (0 disables retrying)
+            backoff_factor: Base delay in seconds, doubled on each retry
+            max_backoff: Upper bound of a single delay, including Retry-After
+            status_forcelist: Response statuses considered transient
+            methods: HTTP methods that may be retried
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.status_forcelist = frozenset(status_forcelist)
+        self.methods = frozenset(method.upper() for method in methods)
+
+    def allows(self, method: str, attempt: int) -> bool:
+        """True if a request may be retried after `attempt` failed attempts."""
+        return attempt <= self.max_retries and method.upper() in self.methods
+
+    def should_retry_status(self, method: str, status_code: int, attempt: int) -> bool:
+        return status_code in self.status_forcelist and self.allows(method, attempt)
+
+    def delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """
+        Delay before the next attempt, honouring a Retry-After header in seconds.
+
+        Args:
+            attempt: Number of failed attempts so far (1 for the first retry)
+            response: Response of the failed attempt, if any
+
+        Returns:
+            Delay in seconds
+        """
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(self.max_backoff, max(0.0, float(retry_after)))
+                except ValueError:
+                    pass
+        backoff = self.backoff_factor * (2 ** (attempt - 1))
+        # Jitter pour éviter que des clients concurrents ne réessaient en même temps
+        return min(self.max_backoff, backoff * random.uniform(0.5, 1.0))
+
+
+NO_RETRY = RetryPolicy(max_retries=0)
+
+
+class HostLatencyMetrics:
+    """
+    Per-host request statistics: counts, errors, retries and latency percentiles.
+    """
+
+    def __init__(self, window: int = 1000):
+        """
+        Initialize the metrics.
+
+        Args:
+            window: Number of latest latency samples kept per host
+        """
+        self.window = window
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+
+    def _host(self, host: str) -> Dict[str, Any]:
+        stats = self._hosts.get(host)
+        if stats is None:
+            stats = {"requests": 0, "errors": 0, "retries": 0, "total_seconds": 0.0,
+                     "samples": deque(maxlen=self.window)}
+            self._hosts[host] = stats
+        return stats
+
+    def record(self, host: str, seconds: float, error: bool = False) -> None:
+        """Record one attempt against a host."""
+        with self._lock:
+            stats = self._host(host)
+            stats["requests"] += 1
+            stats["total_seconds"] += seconds
+            stats["samples"].append(seconds)
+            if error:
+                stats["errors"] += 1
+
+    def record_retry(self, host: str) -> None:
+        with self._lock:
+            self._host(host)["retries"] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Current statistics per host, latencies in milliseconds.
+
+        Returns:
+            Dictionary host -> statistics
+        """
+        with self._lock:
+            hosts = {host: (dict(stats), sorted(stats["samples"])) for host, stats in self._hosts.items()}
+
+        snapshot = {}
+        for host, (stats, samples) in hosts.items():
+            def percentile(q: float) -> float:
+                if not samples:
+                    return 0.0
+                return samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+
+            snapshot[host] = {
+                "requests": stats["requests"],
+                "errors": stats["errors"],
+                "retries": stats["retries"],
+                "mean_ms": stats["total_seconds"] / stats["requests"] * 1000 if stats["requests"] else 0.0,
+                "p50_ms": percentile(0.50),
+                "p95_ms": percentile(0.95),
+                "max_ms": samples[-1] * 1000 if samples else 0.0,
+            }
+        return snapshot
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hosts.clear()
+
+
+# Métriques partagées par tous les clients
+latency_metrics = HostLatencyMetrics()
+
+
+def build_timeout(timeout: TimeoutType = None) -> httpx.Timeout:
+    """
+    Normalize a timeout to httpx.Timeout.
+
+    Accepts a number of seconds, a requests-style (connect, read) tuple or
+    an httpx.Timeout. None gives the default timeouts.
+    """
+    if isinstance(timeout, httpx.Timeout):
+        return timeout
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    if timeout is None:
+        return httpx.Timeout(DEFAULT_TIMEOUT, connect=DEFAULT_CONNECT_TIMEOUT)
+    return httpx.Timeout(timeout)
+
+
+def _client_options(timeout: TimeoutType, max_connections: int, max_keepalive: int,
+                    http2: Optional[bool], headers: Optional[Dict[str, str]]) -> Dict[str, Any]:
+    return {
+        "http2": HTTP2_AVAILABLE if http2 is None else (http2 and HTTP2_AVAILABLE),
+        "timeout": build_timeout(timeout),
+        "limits": httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive),
+        "headers": headers,
+        "follow_redirects": True,
+    }
+
+
+class _TransportMixin:
+    """Request preparation shared by the sync and async clients."""
+
+    retry: RetryPolicy
+    metrics: HostLatencyMetrics
+
+    @staticmethod
+    def _prepare(url: str, kwargs: Dict[str, Any]) -> Tuple[httpx.URL, Dict[str, Any]]:
+        # httpx remplace la query string de l'URL par `params`, requests les fusionne:
+        # on garde le comportement de requests (utilisé pour suivre les curseurs `next`)
+        params = kwargs.pop("params", None)
+        request_url = httpx.URL(url)
+        if params:
+            request_url = request_url.copy_merge_params(params)
+        if "timeout" in kwargs:
+            kwargs["timeout"] = build_timeout(kwargs["timeout"])
+        return request_url, kwargs
+
+
+class HTTPClient(_TransportMixin):
+    """
+    Pooled synchronous HTTP client with retries and latency metrics.
+
+    Exposes the familiar ``get``/``post``/``request`` API returning
+    ``httpx.Response`` objects. Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        timeout: TimeoutType = None,
+        retry: Optional[RetryPolicy] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive: int = DEFAULT_MAX_KEEPALIVE,
+        http2: Optional[bool] = None,
+        headers: Optional[Dict[str, str]] = None,
+        metrics: Optional[HostLatencyMetrics] = None,
+        transport: Optional[httpx.BaseTransport] = None
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            timeout: Default timeout (seconds, (connect, read) tuple or httpx.Timeout)
+            retry: Retry policy (defaults to RetryPolicy())
+            max_connections: Maximum number of open connections
+            max_keepalive: Maximum number of idle keep-alive connections
+            http2: Force HTTP/2 on or off (None: enabled when h2 is installed)
+            headers: Headers sent with every request
+            metrics: Metrics collector (defaults to the shared one)
+            transport: Custom httpx transport (mainly for tests)
+        """
+        self.retry = retry or RetryPolicy()
+        self.metrics = metrics or latency_metrics
+        options = _client_options(timeout, max_connections, max_keepalive, http2, headers)
+        if transport is not None:
+            options["transport"] = transport
+        self._client = httpx.Client(**options)
+
+    def request(self, method: str, url: str, retry: Optional[RetryPolicy] = None, **kwargs) -> httpx.Response:
+        """
+        Send a request, retrying transient failures.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            retry: Retry policy overriding the client's one
+            **kwargs: httpx request options (params, headers, json, data, timeout...)
+
+        Returns:
+            Last response received
+
+        Raises:
+            httpx.TransportError: If the last attempt failed without a response
+        """
+        policy = retry or self.retry
+        request_url, kwargs = self._prepare(url, kwargs)
+        host = request_url.host
+        attempt = 0
+
+        while True:
+            start = time.perf_counter()
+            try:
+                response = self._client.request(method, request_url, **kwargs)
+            except httpx.TransportError:
+                self.metrics.record(host, time.perf_counter() - start, error=True)
+                attempt += 1
+                if not policy.allows(method, attempt):
+                    raise
+                self.metrics.record_retry(host)
+                time.sleep(policy.delay(attempt))
+                continue
+
+            self.metrics.record(host, time.perf_counter() - start, error=response.status_code >= 500)
+            attempt += 1
+            if not policy.should_retry_status(method, response.status_code, attempt):
+                return response
+            self.metrics.record_retry(host)
+            response.close()
+            time.sleep(policy.delay(attempt, response))
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self) -> None:
+        self._client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AsyncHTTPClient(_TransportMixin):
+    """
+    Pooled asynchronous HTTP client with retries and latency metrics.
+
+    Same API as HTTPClient with awaitable methods. An instance is bound to
+    the event loop it is first used on.
+    """
+
+    def __init__(
+        self,
+        timeout: TimeoutType = None,
+        retry: Optional[RetryPolicy] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive: int = DEFAULT_MAX_KEEPALIVE,
+        http2: Optional[bool] = None,
+        headers: Optional[Dict[str, str]] = None,
+        metrics: Optional[HostLatencyMetrics] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Initialize the client. Arguments are the same as HTTPClient.
+        """
+        self.retry = retry or RetryPolicy()
+        self.metrics = metrics or latency_metrics
+        options = _client_options(timeout, max_connections, max_keepalive, http2, headers)
+        if transport is not None:
+            options["transport"] = transport
+        self._client = httpx.AsyncClient(**options)
+
+    async def request(self, method: str, url: str, retry: Optional[RetryPolicy] = None,
+                      **kwargs) -> httpx.Response:
+        """
+        Send a request, retrying transient failures. See HTTPClient.request.
+        """
+        policy = retry or self.retry
+        request_url, kwargs = self._prepare(url, kwargs)
+        host = request_url.host
+        attempt = 0
+
+        while True:
+            start = time.perf_counter()
+            try:
+                response = await self._client.request(method, request_url, **kwargs)
+            except httpx.TransportError:
+                self.metrics.record(host, time.perf_counter() - start, error=True)
+                attempt += 1
+                if not policy.allows(method, attempt):
+                    raise
+                self.metrics.record_retry(host)
+                await asyncio.sleep(policy.delay(attempt))
+                continue
+
+            self.metrics.record(host, time.perf_counter() - start, error=response.status_code >= 500)
+            attempt += 1
+            if not policy.should_retry_status(method, response.status_code, attempt):
+                return response
+            self.metrics.record_retry(host)
+            await response.aclose()
+            await asyncio.sleep(policy.delay(attempt, response))
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+_sync_client: Optional[HTTPClient] = None
+_sync_lock = threading.Lock()
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHTTPClient]" = weakref.WeakKeyDictionary()
+
+
+def get_http_client() -> HTTPClient:
+    """
+    Process-wide synchronous client shared by every integration.
+
+    Returns:
+        Shared HTTPClient
+    """
+    global _sync_client
+    if _sync_client is None:
+        with _sync_lock:
+            if _sync_client is None:
+                _sync_client = HTTPClient()
+    return _sync_client
+
+
+def get_async_http_client() -> AsyncHTTPClient:
+    """
+    Asynchronous client shared within the running event loop.
+
+    Returns:
+        Shared AsyncHTTPClient
+
+    Raises:
+        RuntimeError: If called outside a running event loop
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = AsyncHTTPClient()
+        _async_clients[loop] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close the shared clients (called on application shutdown)."""
+    global _sync_client
+    with _sync_lock:
+        client, _sync_client = _sync_client, None
+    if client is not None:
+        client.close()
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    async_client = _async_clients.pop(loop, None)
+    if async_client is not None:
+        await async_client.aclose()
+
+
+def get_latency_metrics() -> Dict[str, Dict[str, float]]:
+    """Per-host latency statistics of the shared clients."""
+    return latency_metrics.snapshot()
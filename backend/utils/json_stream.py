@@ -0,0 +1,149 @@
+"""
+Incremental parsing of JSON documents produced token by token.
+An LLM streaming a JSON object sends it in arbitrary fragments; the parser
+scans each fragment once, tracking strings and nesting, and returns the
+elements of a chosen top-level array as soon as each of them closes, long
+before the whole document is complete. Text around the document (markdown
+fences, prose) is ignored.
+"""
+
+import re
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_JSON_OBJECT = re.compile(r"(\{[\s\S]*\})")
+
+
+def parse_json_response(content: str) -> Any:
+    """
+    Parse a JSON document returned by an LLM.
+
+    Markdown code fences are removed; if the text still is not valid JSON,
+    the outermost {...} block is parsed instead.
+
+    Raises:
+        ValueError: If no valid JSON document is found
+    """
+    content = content.replace("```json", "").replace("```", "").strip()
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        match = _JSON_OBJECT.search(content)
+        if match:
+            try:
+                return json.loads(match.group(1))
+            except json.JSONDecodeError:
+                pass
+    raise ValueError("Failed to parse LLM output as valid JSON")
+
+
+class IncrementalArrayParser:
+    """
+    Emit the elements of a top-level array while its JSON document streams in.
+
+    Example:
+        parser = IncrementalArrayParser("recommendations")
+        for chunk in stream:
+            for recommendation in parser.feed(chunk):
+                ...
+        document = parser.document()
+    """
+
+    def __init__(self, key: str):
+        """
+        Args:
+            key: Key of the array, in the top-level object, whose elements are emitted
+        """
+        self.key = key
+        self.emitted = 0
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._current_key: Optional[str] = None
+        self._in_array = False
+        self._element_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Add a fragment of the document.
+
+        Args:
+            chunk: Next fragment of text
+
+        Returns:
+            Array elements completed by this fragment, in order
+        """
+        self._text += chunk
+        completed = []
+        text = self._text
+        for pos in range(self._pos, len(text)):
+            char = text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_string = text[self._string_start:pos + 1]
+                continue
+
+            if char == '"':
+                if self._depth > 0:
+                    self._in_string = True
+                    self._string_start = pos
+            elif char in "{[":
+                if self._depth == 1 and char == "[" and self._current_key == self.key:
+                    self._in_array = True
+                elif self._depth == 2 and self._in_array:
+                    self._element_start = pos
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    continue
+                self._depth -= 1
+                if self._depth == 2 and self._in_array and self._element_start is not None:
+                    element = self._decode(text[self._element_start:pos + 1])
+                    self._element_start = None
+                    if element is not None:
+                        completed.append(element)
+                elif self._depth == 1 and self._in_array:
+                    self._in_array = False
+            elif self._depth == 1:
+                if char == ":":
+                    self._current_key = self._decode(self._last_string) if self._last_string else None
+                elif char == ",":
+                    self._current_key = self._last_string = None
+        self._pos = len(text)
+        self.emitted += len(completed)
+        return completed
+
+    @staticmethod
+    def _decode(fragment: str) -> Any:
+        try:
+            return json.loads(fragment)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping malformed streamed JSON element: {e}")
+            return None
+
+    @property
+    def text(self) -> str:
+        """Text received so far."""
+        return self._text
+
+    def document(self) -> Dict[str, Any]:
+        """
+        Parse the complete document once the stream has ended.
+
+        Raises:
+            ValueError: If the text is not a valid JSON document
+        """
+        return parse_json_response(self._text)
@@ -0,0 +1,202 @@
+"""
+Streaming reader and writer for JSON record files.
+Records are written one per line (NDJSON), optionally gzip-compressed, to a
+temporary file that atomically replaces the target once complete. Readers
+accept NDJSON as well as classic JSON array files, so existing data keeps
+loading.
+"""
+
+import os
+import io
+import json
+import gzip
+import logging
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+
+
+def is_gzip_path(path: Union[str, Path]) -> bool:
+    return str(path).endswith(".gz")
+
+
+def is_ndjson_path(path: Union[str, Path]) -> bool:
+    """True if the file name designates an NDJSON file (possibly gzipped)."""
+    name = str(path)
+    if name.endswith(".gz"):
+        name = name[:-3]
+    return name.endswith(NDJSON_SUFFIXES)
+
+
+class NDJSONWriter:
+    """
+    Atomic streaming writer of JSON records.
+
+    Records are serialized compactly as they are written. The target file only
+    appears (or is replaced) when the writer is closed without error; if the
+    ``with`` block raises, the partial output is discarded.
+    """
+
+    def __init__(self, path: Union[str, Path], compress: Optional[bool] = None, json_array: bool = False):
+        """
+        Open a writer.
+
+        Args:
+            path: Target file
+            compress: Gzip the output (defaults to True for ``.gz`` paths)
+            json_array: Write a compact JSON array instead of one record per line
+        """
+        self.path = Path(path)
+        self.compress = is_gzip_path(path) if compress is None else compress
+        self.json_array = json_array
+        self.count = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=str(self.path.parent), prefix=".tmp-")
+        raw = os.fdopen(fd, "wb")
+        if self.compress:
+            raw = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6)
+            self._raw_owner = raw.fileobj
+        else:
+            self._raw_owner = None
+        self._file = io.TextIOWrapper(raw, encoding="utf-8", newline="\n")
+        self._closed = False
+        if self.json_array:
+            self._file.write("[")
+
+    def write(self, record: Any) -> None:
+        """Serialize one record."""
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        if self.json_array:
+            self._file.write(line if self.count == 0 else "," + line)
+        else:
+            self._file.write(line)
+            self._file.write("\n")
+        self.count += 1
+
+    def write_all(self, records: Iterable[Any]) -> int:
+        """
+        Serialize every record of an iterable, consuming it lazily.
+
+        Returns:
+            Number of records written by this call
+        """
+        start = self.count
+        for record in records:
+            self.write(record)
+        return self.count - start
+
+    def close(self) -> None:
+        """Flush and atomically move the file into place."""
+        if self._closed:
+            return
+        if self.json_array:
+            self._file.write("]")
+        self._file.close()
+        if self._raw_owner is not None:
+            self._raw_owner.close()
+        self._closed = True
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        """Discard the partial output."""
+        if self._closed:
+            return
+        try:
+            self._file.close()
+            if self._raw_owner is not None:
+                self._raw_owner.close()
+        finally:
+            self._closed = True
+            if os.path.exists(self._tmp_path):
+                os.unlink(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_records(path: Union[str, Path], records: Iterable[Any], compress: Optional[bool] = None) -> int:
+    """
+    Write records atomically, as NDJSON or as a compact JSON array for ``.json`` paths.
+
+    Args:
+        path: Target file
+        records: Records to write (consumed lazily)
+        compress: Gzip the output (defaults to True for ``.gz`` paths)
+
+    Returns:
+        Number of records written
+    """
+    with NDJSONWriter(path, compress=compress, json_array=not is_ndjson_path(path)) as writer:
+        return writer.write_all(records)
+
+
+def _open_text(path: Path):
+    with open(path, "rb") as f:
+        magic = f.read(2)
+    if magic == b"\x1f\x8b":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def iter_records(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the records of an NDJSON or JSON file, gzipped or not.
+
+    NDJSON files are streamed line by line (invalid lines are skipped with a
+    warning). A JSON array yields its items, a single JSON object yields itself.
+
+    Args:
+        path: File to read
+
+    Returns:
+        Iterator over records
+    """
+    path = Path(path)
+    with _open_text(path) as f:
+        first_line = f.readline()
+        while first_line and not first_line.strip():
+            first_line = f.readline()
+        if not first_line:
+            return
+
+        stripped = first_line.lstrip()
+        first_record = None
+        if not stripped.startswith("["):
+            try:
+                first_record = json.loads(first_line)
+            except json.JSONDecodeError:
+                first_record = None
+
+        if first_record is None:
+            # Document JSON classique (tableau ou objet sur plusieurs lignes)
+            data = json.loads(first_line + f.read())
+            if isinstance(data, list):
+                yield from data
+            else:
+                yield data
+            return
+
+        yield first_record
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipped invalid line in {path}: {line[:50]}...")
+
+
+def load_records(path: Union[str, Path]) -> List[Dict[str, Any]]:
+    """Load every record of an NDJSON or JSON file."""
+    return list(iter_records(path))
@@ -7,6 +7,7 @@ setup(
     install_requires=[
         'requests',
         'python-dotenv',
+        'numpy',
         'pandas',
     ],
 )
\ No newline at end of file